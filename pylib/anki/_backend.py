@@ -6,15 +6,16 @@ from __future__ import annotations
 import sys
 import time
 import traceback
-from collections.abc import Iterable, Sequence
+from collections.abc import Callable, Iterable, Sequence
 from threading import current_thread, main_thread
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
 from weakref import ref
 
+from google.protobuf.message import Message
 from markdown import markdown
 
 import anki.buildinfo
-from anki import _rsbridge, backend_pb2, i18n_pb2
+from anki import _backend_profiler, _rsbridge, backend_pb2, i18n_pb2
 from anki._backend_generated import RustBackendGenerated
 from anki._fluent import GeneratedTranslations
 from anki.dbproxy import Row as DBRow
@@ -157,20 +158,137 @@ class RustBackend(RustBackendGenerated):
 
     def _run_command(self, service: int, method: int, input: bytes) -> bytes:
         start = time.time()
+        output = b""
         try:
-            return self._backend.command(service, method, input)
+            output = self._backend.command(service, method, input)
+            return output
         except Exception as error:
             error_bytes = bytes(error.args[0])
         finally:
-            elapsed = time.time() - start
-            if current_thread() is main_thread() and elapsed > 0.2:
-                print(f"blocked main thread for {int(elapsed*1000)}ms:")
-                print("".join(traceback.format_stack()))
+            self._record_call(service, method, start, len(input), len(output))
 
         err = backend_pb2.BackendError()
         err.ParseFromString(error_bytes)
         raise backend_exception_to_pylib(err)
 
+    def _record_call(
+        self, service: int, method: int, start: float, bytes_in: int, bytes_out: int
+    ) -> None:
+        "Report calls that blocked the main thread, and pass timings to the profiler."
+        elapsed = time.time() - start
+        on_main_thread = current_thread() is main_thread()
+        profiler = _backend_profiler.active()
+        if on_main_thread and elapsed > _backend_profiler.STALL_THRESHOLD_SECS:
+            stack = "".join(traceback.format_stack())
+            print(f"blocked main thread for {int(elapsed*1000)}ms:")
+            print(stack)
+            if profiler:
+                profiler.record_stall(service, method, start, elapsed, stack)
+        if profiler:
+            profiler.record(
+                service,
+                method,
+                start,
+                elapsed,
+                bytes_in,
+                bytes_out,
+                on_main_thread,
+            )
+
+    def command_many(self, commands: Sequence[tuple[int, int, bytes]]) -> list[bytes]:
+        """Run several independent service methods with a single call into the
+        backend. All commands are run, even if an earlier one fails; the first
+        error is raised afterwards. See BackendBatch for a friendlier interface."""
+        start = time.time()
+        results: list[tuple[bool, bytes]] = []
+        try:
+            results = self._backend.command_many(list(commands))
+        finally:
+            self._record_call(
+                *_backend_profiler.COMMAND_MANY,
+                start,
+                sum(len(command[2]) for command in commands),
+                sum(len(output) for _ok, output in results),
+            )
+
+        outputs = []
+        for ok, output in results:
+            if not ok:
+                err = backend_pb2.BackendError()
+                err.ParseFromString(output)
+                raise backend_exception_to_pylib(err)
+            outputs.append(output)
+        return outputs
+
+
+BatchOutput = TypeVar("BatchOutput", bound=Message)
+
+
+class BatchResult(Generic[BatchOutput]):
+    "The output of a request added to a BackendBatch."
+
+    def __init__(self, output_type: type[BatchOutput]) -> None:
+        self._output_type = output_type
+        self._output: BatchOutput | None = None
+
+    def result(self) -> BatchOutput:
+        if self._output is None:
+            raise Exception("batch has not been run yet")
+        return self._output
+
+    def _set(self, raw: bytes) -> None:
+        self._output = self._output_type.FromString(raw)
+
+
+class _CommandRecorder(RustBackendGenerated):
+    "Captures the service and method that a generated *_raw method would call."
+
+    def _run_command(self, service: int, method: int, input: Any) -> bytes:
+        self.command = (service, method, input)
+        return b""
+
+
+class BackendBatch:
+    """Collects independent backend requests, and runs them with a single call
+    into the backend, so the bridge overhead is only paid once.
+
+    Requests are added with the generated *_raw method, the request message, and
+    the type of the response. Each request must not depend on the output of
+    another request in the same batch.
+
+        batch = BackendBatch(col._backend)
+        note = batch.add(RustBackend.get_note_raw, NoteId(nid=nid), Note)
+        batch.run()
+        note.result()
+    """
+
+    def __init__(self, backend: RustBackend) -> None:
+        self._backend = backend
+        self._commands: list[tuple[int, int, bytes]] = []
+        self._results: list[BatchResult] = []
+
+    def add(
+        self,
+        method: Callable[[Any, bytes], bytes],
+        message: Message,
+        output_type: type[BatchOutput],
+    ) -> BatchResult[BatchOutput]:
+        recorder = _CommandRecorder()
+        method(recorder, message.SerializeToString())
+        self._commands.append(recorder.command)
+        result = BatchResult(output_type)
+        self._results.append(result)
+        return result
+
+    def run(self) -> None:
+        if not self._commands:
+            return
+        outputs = self._backend.command_many(self._commands)
+        for result, output in zip(self._results, outputs):
+            result._set(output)
+        self._commands = []
+        self._results = []
+
 
 class Translations(GeneratedTranslations):
     def __init__(self, backend: ref[RustBackend] | None):
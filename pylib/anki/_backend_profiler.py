@@ -0,0 +1,268 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+"""
+Records timing information about calls into the Rust backend.
+
+The profiler is disabled by default. It can be enabled at startup by setting
+the ANKI_PROFILE_BACKEND environment variable, or at runtime with enable().
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+from anki.utils import to_json_bytes
+
+DEFAULT_CAPACITY = 50_000
+# calls on the main thread that take longer than this are considered stalls
+STALL_THRESHOLD_SECS = 0.2
+# batches run with RustBackend.command_many() are recorded under this key
+COMMAND_MANY = (-1, -1)
+
+
+class BackendCall(NamedTuple):
+    service: int
+    method: int
+    start: float
+    elapsed: float
+    bytes_in: int
+    bytes_out: int
+    main_thread: bool
+    thread_id: int
+
+
+@dataclass
+class MainThreadStall:
+    name: str
+    start: float
+    elapsed: float
+    stack: str
+
+
+@dataclass
+class MethodStats:
+    name: str
+    service: int
+    method: int
+    calls: int
+    total_secs: float
+    p50_secs: float
+    p95_secs: float
+    p99_secs: float
+    bytes_in: int
+    bytes_out: int
+    main_thread_calls: int
+    main_thread_secs: float
+
+    @property
+    def background_calls(self) -> int:
+        return self.calls - self.main_thread_calls
+
+
+@dataclass
+class _Totals:
+    calls: int = 0
+    total_secs: float = 0.0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    main_thread_calls: int = 0
+    main_thread_secs: float = 0.0
+
+
+def method_name(service: int, method: int) -> str:
+    from anki._backend_generated import BACKEND_METHOD_NAMES
+
+    if (service, method) == COMMAND_MANY:
+        return "command_many"
+    return BACKEND_METHOD_NAMES.get((service, method), f"{service}.{method}")
+
+
+class BackendProfiler:
+    """Keeps the most recent `capacity` backend calls in a ring buffer, and
+    running totals for every (service, method) pair since the last clear().
+
+    Percentiles are calculated from the calls still held in the buffer."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._calls: deque[BackendCall] = deque(maxlen=capacity)
+        self._stalls: deque[MainThreadStall] = deque(maxlen=100)
+        self._totals: dict[tuple[int, int], _Totals] = {}
+
+    def record(
+        self,
+        service: int,
+        method: int,
+        start: float,
+        elapsed: float,
+        bytes_in: int,
+        bytes_out: int,
+        main_thread: bool,
+    ) -> None:
+        call = BackendCall(
+            service=service,
+            method=method,
+            start=start,
+            elapsed=elapsed,
+            bytes_in=bytes_in,
+            bytes_out=bytes_out,
+            main_thread=main_thread,
+            thread_id=threading.get_ident(),
+        )
+        with self._lock:
+            self._calls.append(call)
+            totals = self._totals.setdefault((service, method), _Totals())
+            totals.calls += 1
+            totals.total_secs += elapsed
+            totals.bytes_in += bytes_in
+            totals.bytes_out += bytes_out
+            if main_thread:
+                totals.main_thread_calls += 1
+                totals.main_thread_secs += elapsed
+
+    def record_stall(
+        self, service: int, method: int, start: float, elapsed: float, stack: str
+    ) -> None:
+        with self._lock:
+            self._stalls.append(
+                MainThreadStall(
+                    name=method_name(service, method),
+                    start=start,
+                    elapsed=elapsed,
+                    stack=stack,
+                )
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._calls.clear()
+            self._stalls.clear()
+            self._totals.clear()
+
+    def calls(self) -> list[BackendCall]:
+        with self._lock:
+            return list(self._calls)
+
+    def stalls(self) -> list[MainThreadStall]:
+        with self._lock:
+            return list(self._stalls)
+
+    def summary(self) -> list[MethodStats]:
+        "Per-method statistics, slowest (by total time) first."
+        with self._lock:
+            totals = dict(self._totals)
+            calls = list(self._calls)
+
+        durations: dict[tuple[int, int], list[float]] = {}
+        for call in calls:
+            durations.setdefault((call.service, call.method), []).append(call.elapsed)
+
+        stats = []
+        for (service, method), total in totals.items():
+            elapsed = sorted(durations.get((service, method), []))
+            stats.append(
+                MethodStats(
+                    name=method_name(service, method),
+                    service=service,
+                    method=method,
+                    calls=total.calls,
+                    total_secs=total.total_secs,
+                    p50_secs=_percentile(elapsed, 50),
+                    p95_secs=_percentile(elapsed, 95),
+                    p99_secs=_percentile(elapsed, 99),
+                    bytes_in=total.bytes_in,
+                    bytes_out=total.bytes_out,
+                    main_thread_calls=total.main_thread_calls,
+                    main_thread_secs=total.main_thread_secs,
+                )
+            )
+        stats.sort(key=lambda s: s.total_secs, reverse=True)
+        return stats
+
+    def report(self, limit: int = 30) -> str:
+        "A plain-text table of the most expensive methods."
+        lines = [
+            f"{'method':<40} {'calls':>7} {'total ms':>9} {'p50':>7} {'p95':>7} "
+            f"{'p99':>7} {'main':>6} {'KiB in':>8} {'KiB out':>8}"
+        ]
+        for s in self.summary()[:limit]:
+            lines.append(
+                f"{s.name:<40} {s.calls:>7} {s.total_secs * 1000:>9.1f} "
+                f"{s.p50_secs * 1000:>7.2f} {s.p95_secs * 1000:>7.2f} "
+                f"{s.p99_secs * 1000:>7.2f} {s.main_thread_calls:>6} "
+                f"{s.bytes_in / 1024:>8.1f} {s.bytes_out / 1024:>8.1f}"
+            )
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "methods": [
+                dict(s.__dict__, background_calls=s.background_calls)
+                for s in self.summary()
+            ],
+            "stalls": [stall.__dict__ for stall in self.stalls()],
+        }
+
+    def dump_json(self, path: str) -> None:
+        with open(path, "wb") as file:
+            file.write(to_json_bytes(self.to_dict()))
+
+    def dump_chrome_trace(self, path: str) -> None:
+        """Write the buffered calls in Chrome's trace event format, which can be
+        loaded into chrome://tracing or https://ui.perfetto.dev."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": method_name(call.service, call.method),
+                "cat": "main" if call.main_thread else "background",
+                "ph": "X",
+                "ts": call.start * 1_000_000,
+                "dur": call.elapsed * 1_000_000,
+                "pid": pid,
+                "tid": call.thread_id,
+                "args": {"bytes_in": call.bytes_in, "bytes_out": call.bytes_out},
+            }
+            for call in self.calls()
+        ]
+        with open(path, "wb") as file:
+            file.write(to_json_bytes({"traceEvents": events}))
+
+
+def _percentile(sorted_values: list[float], percent: int) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, (len(sorted_values) * percent) // 100)
+    return sorted_values[idx]
+
+
+_profiler: BackendProfiler | None = None
+
+
+def active() -> BackendProfiler | None:
+    "The running profiler, or None if profiling is disabled."
+    return _profiler
+
+
+def enable(capacity: int = DEFAULT_CAPACITY) -> BackendProfiler:
+    "Start recording backend calls, if not already doing so."
+    global _profiler
+    if _profiler is None:
+        _profiler = BackendProfiler(capacity)
+    return _profiler
+
+
+def disable() -> None:
+    global _profiler
+    _profiler = None
+
+
+if capacity := os.environ.get("ANKI_PROFILE_BACKEND"):
+    enable(
+        int(capacity) if capacity.isdigit() and int(capacity) > 1 else DEFAULT_CAPACITY
+    )
@@ -0,0 +1,205 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+"""
+Records how long the callbacks registered on hooks and filters take to run.
+
+The profiler is disabled by default. It can be enabled at startup by setting
+the ANKI_PROFILE_HOOKS environment variable, or at runtime with enable().
+Time is recorded per hook and callback, along with the module that defined
+the callback, which the GUI maps to the add-on that owns it.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+# callbacks that take longer than this are considered over budget
+DEFAULT_BUDGET_SECS = 0.05
+# durations kept per callback, for percentiles
+RECENT_CALLS = 200
+
+
+@dataclass
+class CallbackStats:
+    hook: str
+    callback: str
+    module: str
+    calls: int
+    total_secs: float
+    max_secs: float
+    p95_secs: float
+    over_budget: int
+
+    @property
+    def avg_secs(self) -> float:
+        return self.total_secs / self.calls if self.calls else 0.0
+
+
+@dataclass
+class SlowCall:
+    hook: str
+    callback: str
+    module: str
+    start: float
+    elapsed: float
+
+
+@dataclass
+class _Totals:
+    calls: int = 0
+    total_secs: float = 0.0
+    max_secs: float = 0.0
+    over_budget: int = 0
+    recent: deque[float] = field(default_factory=lambda: deque(maxlen=RECENT_CALLS))
+
+
+def callback_module(callback: Callable) -> str:
+    "The module that defined the callback, or '' if unknown."
+    func = getattr(callback, "__func__", callback)
+    if isinstance(func, functools.partial):
+        func = func.func
+    return getattr(func, "__module__", None) or type(callback).__module__ or ""
+
+
+def callback_name(callback: Callable) -> str:
+    func = getattr(callback, "__func__", callback)
+    if isinstance(func, functools.partial):
+        func = func.func
+    return getattr(func, "__qualname__", None) or repr(callback)
+
+
+class HookProfiler:
+    """Keeps running totals for every (hook, callback) pair since the last
+    clear(), and the most recent calls that went over budget.
+
+    Percentiles are calculated from the last RECENT_CALLS calls of each
+    callback."""
+
+    def __init__(self, budget_secs: float = DEFAULT_BUDGET_SECS) -> None:
+        self.budget_secs = budget_secs
+        self._lock = threading.Lock()
+        self._totals: dict[tuple[str, str, str], _Totals] = {}
+        self._slow: deque[SlowCall] = deque(maxlen=100)
+
+    @contextmanager
+    def timed(self, hook: str, callback: Callable) -> Iterator[None]:
+        "Time the block, which should run `callback` for `hook`."
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(hook, callback, time.perf_counter() - start)
+
+    def record(self, hook: str, callback: Callable, elapsed: float) -> None:
+        key = (hook, callback_name(callback), callback_module(callback))
+        with self._lock:
+            totals = self._totals.setdefault(key, _Totals())
+            totals.calls += 1
+            totals.total_secs += elapsed
+            totals.max_secs = max(totals.max_secs, elapsed)
+            totals.recent.append(elapsed)
+            if elapsed > self.budget_secs:
+                totals.over_budget += 1
+                self._slow.append(SlowCall(*key, time.time() - elapsed, elapsed))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._totals.clear()
+            self._slow.clear()
+
+    def slow_calls(self) -> list[SlowCall]:
+        "The most recent calls that went over budget, oldest first."
+        with self._lock:
+            return list(self._slow)
+
+    def summary(self) -> list[CallbackStats]:
+        "Per-callback statistics, slowest (by total time) first."
+        with self._lock:
+            items = [
+                (key, totals, sorted(totals.recent))
+                for key, totals in self._totals.items()
+            ]
+        stats = [
+            CallbackStats(
+                hook=hook,
+                callback=name,
+                module=module,
+                calls=totals.calls,
+                total_secs=totals.total_secs,
+                max_secs=totals.max_secs,
+                p95_secs=recent[min(len(recent) - 1, len(recent) * 95 // 100)],
+                over_budget=totals.over_budget,
+            )
+            for (hook, name, module), totals, recent in items
+        ]
+        stats.sort(key=lambda s: s.total_secs, reverse=True)
+        return stats
+
+    def report(
+        self,
+        limit: int = 30,
+        owner: Callable[[str], str] = lambda module: module,
+        only_owner: str | None = None,
+    ) -> str:
+        """A plain-text table of the most expensive callbacks.
+
+        `owner` maps a callback's module to the name shown for it, such as the
+        add-on it belongs to. If `only_owner` is set, only that owner's
+        callbacks are included."""
+        lines = [
+            f"{'hook':<36} {'callback':<36} {'owner':<20} {'calls':>6} "
+            f"{'total ms':>9} {'avg':>7} {'p95':>7} {'max':>7} {'slow':>5}"
+        ]
+        stats = [(owner(s.module), s) for s in self.summary()]
+        if only_owner is not None:
+            stats = [(name, s) for name, s in stats if name == only_owner]
+        for name, s in stats[:limit]:
+            lines.append(
+                f"{s.hook[:36]:<36} {s.callback[:36]:<36} {name[:20]:<20} "
+                f"{s.calls:>6} {s.total_secs * 1000:>9.1f} "
+                f"{s.avg_secs * 1000:>7.2f} {s.p95_secs * 1000:>7.2f} "
+                f"{s.max_secs * 1000:>7.1f} {s.over_budget:>5}"
+            )
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "callbacks": [
+                dict(s.__dict__, avg_secs=s.avg_secs) for s in self.summary()
+            ],
+            "slow_calls": [call.__dict__ for call in self.slow_calls()],
+        }
+
+
+_profiler: HookProfiler | None = None
+
+
+def active() -> HookProfiler | None:
+    "The running profiler, or None if profiling is disabled."
+    return _profiler
+
+
+def enable(budget_secs: float = DEFAULT_BUDGET_SECS) -> HookProfiler:
+    "Start recording hook callbacks, if not already doing so."
+    global _profiler
+    if _profiler is None:
+        _profiler = HookProfiler(budget_secs)
+    return _profiler
+
+
+def disable() -> None:
+    global _profiler
+    _profiler = None
+
+
+if os.environ.get("ANKI_PROFILE_HOOKS"):
+    enable()
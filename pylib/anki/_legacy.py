@@ -65,6 +65,9 @@ def _get_remapped_and_replacement(
 class DeprecatedNamesMixin:
     "Expose instance methods/vars as camelCase for legacy callers."
 
+    # allow subclasses to use __slots__
+    __slots__ = ()
+
     # deprecated name -> new name
     _deprecated_aliases: dict[str, str] = {}
     # deprecated name -> [new internal name, new name shown to user]
@@ -3,6 +3,9 @@ from typing import Union
 class Backend:
     @classmethod
     def command(cls, service: int, method: int, data: bytes) -> bytes: ...
+    def command_many(
+        self, commands: list[tuple[int, int, bytes]]
+    ) -> list[tuple[bool, bytes]]: ...
     def db_command(self, data: bytes) -> bytes: ...
 
 def buildhash() -> str: ...
@@ -0,0 +1,181 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+"""
+A persistent cache of revlog aggregates, used by the legacy stats report.
+
+Reviews are summed per deck, and into 15 minute buckets, which is fine
+enough to work out days and hours exactly for any timezone and rollover
+hour. The cache is stored next to the collection. Each time it is used,
+only revlog entries above the last processed id are read, along with the
+reviews of cards that have changed deck since. If the revlog changed in any
+other way, such as older reviews arriving in a sync, it is rebuilt.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from typing import Any
+
+import anki.collection
+from anki.db import DB
+from anki.utils import ids2str
+
+VERSION = 1
+BUCKET_MS = 15 * 60 * 1000
+# reviews of cards that have since been deleted
+DELETED_CARD_DID = -1
+# if more cards than this changed deck, rebuilding is quicker than moving them
+MAX_MOVED_CARDS = 5000
+
+# Within a bucket, entries at the very end of the bucket or in its first
+# second are kept apart, as the legacy report's queries mix second and
+# millisecond precision, and they may fall on different sides of a boundary.
+_BUCKET_EDGE_SQL = f"""
+case when id % {BUCKET_MS} = 0 then 0
+when (id - 1) % {BUCKET_MS} < 999 then 1
+else 2 end"""
+_BUCKET_SQL = f"(id + {BUCKET_MS - 1}) / {BUCKET_MS}"
+_KEY_COLUMNS = "bucket, edge, type, ease, mature"
+# a revlog id that all entries in the bucket share their day and hour with
+_REPRESENTATIVE_ID_SQL = f"""
+case edge when 0 then bucket * {BUCKET_MS}
+when 1 then (bucket - 1) * {BUCKET_MS} + 1
+else (bucket - 1) * {BUCKET_MS} + 1000 end"""
+
+_SCHEMA = f"""
+create table if not exists meta (key text primary key, value integer);
+create table if not exists cards (id integer primary key, did integer not null);
+create table if not exists buckets (
+    did integer not null,
+    bucket integer not null,
+    edge integer not null,
+    type integer not null,
+    ease integer not null,
+    mature integer not null,
+    count integer not null,
+    time integer not null,
+    primary key (did, {_KEY_COLUMNS})
+) without rowid;
+"""
+
+
+def cache_path(col: anki.collection.Collection) -> str:
+    return f"{os.path.splitext(col.path)[0]}.stats.db"
+
+
+class RevlogCache:
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def query(
+        self,
+        col: anki.collection.Collection,
+        dids: Iterable[int] | None,
+        sql: str,
+        *args: Any,
+    ) -> list[tuple[Any, ...]]:
+        """Bring the cache up to date, and run `sql` on it.
+
+        The query can select from a `reviews` table with columns id, type,
+        ease, mature, count and time, covering the reviews of cards in the
+        given decks, or all reviews if None. Each row stands for `count`
+        revlog entries, which fall on the same day and hour as `id`."""
+        db = DB(self.path)
+        try:
+            db.executescript(_SCHEMA)
+            self._update(db, col)
+            db.commit()
+            lim = "" if dids is None else f"where did in {ids2str(dids)}"
+            return db.all(
+                f"""
+with reviews as (
+select {_REPRESENTATIVE_ID_SQL} as id, type, ease, mature, count, time
+from buckets {lim}
+) {sql}""",
+                *args,
+            )
+        finally:
+            db.close()
+
+    def _update(self, db: DB, col: anki.collection.Collection) -> None:
+        meta = dict(db.all("select key, value from meta"))
+        high_water = meta.get("high_water", 0)
+        processed = meta.get("processed", 0)
+        total, newest = col.db.first("select count(), max(id) from revlog")
+        new_entries = col.db.scalar(
+            "select count() from revlog where id > ?", high_water
+        )
+        current_decks: dict[int, int] = dict(col.db.all("select id, did from cards"))
+        cached_decks: dict[int, int] = dict(db.all("select id, did from cards"))
+        moved = {
+            cid: did
+            for cid, did in cached_decks.items()
+            if current_decks.get(cid, DELETED_CARD_DID) != did
+        }
+
+        if (
+            meta.get("version") != VERSION
+            or meta.get("schema") != col.db.scalar("select scm from col")
+            or total != processed + new_entries
+            or len(moved) > MAX_MOVED_CARDS
+        ):
+            db.execute("delete from buckets")
+            db.execute("delete from cards")
+            cached_decks = {}
+            high_water = 0
+            moved = {}
+
+        changes: list[tuple[int, ...]] = []
+        # reviews of cards that have changed deck since they were added
+        old_decks = list(moved.items())
+        for i in range(0, len(old_decks), 500):
+            chunk = dict(old_decks[i : i + 500])
+            for cid, *key, count, time_sum in col.db.all(
+                f"""
+select cid, {_BUCKET_SQL}, {_BUCKET_EDGE_SQL}, type, ease, lastIvl >= 21,
+count(), sum(time) from revlog where id <= ? and cid in {ids2str(chunk)}
+group by 1, 2, 3, 4, 5, 6""",
+                high_water,
+            ):
+                new_did = current_decks.get(cid, DELETED_CARD_DID)
+                changes.append((chunk[cid], *key, -count, -time_sum))
+                changes.append((new_did, *key, count, time_sum))
+
+        # reviews added since the last update
+        for did, *key, count, time_sum in col.db.all(
+            f"""
+select coalesce(c.did, {DELETED_CARD_DID}), {_BUCKET_SQL.replace("id", "r.id")},
+{_BUCKET_EDGE_SQL.replace("id", "r.id")}, r.type, r.ease, r.lastIvl >= 21,
+count(), sum(r.time) from revlog r left join cards c on c.id = r.cid
+where r.id > ? and r.id <= ? group by 1, 2, 3, 4, 5, 6""",
+            high_water,
+            newest or 0,
+        ):
+            changes.append((did, *key, count, time_sum))
+
+        db.executemany(
+            f"""
+insert into buckets values (?, ?, ?, ?, ?, ?, ?, ?)
+on conflict (did, {_KEY_COLUMNS}) do update
+set count = count + excluded.count, time = time + excluded.time""",
+            changes,
+        )
+        db.execute("delete from buckets where count = 0")
+        decks = dict(current_decks)
+        for cid in cached_decks.keys() - current_decks.keys():
+            decks[cid] = DELETED_CARD_DID
+        db.executemany(
+            "insert or replace into cards values (?, ?)",
+            [(cid, did) for cid, did in decks.items() if cached_decks.get(cid) != did],
+        )
+        db.executemany(
+            "insert or replace into meta values (?, ?)",
+            [
+                ("version", VERSION),
+                ("schema", col.db.scalar("select scm from col")),
+                ("high_water", newest or 0),
+                ("processed", total),
+            ],
+        )
@@ -5,7 +5,8 @@ from __future__ import annotations
 
 import pprint
 import time
-from typing import NewType
+from collections.abc import Iterator, Sequence
+from typing import Any, NewType, overload
 
 import anki  # pylint: disable=unused-import
 import anki.collection
@@ -37,6 +38,39 @@ FSRSMemoryState = cards_pb2.FsrsMemoryState
 
 
 class Card(DeprecatedNamesMixin):
+    # Cards are often loaded in bulk, so their fields are stored in slots
+    # rather than a per-instance dict. A __dict__ is still available for
+    # callers that attach their own attributes, but is only created on use.
+    __slots__ = (
+        "col",
+        "timer_started",
+        "_render_output",
+        "_note",
+        "id",
+        "nid",
+        "did",
+        "ord",
+        "mod",
+        "usn",
+        "type",
+        "queue",
+        "due",
+        "ivl",
+        "factor",
+        "reps",
+        "lapses",
+        "left",
+        "odue",
+        "odid",
+        "flags",
+        "original_position",
+        "custom_data",
+        "memory_state",
+        "desired_retention",
+        "__dict__",
+        "__weakref__",
+    )
+
     _note: Note | None
     lastIvl: int
     ord: int
@@ -148,6 +182,12 @@ class Card(DeprecatedNamesMixin):
     def answer_av_tags(self) -> list[AVTag]:
         return self.render_output().answer_av_tags
 
+    def question_av_tags_without_hooks(self) -> list[AVTag]:
+        "Like question_av_tags(), but skips custom filters and render hooks."
+        return anki.template.TemplateRenderContext.from_existing_card(
+            self, False
+        ).question_av_tags_without_hooks()
+
     def render_output(
         self, reload: bool = False, browser: bool = False
     ) -> anki.template.TemplateRenderOutput:
@@ -210,12 +250,21 @@ class Card(DeprecatedNamesMixin):
         return total
 
     def description(self) -> str:
-        dict_copy = dict(self.__dict__)
-        # remove non-useful elements
-        del dict_copy["_note"]
-        del dict_copy["_render_output"]
-        del dict_copy["col"]
-        del dict_copy["timer_started"]
+        dict_copy = {
+            name: getattr(self, name)
+            for name in Card.__slots__
+            # remove non-useful elements
+            if name
+            not in (
+                "_note",
+                "_render_output",
+                "col",
+                "timer_started",
+                "__dict__",
+                "__weakref__",
+            )
+        }
+        dict_copy.update(self.__dict__)
         return f"{super().__repr__()} {pprint.pformat(dict_copy, width=300)}"
 
     def user_flag(self) -> int:
@@ -242,3 +291,102 @@ Card.register_deprecated_aliases(
     a=Card.answer,
     model=Card.note_type,
 )
+
+
+# Card batches
+##########################################################################
+
+# Card attribute -> field of the backend card
+_BACKEND_FIELDS = {
+    "id": "id",
+    "nid": "note_id",
+    "did": "deck_id",
+    "ord": "template_idx",
+    "mod": "mtime_secs",
+    "usn": "usn",
+    "type": "ctype",
+    "queue": "queue",
+    "due": "due",
+    "ivl": "interval",
+    "factor": "ease_factor",
+    "reps": "reps",
+    "lapses": "lapses",
+    "left": "remaining_steps",
+    "odue": "original_due",
+    "odid": "original_deck_id",
+    "flags": "flags",
+}
+
+
+class CardBatch(Sequence[Card]):
+    """A read-mostly sequence of cards, as returned by col.get_card_batch().
+
+    The cards are kept in the backend's compact form, and a Card object is
+    only built when an item is accessed, after which the same object is
+    returned on later accesses. Column accessors like dues() read the
+    backend form directly, so analysing many cards doesn't require building
+    a Card for each of them. They reflect changes made to cards that have
+    been accessed."""
+
+    def __init__(
+        self, col: anki.collection.Collection, backend_cards: Sequence[BackendCard]
+    ) -> None:
+        self.col = col.weakref()
+        self._backend_cards = list(backend_cards)
+        self._cards: list[Card | None] = [None] * len(self._backend_cards)
+
+    def __len__(self) -> int:
+        return len(self._backend_cards)
+
+    @overload
+    def __getitem__(self, index: int) -> Card: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Card]: ...
+
+    def __getitem__(self, index: int | slice) -> Card | list[Card]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        card = self._cards[index]
+        if card is None:
+            card = self._cards[index] = Card(
+                self.col, backend_card=self._backend_cards[index]
+            )
+        return card
+
+    def __iter__(self) -> Iterator[Card]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def column(self, attr: str) -> list[Any]:
+        "The value of a Card attribute like 'due' or 'ivl', for every card."
+        field = _BACKEND_FIELDS[attr]
+        return [
+            getattr(card, attr) if card else getattr(backend_card, field)
+            for card, backend_card in zip(self._cards, self._backend_cards)
+        ]
+
+    def ids(self) -> list[CardId]:
+        return self.column("id")
+
+    def note_ids(self) -> list[anki.notes.NoteId]:
+        return self.column("nid")
+
+    def deck_ids(self) -> list[anki.decks.DeckId]:
+        return self.column("did")
+
+    def queues(self) -> list[int]:
+        return self.column("queue")
+
+    def dues(self) -> list[int]:
+        return self.column("due")
+
+    def intervals(self) -> list[int]:
+        return self.column("ivl")
+
+    def to_backend_cards(self) -> list[BackendCard]:
+        "The cards in backend form, including any changes made to accessed cards."
+        return [
+            card._to_backend_card() if card else backend_card
+            for card, backend_card in zip(self._cards, self._backend_cards)
+        ]
@@ -3,12 +3,15 @@
 
 from __future__ import annotations
 
-from collections.abc import Generator, Iterable, Sequence
+from collections.abc import Callable, Generator, Iterable, Sequence
 from typing import Any, Literal, Union, cast
 
+from google.protobuf.message import Message
+
 from anki import (
     ankiweb_pb2,
     card_rendering_pb2,
+    cards_pb2,
     collection_pb2,
     config_pb2,
     generic_pb2,
@@ -64,13 +67,14 @@ import sys
 import time
 import traceback
 import weakref
+from contextlib import contextmanager
 from dataclasses import dataclass
 
 import anki.latex
 from anki import hooks
-from anki._backend import RustBackend, Translations
+from anki._backend import BackendBatch, BatchOutput, RustBackend, Translations
 from anki.browser import BrowserConfig, BrowserDefaults
-from anki.cards import Card, CardId
+from anki.cards import Card, CardBatch, CardId
 from anki.config import Config, ConfigManager
 from anki.consts import *
 from anki.dbproxy import DBProxy
@@ -474,18 +478,87 @@ class Collection(DeprecatedNamesMixin):
             tags=tags,
         )
 
+    # Batched backend requests
+    ##########################################################################
+
+    @contextmanager
+    def batch(self) -> Generator[BackendBatch, None, None]:
+        """Run several independent backend requests with a single call into the
+        backend. The requests are run when the block exits.
+
+            with col.batch() as batch:
+                deck = batch.add(RustBackend.get_deck_raw, DeckId(did=1), Deck)
+                card = batch.add(RustBackend.get_card_raw, CardId(cid=1), Card)
+            deck.result().name
+
+        The request and response types are the protobuf messages, not the
+        Python wrappers like anki.cards.Card."""
+        batch = BackendBatch(self._backend)
+        yield batch
+        batch.run()
+
+    _GET_BATCH_SIZE = 1000
+
+    def _get_in_batches(
+        self,
+        method: Callable[[Any, bytes], bytes],
+        messages: Sequence[Message],
+        output_type: type[BatchOutput],
+    ) -> Generator[BatchOutput, None, None]:
+        for i in range(0, len(messages), self._GET_BATCH_SIZE):
+            with self.batch() as batch:
+                results = [
+                    batch.add(method, message, output_type)
+                    for message in messages[i : i + self._GET_BATCH_SIZE]
+                ]
+            for result in results:
+                yield result.result()
+
     # Object helpers
     ##########################################################################
 
     def get_card(self, id: CardId | None) -> Card:
         return Card(self, id)
 
+    def get_cards(self, ids: Sequence[CardId]) -> list[Card]:
+        """Load multiple cards, in the order of the provided ids.
+
+        Faster than calling get_card() repeatedly, as the cards are fetched
+        from the backend in batches. Raises NotFoundError if a card is missing."""
+        return [
+            Card(self, backend_card=backend_card)
+            for backend_card in self._get_in_batches(
+                RustBackend.get_card_raw,
+                [cards_pb2.CardId(cid=id) for id in ids],
+                cards_pb2.Card,
+            )
+        ]
+
+    def get_card_batch(self, ids: Sequence[CardId]) -> CardBatch:
+        """Like get_cards(), but Card objects are only built as they are
+        accessed, and columns such as dues can be read without building them.
+        Useful when handling many cards at once."""
+        return CardBatch(
+            self,
+            list(
+                self._get_in_batches(
+                    RustBackend.get_card_raw,
+                    [cards_pb2.CardId(cid=id) for id in ids],
+                    cards_pb2.Card,
+                )
+            ),
+        )
+
     def update_cards(
         self, cards: Sequence[Card], skip_undo_entry: bool = False
     ) -> OpChanges:
         """Save card changes to database."""
+        if isinstance(cards, CardBatch):
+            backend_cards = cards.to_backend_cards()
+        else:
+            backend_cards = [c._to_backend_card() for c in cards]
         return self._backend.update_cards(
-            cards=[c._to_backend_card() for c in cards], skip_undo_entry=skip_undo_entry
+            cards=backend_cards, skip_undo_entry=skip_undo_entry
         )
 
     def update_card(self, card: Card, skip_undo_entry: bool = False) -> OpChanges:
@@ -495,6 +568,20 @@ class Collection(DeprecatedNamesMixin):
     def get_note(self, id: NoteId) -> Note:
         return Note(self, id=id)
 
+    def get_notes(self, ids: Sequence[NoteId]) -> list[Note]:
+        """Load multiple notes, in the order of the provided ids.
+
+        Faster than calling get_note() repeatedly, as the notes are fetched
+        from the backend in batches. Raises NotFoundError if a note is missing."""
+        return [
+            Note(self, backend_note=backend_note)
+            for backend_note in self._get_in_batches(
+                RustBackend.get_note_raw,
+                [notes_pb2.NoteId(nid=id) for id in ids],
+                notes_pb2.Note,
+            )
+        ]
+
     def update_notes(
         self, notes: Sequence[Note], skip_undo_entry: bool = False
     ) -> OpChanges:
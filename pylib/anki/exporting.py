@@ -15,13 +15,14 @@ import unicodedata
 import zipfile
 from collections.abc import Sequence
 from io import BufferedWriter
-from typing import Any
+from typing import Any, TypeVar
 from zipfile import ZipFile
 
 from anki import hooks
 from anki.cards import CardId
 from anki.collection import Collection
 from anki.decks import DeckId
+from anki.notes import NoteId
 from anki.utils import ids2str, namedtmp, split_fields, strip_html
 
 
@@ -97,6 +98,20 @@ class Exporter:
         return cids
 
 
+# Text exports are processed in chunks of this many cards or notes, so
+# large collections can be exported without holding all rows in memory.
+TEXT_EXPORT_CHUNK_SIZE = 500
+
+_T = TypeVar("_T")
+
+
+def _chunks(ids: list[_T]) -> list[list[_T]]:
+    return [
+        ids[i : i + TEXT_EXPORT_CHUNK_SIZE]
+        for i in range(0, len(ids), TEXT_EXPORT_CHUNK_SIZE)
+    ]
+
+
 # Cards as TSV
 ######################################################################
 
@@ -114,19 +129,25 @@ class TextCardExporter(Exporter):
 
     def doExport(self, file) -> None:
         ids = sorted(self.cardIds())
-        strids = ids2str(ids)
 
         def esc(s):
             # strip off the repeated question in answer if exists
             s = re.sub("(?si)^.*<hr id=answer>\n*", "", s)
             return self.processText(s)
 
-        out = ""
-        for cid in ids:
-            c = self.col.get_card(cid)
-            out += esc(c.question())
-            out += "\t" + esc(c.answer()) + "\n"
-        file.write(out.encode("utf-8"))
+        def render(cids: list[CardId]) -> str:
+            return "".join(
+                esc(c.question()) + "\t" + esc(c.answer()) + "\n"
+                for c in self.col.get_cards(cids)
+            )
+
+        done = 0
+        for cids in _chunks(ids):
+            file.write(render(cids).encode("utf-8"))
+            done += len(cids)
+            hooks.legacy_export_progress(
+                self.col.tr.exporting_card_exported(count=done)
+            )
 
 
 # Notes as TSV
@@ -147,29 +168,39 @@ class TextNoteExporter(Exporter):
         return col.tr.exporting_notes_in_plain_text()
 
     def doExport(self, file: BufferedWriter) -> None:
-        cardIds = self.cardIds()
-        data = []
-        for id, flds, tags in self.col.db.execute(
-            """
-select guid, flds, tags from notes
-where id in
-(select nid from cards
-where cards.id in %s)"""
-            % ids2str(cardIds)
-        ):
-            row = []
-            # note id
-            if self.includeID:
-                row.append(str(id))
-            # fields
-            row.extend([self.processText(f) for f in split_fields(flds)])
-            # tags
-            if self.includeTags:
-                row.append(tags.strip())
-            data.append("\t".join(row))
-        self.count = len(data)
-        out = "\n".join(data)
-        file.write(out.encode("utf-8"))
+        nids = self.col.db.list(
+            "select distinct nid from cards where id in %s order by nid"
+            % ids2str(self.cardIds())
+        )
+
+        def rows(nids: list[NoteId]) -> str:
+            data = []
+            for id, flds, tags in self.col.db.execute(
+                "select guid, flds, tags from notes where id in %s order by id"
+                % ids2str(nids)
+            ):
+                row = []
+                # note id
+                if self.includeID:
+                    row.append(str(id))
+                # fields
+                row.extend([self.processText(f) for f in split_fields(flds)])
+                # tags
+                if self.includeTags:
+                    row.append(tags.strip())
+                data.append("\t".join(row))
+            return "\n".join(data)
+
+        self.count = 0
+        for chunk in _chunks(nids):
+            text = rows(chunk)
+            if self.count:
+                text = "\n" + text
+            file.write(text.encode("utf-8"))
+            self.count += len(chunk)
+            hooks.legacy_export_progress(
+                self.col.tr.exporting_note_exported(count=self.count)
+            )
 
 
 # Anki decks
@@ -7,8 +7,8 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, dataclass, field
-from typing import Union
+from dataclasses import asdict, dataclass, field, fields
+from typing import IO, Union
 
 from anki.consts import STARTING_FACTOR_FRACTION
 from anki.decks import DeckId
@@ -108,6 +108,27 @@ class ForeignData:
     def serialize(self) -> str:
         return json.dumps(self, cls=ForeignDataEncoder, separators=(",", ":"))
 
+    def serialize_to(self, file: IO[str]) -> None:
+        """Write the same JSON as serialize() to `file`, one note at a time, so
+        large collections don't have to be held in memory as a single string."""
+        encoder = ForeignDataEncoder(separators=(",", ":"))
+        file.write("{")
+        for idx, fld in enumerate(fields(self)):
+            if idx:
+                file.write(",")
+            file.write(f"{encoder.encode(fld.name)}:")
+            value = getattr(self, fld.name)
+            if isinstance(value, list):
+                file.write("[")
+                for item_idx, item in enumerate(value):
+                    if item_idx:
+                        file.write(",")
+                    file.write(encoder.encode(item))
+                file.write("]")
+            else:
+                file.write(encoder.encode(value))
+        file.write("}")
+
 
 class ForeignDataEncoder(json.JSONEncoder):
     def default(self, obj: object) -> dict:
@@ -14,9 +14,12 @@ Card      | Card
 Notetype  | Card Type
 """
 
+from __future__ import annotations
+
 import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 from anki.db import DB
 from anki.decks import DeckId
@@ -34,6 +37,16 @@ def serialize(db_path: str, deck_id: DeckId) -> str:
     return gather_data(db, deck_id).serialize()
 
 
+def serialize_to_file(db_path: str, deck_id: DeckId, out_path: str) -> str:
+    """Like serialize(), but streams the JSON into `out_path`, which is returned."""
+    db = open_mnemosyne_db(db_path)
+    data = gather_data(db, deck_id)
+    db.close()
+    with open(out_path, "w", encoding="utf8") as file:
+        data.serialize_to(file)
+    return out_path
+
+
 def gather_data(db: DB, deck_id: DeckId) -> ForeignData:
     facts = gather_facts(db)
     gather_cards_into_facts(db, facts)
@@ -130,13 +143,7 @@ class MnemoCard:
     lapses: int
 
     def card_ord(self) -> int:
-        ord = self.fact_view_id.rsplit(".", maxsplit=1)[-1]
-        try:
-            return int(ord) - 1
-        except ValueError as err:
-            raise Exception(
-                f"Fact view id '{self.fact_view_id}' has unknown format"
-            ) from err
+        return card_ord(self.fact_view_id)
 
     def is_new(self) -> bool:
         return self.last_rep == -1
@@ -174,20 +181,14 @@ class MnemoFact:
 
     def fact_view(self) -> type[MnemoFactView]:
         try:
-            fact_view = self.cards[0].fact_view_id
+            fact_view_id = self.cards[0].fact_view_id
         except IndexError as err:
             raise Exception(f"Fact {id} has no cards") from err
 
-        if fact_view.startswith("1.") or fact_view.startswith("1::"):
-            return FrontOnly
-        elif fact_view.startswith("2.") or fact_view.startswith("2::"):
-            return FrontBack
-        elif fact_view.startswith("3.") or fact_view.startswith("3::"):
-            return Vocabulary
-        elif fact_view.startswith("5.1"):
-            return Cloze
+        if fact_view := fact_view_for_id(fact_view_id):
+            return fact_view
 
-        raise Exception(f"Fact {id} has unknown fact view: {fact_view}")
+        raise Exception(f"Fact {id} has unknown fact view: {fact_view_id}")
 
     def anki_fields(self, fact_view: type[MnemoFactView]) -> list[str]:
         return [munge_field(self.fields.get(k, "")) for k in fact_view.field_keys]
@@ -208,6 +209,32 @@ class MnemoFact:
         return [card.foreign_card() for card in self.cards if not card.is_new()]
 
 
+# Collections only use a handful of distinct fact view ids, so the parsing below
+# is cached rather than repeated for every card.
+
+
+@lru_cache(maxsize=None)
+def fact_view_for_id(fact_view_id: str) -> type[MnemoFactView] | None:
+    if fact_view_id.startswith("1.") or fact_view_id.startswith("1::"):
+        return FrontOnly
+    elif fact_view_id.startswith("2.") or fact_view_id.startswith("2::"):
+        return FrontBack
+    elif fact_view_id.startswith("3.") or fact_view_id.startswith("3::"):
+        return Vocabulary
+    elif fact_view_id.startswith("5.1"):
+        return Cloze
+    return None
+
+
+@lru_cache(maxsize=None)
+def card_ord(fact_view_id: str) -> int:
+    ord = fact_view_id.rsplit(".", maxsplit=1)[-1]
+    try:
+        return int(ord) - 1
+    except ValueError as err:
+        raise Exception(f"Fact view id '{fact_view_id}' has unknown format") from err
+
+
 def munge_field(field: str) -> str:
     # \n -> br
     field = re.sub("\r?\n", "<br>", field)
@@ -12,7 +12,7 @@ from anki.cards import CardId
 from anki.collection import Collection
 from anki.consts import *
 from anki.decks import DeckId, DeckManager
-from anki.importing.base import Importer
+from anki.importing.base import PROGRESS_INTERVAL, Importer
 from anki.models import NotetypeId
 from anki.notes import NoteId
 from anki.utils import int_time, join_fields, split_fields, strip_html_media
@@ -111,6 +111,8 @@ class Anki2Importer(Importer):
         total = 0
         for note in self.src.db.execute("select * from notes"):
             total += 1
+            if total % PROGRESS_INTERVAL == 0:
+                self.report_progress(total)
             # turn the db result into a mutable list
             note = list(note)
             shouldAdd = self._uniquifyNote(note)
@@ -4,6 +4,7 @@
 # pylint: disable=invalid-name
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import Any
 
 from anki.collection import Collection
@@ -12,6 +13,9 @@ from anki.utils import max_id
 # Base importer
 ##########################################################################
 
+# progress is reported after every this many notes
+PROGRESS_INTERVAL = 1000
+
 
 class Importer:
     needMapper = False
@@ -24,6 +28,8 @@ class Importer:
         self.col = col.weakref()
         self.total = 0
         self.dst = None
+        # called with a progress label; the import may run on any thread
+        self.progress: Callable[[str], None] | None = None
 
     def run(self) -> None:
         pass
@@ -36,6 +42,10 @@ class Importer:
         "Closes the open file."
         return
 
+    def report_progress(self, notes: int) -> None:
+        if self.progress:
+            self.progress(self.col.tr.importing_processed_notes(count=notes))
+
     # Timestamps
     ######################################################################
     # It's too inefficient to check for existing ids on every object,
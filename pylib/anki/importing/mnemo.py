@@ -5,7 +5,8 @@
 
 import re
 import time
-from typing import cast
+from functools import lru_cache
+from typing import Optional, cast
 
 from anki.db import DB
 from anki.importing.noteimp import ForeignCard, ForeignNote, NoteImporter
@@ -24,74 +25,72 @@ class MnemosyneImporter(NoteImporter):
             self.log.append(
                 self.col.tr.importing_file_version_unknown_trying_import_anyway()
             )
+        # resolved once for the whole import, instead of once per card
+        today = self.col.sched.today
+        now = time.time()
         # gather facts into temp objects
-        curid = None
-        notes = {}
-        note = None
-        for _id, id, k, v in db.execute(
+        notes: dict[int, dict] = {}
+        for _id, k, v in db.execute(
             """
-select _id, id, key, value from facts f, data_for_fact d where
+select _id, key, value from facts f, data_for_fact d where
 f._id=d._fact_id"""
         ):
-            if id != curid:
-                if note:
-                    # pylint: disable=unsubscriptable-object
-                    notes[note["_id"]] = note
-                note = {"_id": _id}
-                curid = id
-            assert note
+            note = notes.get(_id)
+            if note is None:
+                notes[_id] = note = {"_id": _id, "tags": []}
             note[k] = v
-        if note:
-            notes[note["_id"]] = note
         # gather cards
         front = []
         frontback = []
         vocabulary = []
         cloze = {}
-        for row in db.execute(
+        categories = {"front": front, "frontback": frontback, "vocabulary": vocabulary}
+        split_tags: dict[str, list[str]] = {}
+        for (
+            fact_id,
+            fact_view_id,
+            rawTags,
+            next_rep,
+            last_rep,
+            easiness,
+            reps,
+            lapses,
+        ) in db.execute(
             """
 select _fact_id, fact_view_id, tags, next_rep, last_rep, easiness,
-acq_reps+ret_reps, lapses, card_type_id from cards"""
+acq_reps+ret_reps, lapses from cards"""
         ):
             # categorize note
-            note = notes[row[0]]
-            if row[1].endswith(".1"):
-                if row[1].startswith("1.") or row[1].startswith("1::"):
-                    front.append(note)
-                elif row[1].startswith("2.") or row[1].startswith("2::"):
-                    frontback.append(note)
-                elif row[1].startswith("3.") or row[1].startswith("3::"):
-                    vocabulary.append(note)
-                elif row[1].startswith("5.1"):
-                    cloze[row[0]] = note
+            note = notes[fact_id]
+            category, ord = _fact_view(fact_view_id)
+            if category == "cloze":
+                cloze[fact_id] = note
+            elif category:
+                categories[category].append(note)
             # check for None to fix issue where import can error out
-            rawTags = row[2]
             if rawTags is None:
                 rawTags = ""
             # merge tags into note
-            tags = rawTags.replace(", ", "\x1f").replace(" ", "_")
-            tags = tags.replace("\x1f", " ")
-            if "tags" not in note:
-                note["tags"] = []
-            note["tags"] += self.col.tags.split(tags)
+            tags = split_tags.get(rawTags)
+            if tags is None:
+                tags = rawTags.replace(", ", "\x1f").replace(" ", "_")
+                tags = tags.replace("\x1f", " ")
+                tags = split_tags[rawTags] = self.col.tags.split(tags)
+            note["tags"] += tags
             # if it's a new card we can go with the defaults
-            if row[3] == -1:
+            if next_rep == -1:
                 continue
             # add the card
             c = ForeignCard()
-            c.factor = int(row[5] * 1000)
-            c.reps = row[6]
-            c.lapses = row[7]
+            c.factor = int(easiness * 1000)
+            c.reps = reps
+            c.lapses = lapses
             # ivl is inferred in mnemosyne
-            next, prev = row[3:5]
-            c.ivl = max(1, (next - prev) // 86400)
+            c.ivl = max(1, (next_rep - last_rep) // 86400)
             # work out how long we've got left
-            rem = int((next - time.time()) / 86400)
-            c.due = self.col.sched.today + rem
-            # get ord
-            m = re.search(r".(\d+)$", row[1])
-            assert m
-            ord = int(m.group(1)) - 1
+            rem = int((next_rep - now) / 86400)
+            c.due = today + rem
+            assert ord is not None
             if "cards" not in note:
                 note["cards"] = {}
             note["cards"][ord] = c
@@ -208,3 +207,23 @@ acq_reps+ret_reps, lapses, card_type_id from cards"""
         self._fields = len(model["flds"])
         self.initMapping()
         self.importNotes(data)
+
+
+@lru_cache(maxsize=None)
+def _fact_view(fact_view_id: str) -> tuple[Optional[str], Optional[int]]:
+    """The note category and card ordinal of a fact view id.
+
+    Collections only use a handful of distinct fact views, so this is only
+    worked out once per id rather than once per card."""
+    category = None
+    if fact_view_id.endswith(".1"):
+        if fact_view_id.startswith("1.") or fact_view_id.startswith("1::"):
+            category = "front"
+        elif fact_view_id.startswith("2.") or fact_view_id.startswith("2::"):
+            category = "frontback"
+        elif fact_view_id.startswith("3.") or fact_view_id.startswith("3::"):
+            category = "vocabulary"
+        elif fact_view_id.startswith("5.1"):
+            category = "cloze"
+    m = re.search(r".(\d+)$", fact_view_id)
+    return category, int(m.group(1)) - 1 if m else None
@@ -7,12 +7,13 @@ from __future__ import annotations
 
 import html
 import unicodedata
+from collections.abc import Iterable
 from typing import Union
 
 from anki.collection import Collection
 from anki.config import Config
 from anki.consts import NEW_CARDS_RANDOM, STARTING_FACTOR
-from anki.importing.base import Importer
+from anki.importing.base import PROGRESS_INTERVAL, Importer
 from anki.models import NotetypeId
 from anki.notes import NoteId
 from anki.utils import (
@@ -114,8 +115,13 @@ class NoteImporter(Importer):
         "Return a list of foreign notes for importing."
         return []
 
-    def importNotes(self, notes: list[ForeignNote]) -> None:
-        "Convert each card into a note, apply attributes and add to col."
+    # new notes are written to the collection in chunks of this size
+    _ADD_CHUNK_SIZE = 1000
+
+    def importNotes(self, notes: Iterable[ForeignNote]) -> None:
+        """Convert each card into a note, apply attributes and add to col.
+
+        `notes` may be a generator, so importers can stream large files."""
         if not self.mappingOk():
             raise Exception("mapping not ok")
         # note whether tags are mapped
@@ -140,11 +146,14 @@ class NoteImporter(Importer):
         updates: list[Updates] = []
         updateLog = []
         new = []
+        added = 0
         self._ids: list[NoteId] = []
         self._cards: list[tuple] = []
         dupeCount = 0
         dupes: list[str] = []
-        for n in notes:
+        for processed, n in enumerate(notes, start=1):
+            if processed % PROGRESS_INTERVAL == 0:
+                self.report_progress(processed)
             for c, field in enumerate(n.fields):
                 if not self.allowHTML:
                     n.fields[c] = html.escape(field, quote=False)
@@ -205,7 +214,12 @@ class NoteImporter(Importer):
                     new.append(new_data)
                     # note that we've seen this note once already
                     firsts[fld0] = True
+                    if len(new) >= self._ADD_CHUNK_SIZE:
+                        self.addNew(new)
+                        added += len(new)
+                        new = []
         self.addNew(new)
+        added += len(new)
         self.addUpdates(updates)
         # generate cards + update field cache
         self.col.after_note_updates(self._ids, mark_modified=False)
@@ -219,7 +233,7 @@ class NoteImporter(Importer):
         if not conf["dyn"] and conf["new"]["order"] == NEW_CARDS_RANDOM:
             self.col.sched.randomize_cards(did)
 
-        part1 = self.col.tr.importing_note_added(count=len(new))
+        part1 = self.col.tr.importing_note_added(count=added)
         part2 = self.col.tr.importing_note_updated(count=self.updateCount)
         if self.importMode == UPDATE_MODE:
             unchanged = dupeCount - self.updateCount
@@ -36,59 +36,68 @@ class PaukerImporter(NoteImporter):
         return 2
 
     def foreignNotes(self):
-        """Build and return a list of notes."""
-        notes = []
-
-        try:
-            f = gzip.open(self.file)
-            tree = ET.parse(f)  # type: ignore
-            lesson = tree.getroot()
-            assert lesson.tag == "Lesson"
-        finally:
-            f.close()
+        """Yield notes as the lesson is read.
 
+        The file is decompressed and parsed incrementally, and each card is
+        discarded once its note has been built, so memory use stays constant
+        regardless of the size of the lesson."""
+        today = self.col.sched.today
         index = -4
-
-        for batch in lesson.findall("./Batch"):
-            index += 1
-
-            for card in batch.findall("./Card"):
-                # Create a note for this card.
-                front = card.findtext("./FrontSide/Text")
-                back = card.findtext("./ReverseSide/Text")
-                note = ForeignNote()
-                assert front and back
-                note.fields = [
-                    html.escape(x.strip())
-                    .replace("\n", "<br>")
-                    .replace("  ", " &nbsp;")
-                    for x in [front, back]
-                ]
-                notes.append(note)
-
-                # Determine due date for cards.
-                frontdue = card.find("./FrontSide[@LearnedTimestamp]")
-                backdue = card.find("./ReverseSide[@Batch][@LearnedTimestamp]")
-
-                if frontdue is not None:
-                    note.cards[0] = self._learnedCard(
-                        index, int(frontdue.attrib["LearnedTimestamp"])
-                    )
-
-                if backdue is not None:
-                    note.cards[1] = self._learnedCard(
-                        int(backdue.attrib["Batch"]),
-                        int(backdue.attrib["LearnedTimestamp"]),
-                    )
-
-        return notes
-
-    def _learnedCard(self, batch, timestamp):
+        path = []
+
+        with gzip.open(self.file) as f:
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if not path:
+                        assert elem.tag == "Lesson"
+                    elif elem.tag == "Batch" and len(path) == 1:
+                        index += 1
+                    path.append(elem)
+                    continue
+
+                path.pop()
+                if elem.tag == "Card" and len(path) == 2 and path[1].tag == "Batch":
+                    yield self._noteForCard(elem, index, today)
+                    elem.clear()
+                    path[1].remove(elem)
+                elif elem.tag == "Batch" and len(path) == 1:
+                    path[0].remove(elem)
+
+    def _noteForCard(self, card, index, today):
+        # Create a note for this card.
+        front = card.findtext("./FrontSide/Text")
+        back = card.findtext("./ReverseSide/Text")
+        note = ForeignNote()
+        assert front and back
+        note.fields = [
+            html.escape(x.strip()).replace("\n", "<br>").replace("  ", " &nbsp;")
+            for x in [front, back]
+        ]
+
+        # Determine due date for cards.
+        frontdue = card.find("./FrontSide[@LearnedTimestamp]")
+        backdue = card.find("./ReverseSide[@Batch][@LearnedTimestamp]")
+
+        if frontdue is not None:
+            note.cards[0] = self._learnedCard(
+                index, int(frontdue.attrib["LearnedTimestamp"]), today
+            )
+
+        if backdue is not None:
+            note.cards[1] = self._learnedCard(
+                int(backdue.attrib["Batch"]),
+                int(backdue.attrib["LearnedTimestamp"]),
+                today,
+            )
+
+        return note
+
+    def _learnedCard(self, batch, timestamp, today):
         ivl = math.exp(batch)
         now = time.time()
         due = ivl - (now - timestamp / 1000.0) / ONE_DAY
         fc = ForeignCard()
-        fc.due = self.col.sched.today + int(due + 0.5)
+        fc.due = today + int(due + 0.5)
         fc.ivl = random.randint(int(ivl * 0.90), int(ivl + 0.5))
         fc.factor = random.randint(1500, 2500)
         return fc
@@ -9,9 +9,9 @@ import re
 import sys
 import time
 import unicodedata
+from collections.abc import Iterator
 from string import capwords
-from xml.dom import minidom
-from xml.dom.minidom import Element, Text
+from xml.etree import ElementTree
 
 from anki.collection import Collection
 from anki.importing.noteimp import ForeignCard, ForeignNote, NoteImporter
@@ -96,9 +96,6 @@ class SupermemoXmlImporter(NoteImporter):
         self.numFields = int(2)
 
         # SmXmlParse VARIABLES
-        self.xmldoc = None
-        self.pieces = []
-        self.cntBuf = []  # to store last parsed data
         self.cntElm = []  # to store SM Elements data
         self.cntCol = []  # to store SM Colections data
 
@@ -185,20 +182,17 @@ class SupermemoXmlImporter(NoteImporter):
 
     ## DEFAULT IMPORTER METHODS
 
-    def foreignNotes(self) -> list[ForeignNote]:
-        # Load file and parse it by minidom
-        self.loadSource(self.file)
-
-        # Migrating content / time consuming part
-        # addItemToCards is called for each sm element
+    def foreignNotes(self) -> Iterator[ForeignNote]:
+        # The file is parsed incrementally, and notes are handed to importNotes()
+        # as soon as their SM element has been processed, so large collections
+        # don't need to be held in memory.
         self.logger("Parsing started.")
-        self.parse()
+        self.total = 0
+        for note in self.parseStream(self.file):
+            self.total += 1
+            yield note
         self.logger("Parsing done.")
-
-        # Return imported cards
-        self.total = len(self.notes)
         self.log.append("%d cards imported." % self.total)
-        return self.notes
 
     def fields(self) -> int:
         return 2
@@ -319,75 +313,54 @@ class SupermemoXmlImporter(NoteImporter):
 
         return io.StringIO(str(source))
 
-    def loadSource(self, source: str) -> None:
-        """Load source file and parse with xml.dom.minidom"""
-        self.source = source
-        self.logger("Load started...")
-        sock = open(self.source, encoding="utf8")
-        self.xmldoc = minidom.parse(sock).documentElement
-        sock.close()
-        self.logger("Load done.")
-
     # PARSE
-    def parse(self, node: Text | Element | None = None) -> None:
-        "Parse method - parses document elements"
-
-        if node is None and self.xmldoc is not None:
-            node = self.xmldoc
-
-        _method = "parse_%s" % node.__class__.__name__
-        if hasattr(self, _method):
-            parseMethod = getattr(self, _method)
-            parseMethod(node)
-        else:
-            self.logger("No handler for method %s" % _method, level=3)
-
-    def parse_Document(self, node):
-        "Parse XML document"
-
-        self.parse(node.documentElement)
-
-    def parse_Element(self, node: Element) -> None:
-        "Parse XML element"
-
-        _method = "do_%s" % node.tagName
-        if hasattr(self, _method):
-            handlerMethod = getattr(self, _method)
-            handlerMethod(node)
-        else:
-            self.logger("No handler for method %s" % _method, level=3)
-            # print traceback.print_exc()
+    def parseStream(self, source: str) -> Iterator[ForeignNote]:
+        """Parse source with iterparse, yielding notes as each SM element is
+        completed. Processed elements are cleared and detached from the tree."""
 
-    def parse_Text(self, node: Text) -> None:
-        "Parse text inside elements. Text is stored into local buffer."
-
-        text = node.data
-        self.cntBuf.append(text)
-
-    # def parse_Comment(self, node):
-    #    """
-    #    Source can contain XML comments, but we ignore them
-    #    """
-    #    pass
-
-    # DO
-    def do_SuperMemoCollection(self, node: Element) -> None:
-        "Process SM Collection"
-
-        for child in node.childNodes:
-            self.parse(child)
+        self.logger("Load started...")
+        path: list[ElementTree.Element] = []
+        for event, node in ElementTree.iterparse(source, events=("start", "end")):
+            if event == "start":
+                path.append(node)
+                if node.tag == "SuperMemoElement":
+                    self.startElement()
+                continue
+
+            path.pop()
+            parent = path[-1].tag if path else None
+            grandparent = path[-2].tag if len(path) >= 2 else None
+            if node.tag == "SuperMemoElement":
+                self.endElement()
+                # free the processed subtree
+                node.clear()
+                if path:
+                    path[-1].remove(node)
+                yield from self.notes
+                self.notes = []
+            elif parent == "SuperMemoElement":
+                if node.tag == "Title":
+                    self.do_Title(node.text or "")
+                elif node.tag == "Type":
+                    self.do_Type(node.text)
+            elif (
+                parent in ("Content", "LearningData")
+                and grandparent == "SuperMemoElement"
+                and node.text is not None
+            ):
+                self.cntElm[-1][node.tag] = node.text
+        self.logger("Load done.")
 
-    def do_SuperMemoElement(self, node: Element) -> None:
-        "Process SM Element (Type - Title,Topics)"
+    def startElement(self) -> None:
+        "Start of SM Element (Type - Title,Topics)"
 
         self.logger("=" * 45, level=3)
 
         self.cntElm.append(SuperMemoElement())
         self.cntElm[-1]["lTitle"] = self.cntMeta["title"]
 
-        # parse all child elements
-        for child in node.childNodes:
-            self.parse(child)
+    def endElement(self) -> None:
+        "End of SM Element; its content and children have been processed"
 
         # strip all saved strings, just for sure
         for key in list(self.cntElm[-1].keys()):
@@ -428,44 +401,20 @@ class SupermemoXmlImporter(NoteImporter):
                 t = self.cntMeta["title"].pop()
                 self.logger("End of topic \t- %s" % (t), level=2)
 
-    def do_Content(self, node: Element) -> None:
-        "Process SM element Content"
-
-        for child in node.childNodes:
-            if hasattr(child, "tagName") and child.firstChild is not None:
-                self.cntElm[-1][child.tagName] = child.firstChild.data
-
-    def do_LearningData(self, node: Element) -> None:
-        "Process SM element LearningData"
-
-        for child in node.childNodes:
-            if hasattr(child, "tagName") and child.firstChild is not None:
-                self.cntElm[-1][child.tagName] = child.firstChild.data
-
-    # It's being processed in do_Content now
-    # def do_Question(self, node):
-    #    for child in node.childNodes: self.parse(child)
-    #    self.cntElm[-1][node.tagName]=self.cntBuf.pop()
-
-    # It's being processed in do_Content now
-    # def do_Answer(self, node):
-    #    for child in node.childNodes: self.parse(child)
-    #    self.cntElm[-1][node.tagName]=self.cntBuf.pop()
-
-    def do_Title(self, node: Element) -> None:
+    def do_Title(self, text: str) -> None:
         "Process SM element Title"
 
-        t = self._decode_htmlescapes(node.firstChild.data)
-        self.cntElm[-1][node.tagName] = t
+        t = self._decode_htmlescapes(text)
+        self.cntElm[-1]["Title"] = t
         self.cntMeta["title"].append(t)
         self.cntElm[-1]["lTitle"] = self.cntMeta["title"]
         self.logger("Start of topic \t- " + " / ".join(self.cntMeta["title"]), level=2)
 
-    def do_Type(self, node: Element) -> None:
+    def do_Type(self, text: str | None) -> None:
         "Process SM element Type"
 
-        if len(self.cntBuf) >= 1:
-            self.cntElm[-1][node.tagName] = self.cntBuf.pop()
+        if text is not None:
+            self.cntElm[-1]["Type"] = text
 
 
 # if __name__ == '__main__':
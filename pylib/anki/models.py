@@ -8,6 +8,7 @@ import pprint
 import sys
 import time
 from collections.abc import Sequence
+from dataclasses import dataclass
 from typing import Any, NewType, Union
 
 import anki  # pylint: disable=unused-import
@@ -39,6 +40,27 @@ NotetypeId = NewType("NotetypeId", int)
 sys.modules["anki.models"].NoteType = NotetypeDict  # type: ignore
 
 
+@dataclass(frozen=True)
+class NotetypeFields:
+    """Lookups derived from a notetype's fields. Cached by ModelManager until
+    the notetype changes, and shared by the notes that use it, so they must
+    not be mutated."""
+
+    # field name -> (ord, field)
+    field_map: dict[str, tuple[int, FieldDict]]
+    # (field name, ord), in ord order
+    ordered: tuple[tuple[str, int], ...]
+
+    @classmethod
+    def from_notetype(cls, notetype: NotetypeDict) -> NotetypeFields:
+        field_map = {f["name"]: (f["ord"], f) for f in notetype["flds"]}
+        ordered = tuple(
+            (name, ord)
+            for name, (ord, _) in sorted(field_map.items(), key=lambda i: i[1][0])
+        )
+        return cls(field_map=field_map, ordered=ordered)
+
+
 class ModelsDictProxy:
     def __init__(self, col: anki.collection.Collection):
         self._col = col.weakref()
@@ -86,6 +108,7 @@ class ModelManager(DeprecatedNamesMixin):
         self.models = ModelsDictProxy(col)
         # do not access this directly!
         self._cache = {}
+        self._fields = {}
 
     def __repr__(self) -> str:
         attrs = dict(self.__dict__)
@@ -100,19 +123,32 @@ class ModelManager(DeprecatedNamesMixin):
     # access the cache directly!
 
     _cache: dict[NotetypeId, NotetypeDict] = {}
+    # field lookups of cached notetypes, shared by the notes that use them
+    _fields: dict[NotetypeId, NotetypeFields] = {}
 
     def _update_cache(self, notetype: NotetypeDict) -> None:
         self._cache[notetype["id"]] = notetype
+        self._fields.pop(notetype["id"], None)
 
     def _remove_from_cache(self, ntid: NotetypeId) -> None:
         if ntid in self._cache:
             del self._cache[ntid]
+        self._fields.pop(ntid, None)
 
     def _get_cached(self, ntid: NotetypeId) -> NotetypeDict | None:
         return self._cache.get(ntid)
 
     def _clear_cache(self) -> None:
         self._cache = {}
+        self._fields = {}
+
+    def _shared_fields(self, ntid: NotetypeId) -> NotetypeFields:
+        """Field lookups for the notetype, reused until it is changed, so
+        loading many notes doesn't rebuild them for each one."""
+        if (fields := self._fields.get(ntid)) is None:
+            fields = NotetypeFields.from_notetype(self.get(ntid))
+            self._fields[ntid] = fields
+        return fields
 
     # Listing note types
     #############################################################
@@ -38,9 +38,10 @@ class Note(DeprecatedNamesMixin):
         col: anki.collection.Collection,
         model: NotetypeDict | NotetypeId | None = None,
         id: NoteId | None = None,
+        backend_note: notes_pb2.Note | None = None,
     ) -> None:
-        if model and id:
-            raise Exception("only model or id should be provided")
+        if sum(1 for arg in (model, id, backend_note) if arg) > 1:
+            raise Exception("only one of model, id or backend_note should be provided")
         notetype_id = model["id"] if isinstance(model, dict) else model
         self.col = col.weakref()
 
@@ -48,6 +49,8 @@ class Note(DeprecatedNamesMixin):
             # existing note
             self.id = id
             self.load()
+        elif backend_note:
+            self._load_from_backend_note(backend_note)
         else:
             # new note for provided notetype
             self._load_from_backend_note(self.col._backend.new_note(notetype_id))
@@ -65,7 +68,8 @@ class Note(DeprecatedNamesMixin):
         self.usn = note.usn
         self.tags = list(note.tags)
         self.fields = list(note.fields)
-        self._fmap = self.col.models.field_map(self.note_type())
+        self._fields = self.col.models._shared_fields(self.mid)
+        self._fmap = self._fields.field_map
 
     def _to_backend_note(self) -> notes_pb2.Note:
         hooks.note_will_flush(self)
@@ -132,7 +136,7 @@ class Note(DeprecatedNamesMixin):
         return card
 
     def cards(self) -> list[anki.cards.Card]:
-        return [self.col.get_card(id) for id in self.card_ids()]
+        return self.col.get_cards(self.card_ids())
 
     def card_ids(self) -> Sequence[anki.cards.CardId]:
         return self.col.card_ids_of_note(self.id)
@@ -155,7 +159,7 @@ class Note(DeprecatedNamesMixin):
         return self.fields
 
     def items(self) -> list[tuple[str, str]]:
-        return [(f["name"], self.fields[ord]) for ord, f in sorted(self._fmap.values())]
+        return [(name, self.fields[ord]) for name, ord in self._fields.ordered]
 
     def _field_index(self, key: str) -> int:
         try:
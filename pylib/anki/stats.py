@@ -13,7 +13,9 @@ from typing import Any
 
 import anki.cards
 import anki.collection
+from anki._stats_cache import RevlogCache, cache_path
 from anki.consts import *
+from anki.db import DBError
 from anki.lang import FormatTimeSpan
 from anki.utils import base62, ids2str
 
@@ -94,6 +96,197 @@ colUnseen = "#000"
 colSusp = "#ff0"
 
 
+_SUMMARY_COLUMNS = """
+cast((id/1000.0 - ?) / 86400.0 as int) as day,
+cast((id/1000 - ?) / 86400.0 as int)+1 as studied_day,
+23 - ((cast((? - id/1000) / 3600.0 as int)) % 24) as hour,
+id > ? as in_period,
+id > ? as today,
+type,
+ease"""
+_SUMMARY_GROUPS = "day, studied_day, hour, in_period, today, type, ease, mature"
+
+
+def _summary_args(
+    col: anki.collection.Collection, period_days: int | None
+) -> tuple[int, ...]:
+    cutoff = col.sched.day_cutoff
+    rollover_hour = col.conf.get("rollover", 4)
+    if period_days is None:
+        period_start = 0
+    else:
+        period_start = (cutoff - (period_days * 86400)) * 1000
+    return (
+        cutoff,
+        cutoff,
+        cutoff - (rollover_hour * 3600),
+        period_start,
+        (cutoff - 86400) * 1000,
+    )
+
+
+class RevlogSummary:
+    """Revlog entries of a deck scope, grouped finely enough that every
+    revlog-based section of the legacy report can be derived from them.
+
+    This lets the report read the revlog once, instead of once per graph.
+    The results match the per-graph queries that preceded it."""
+
+    def __init__(self, rows: list[tuple[int, ...]], first_id: int | None) -> None:
+        self.rows = rows
+        self._first_id = first_id
+
+    @classmethod
+    def from_revlog(
+        cls, col: anki.collection.Collection, limit: str, period_days: int | None
+    ) -> RevlogSummary:
+        "Build the summary by grouping the revlog directly."
+        rows = col.db.all(
+            f"""
+select {_SUMMARY_COLUMNS},
+lastIvl >= 21 as mature,
+count(),
+sum(time),
+min(id)
+from revlog {f"where {limit}" if limit else ""}
+group by {_SUMMARY_GROUPS}""",
+            *_summary_args(col, period_days),
+        )
+        return cls(
+            [row[:10] for row in rows], min((row[10] for row in rows), default=None)
+        )
+
+    @classmethod
+    def from_cache(
+        cls,
+        col: anki.collection.Collection,
+        cache: RevlogCache,
+        limit: str,
+        dids: Sequence[int] | None,
+        period_days: int | None,
+    ) -> RevlogSummary:
+        """Build the summary from the persistent revlog cache, which only needs
+        to read reviews added since it was last used."""
+        rows = cache.query(
+            col,
+            dids,
+            f"""
+select {_SUMMARY_COLUMNS},
+mature,
+sum(count),
+sum(time)
+from reviews
+group by {_SUMMARY_GROUPS}""",
+            *_summary_args(col, period_days),
+        )
+        first_id = col.db.scalar(
+            "select id from revlog %s order by id limit 1"
+            % (f"where {limit}" if limit else "")
+        )
+        return cls(rows, first_id)
+
+    def first_id(self) -> int | None:
+        return self._first_id
+
+    def today(self) -> tuple[int, int, int, int, int, int, int]:
+        "Count, seconds, failed, learn, review, relearn, filtered."
+        cards = millis = failed = 0
+        by_type = {REVLOG_LRN: 0, REVLOG_REV: 0, REVLOG_RELRN: 0, REVLOG_CRAM: 0}
+        for _, _, _, _, today, type, ease, _, count, time_sum in self.rows:
+            if not today or type == REVLOG_RESCHED:
+                continue
+            cards += count
+            millis += time_sum
+            if ease == 1:
+                failed += count
+            if type in by_type:
+                by_type[type] += count
+        return (
+            cards,
+            millis // 1000,
+            failed,
+            by_type[REVLOG_LRN],
+            by_type[REVLOG_REV],
+            by_type[REVLOG_RELRN],
+            by_type[REVLOG_CRAM],
+        )
+
+    def mature_today(self) -> tuple[int, int]:
+        "Answers on mature cards today, and how many of them were correct."
+        total = correct = 0
+        for _, _, _, _, today, _, ease, mature, count, _ in self.rows:
+            if today and mature:
+                total += count
+                if ease != 1:
+                    correct += count
+        return total, correct
+
+    def done(self, chunk: int, time_factor: float) -> list[tuple[Any, ...]]:
+        "Per-chunk answer counts and times by card type, like _done()."
+        count_col = {
+            REVLOG_LRN: 1,
+            REVLOG_RELRN: 4,
+            REVLOG_CRAM: 5,
+        }
+        days: dict[int, list[Any]] = {}
+        for day, _, _, in_period, _, type, _, mature, count, time_sum in self.rows:
+            if not in_period:
+                continue
+            # sqlite's integer division truncates towards zero
+            day = int(day / chunk)
+            if not (row := days.get(day)):
+                row = days[day] = [day, 0, 0, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0]
+            if type == REVLOG_REV:
+                idx = 3 if mature else 2
+            elif type in count_col:
+                idx = count_col[type]
+            else:
+                continue
+            row[idx] += count
+            row[idx + 5] += time_sum / 1000.0 / time_factor
+        return [tuple(days[day]) for day in sorted(days)]
+
+    def days_studied(self) -> tuple[int, int | None]:
+        "Number of days studied in the period, and how long ago the first was."
+        days = {row[1] for row in self.rows if row[3]}
+        return len(days), abs(min(days)) if days else None
+
+    def eases(self) -> list[tuple[int, int, int]]:
+        "Answer counts by (learning/young/mature, ease)."
+        counts: dict[tuple[int, int], int] = {}
+        for _, _, _, in_period, _, type, ease, mature, count, _ in self.rows:
+            if not in_period or type == REVLOG_RESCHED:
+                continue
+            if type in (REVLOG_LRN, REVLOG_RELRN):
+                kind = 0
+            else:
+                kind = 2 if mature else 1
+            counts[(kind, ease)] = counts.get((kind, ease), 0) + count
+        return [(kind, ease, counts[(kind, ease)]) for kind, ease in sorted(counts)]
+
+    def hour_retention(self) -> list[tuple[int, float, int]]:
+        "Success rate and answer count for hours with more than 30 answers."
+        hours: dict[int, list[int]] = {}
+        for _, _, hour, in_period, _, type, ease, _, count, _ in self.rows:
+            if not in_period or type not in (REVLOG_LRN, REVLOG_REV, REVLOG_RELRN):
+                continue
+            totals = hours.setdefault(hour, [0, 0])
+            totals[1] += count
+            if ease != 1:
+                totals[0] += count
+        return [
+            (hour, correct / float(total) * 100, total)
+            for hour, (correct, total) in sorted(hours.items())
+            if total > 30
+        ]
+
+
+# summaries of recent reports, keyed on the collection and its modification
+# time as well as the report settings, so they are only reused while unchanged
+_summary_cache: dict[tuple[Any, ...], RevlogSummary] = {}
+_SUMMARY_CACHE_SIZE = 8
+
+
 class CollectionStats:
     def __init__(self, col: anki.collection.Collection) -> None:
         self.col = col.weakref()
@@ -103,6 +296,35 @@ class CollectionStats:
         self.height = 200
         self.wholeCollection = False
 
+    def _revlog(self, period_days: int | None) -> RevlogSummary:
+        "Summary of the revlog for the current scope, read once per report."
+        limit = self._revlogLimit()
+        key = (
+            self.col.path,
+            self.col.mod,
+            limit,
+            period_days,
+            self.col.sched.day_cutoff,
+            self.col.conf.get("rollover", 4),
+        )
+        if not (summary := _summary_cache.get(key)):
+            dids = None if self.wholeCollection else self.col.decks.active()
+            try:
+                summary = RevlogSummary.from_cache(
+                    self.col,
+                    RevlogCache(cache_path(self.col)),
+                    limit,
+                    dids,
+                    period_days,
+                )
+            except (DBError, OSError):
+                # the cache is only an optimization
+                summary = RevlogSummary.from_revlog(self.col, limit, period_days)
+            if len(_summary_cache) >= _SUMMARY_CACHE_SIZE:
+                del _summary_cache[next(iter(_summary_cache))]
+            _summary_cache[key] = summary
+        return summary
+
     # assumes jquery & plot are available in document
     def report(self, type: int = PERIOD_MONTH) -> str:
         # 0=month, 1=year, 2=deck life
@@ -142,21 +364,8 @@ body { direction: ltr !important; }
     def todayStats(self) -> str:
         b = self._title("Today")
         # studied today
-        lim = self._revlogLimit()
-        if lim:
-            lim = " and " + lim
-        cards, thetime, failed, lrn, rev, relrn, filt = self.col.db.first(
-            f"""
-select count(), sum(time)/1000,
-sum(case when ease = 1 then 1 else 0 end), /* failed */
-sum(case when type = {REVLOG_LRN} then 1 else 0 end), /* learning */
-sum(case when type = {REVLOG_REV} then 1 else 0 end), /* review */
-sum(case when type = {REVLOG_RELRN} then 1 else 0 end), /* relearn */
-sum(case when type = {REVLOG_CRAM} then 1 else 0 end) /* filter */
-from revlog where type != {REVLOG_RESCHED} and id > ? """
-            + lim,
-            (self.col.sched.day_cutoff - 86400) * 1000,
-        )
+        summary = self._revlog(self._periodDays())
+        cards, thetime, failed, lrn, rev, relrn, filt = summary.today()
         cards = cards or 0
         thetime = thetime or 0
         failed = failed or 0
@@ -185,13 +394,7 @@ from revlog where type != {REVLOG_RESCHED} and id > ? """
                 a=bold(lrn), b=bold(rev), c=bold(relrn), d=bold(filt)
             )
             # mature today
-            mcnt, msum = self.col.db.first(
-                """
-    select count(), sum(case when ease = 1 then 0 else 1 end) from revlog
-    where lastIvl >= 21 and id > ?"""
-                + lim,
-                (self.col.sched.day_cutoff - 86400) * 1000,
-            )
+            mcnt, msum = summary.mature_today()
             b += "<br>"
             if mcnt:
                 b += "Correct answers on mature cards: %(a)d/%(b)d (%(c).1f%%)" % dict(
@@ -522,74 +725,15 @@ group by day order by day"""
         )
 
     def _done(self, num: int | None = 7, chunk: int = 1) -> Any:
-        lims = []
-        if num is not None:
-            lims.append(
-                "id > %d" % ((self.col.sched.day_cutoff - (num * chunk * 86400)) * 1000)
-            )
-        lim = self._revlogLimit()
-        if lim:
-            lims.append(lim)
-        if lims:
-            lim = "where " + " and ".join(lims)
-        else:
-            lim = ""
         if self.type == PERIOD_MONTH:
             tf = 60.0  # minutes
         else:
             tf = 3600.0  # hours
-        return self.col.db.all(
-            f"""
-select
-(cast((id/1000.0 - ?) / 86400.0 as int))/? as day,
-sum(case when type = {REVLOG_LRN} then 1 else 0 end), -- lrn count
-sum(case when type = {REVLOG_REV} and lastIvl < 21 then 1 else 0 end), -- yng count
-sum(case when type = {REVLOG_REV} and lastIvl >= 21 then 1 else 0 end), -- mtr count
-sum(case when type = {REVLOG_RELRN} then 1 else 0 end), -- lapse count
-sum(case when type = {REVLOG_CRAM} then 1 else 0 end), -- cram count
-sum(case when type = {REVLOG_LRN} then time/1000.0 else 0 end)/?, -- lrn time
--- yng + mtr time
-sum(case when type = {REVLOG_REV} and lastIvl < 21 then time/1000.0 else 0 end)/?,
-sum(case when type = {REVLOG_REV} and lastIvl >= 21 then time/1000.0 else 0 end)/?,
-sum(case when type = {REVLOG_RELRN} then time/1000.0 else 0 end)/?, -- lapse time
-sum(case when type = {REVLOG_CRAM} then time/1000.0 else 0 end)/? -- cram time
-from revlog %s
-group by day order by day"""
-            % lim,
-            self.col.sched.day_cutoff,
-            chunk,
-            tf,
-            tf,
-            tf,
-            tf,
-            tf,
-        )
+        period = None if num is None else num * chunk
+        return self._revlog(period).done(chunk, tf)
 
     def _daysStudied(self) -> Any:
-        lims = []
-        num = self._periodDays()
-        if num:
-            lims.append(
-                "id > %d" % ((self.col.sched.day_cutoff - (num * 86400)) * 1000)
-            )
-        rlim = self._revlogLimit()
-        if rlim:
-            lims.append(rlim)
-        if lims:
-            lim = "where " + " and ".join(lims)
-        else:
-            lim = ""
-        ret = self.col.db.first(
-            """
-select count(), abs(min(day)) from (select
-(cast((id/1000 - ?) / 86400.0 as int)+1) as day
-from revlog %s
-group by day order by day)"""
-            % lim,
-            self.col.sched.day_cutoff,
-        )
-        assert ret
-        return ret
+        return self._revlog(self._periodDays()).days_studied()
 
     # Intervals
     ######################################################################
@@ -737,31 +881,7 @@ select count(), avg(ivl), max(ivl) from cards where did in %s and queue = {QUEUE
         )
 
     def _eases(self) -> Any:
-        lims = []
-        lim = self._revlogLimit()
-        if lim:
-            lims.append(lim)
-        days = self._periodDays()
-        if days is not None:
-            lims.append(
-                "id > %d" % ((self.col.sched.day_cutoff - (days * 86400)) * 1000)
-            )
-        if lims:
-            lim = "and " + " and ".join(lims)
-        else:
-            lim = ""
-        ease4repl = "ease"
-        return self.col.db.all(
-            f"""
-select (case
-when type in ({REVLOG_LRN},{REVLOG_RELRN}) then 0
-when lastIvl < 21 then 1
-else 2 end) as thetype,
-(case when type in ({REVLOG_LRN},{REVLOG_RELRN}) and ease = 4 then %s else ease end), count() from revlog where type != {REVLOG_RESCHED} %s
-group by thetype, ease
-order by thetype, ease"""
-            % (ease4repl, lim)
-        )
+        return self._revlog(self._periodDays()).eases()
 
     # Hourly retention
     ######################################################################
@@ -834,25 +954,7 @@ order by thetype, ease"""
         return txt
 
     def _hourRet(self) -> Any:
-        lim = self._revlogLimit()
-        if lim:
-            lim = " and " + lim
-        rolloverHour = self.col.conf.get("rollover", 4)
-        pd = self._periodDays()
-        if pd:
-            lim += " and id > %d" % ((self.col.sched.day_cutoff - (86400 * pd)) * 1000)
-        return self.col.db.all(
-            f"""
-select
-23 - ((cast((? - id/1000) / 3600.0 as int)) %% 24) as hour,
-sum(case when ease = 1 then 0 else 1 end) /
-cast(count() as float) * 100,
-count()
-from revlog where type in ({REVLOG_LRN},{REVLOG_REV},{REVLOG_RELRN}) %s
-group by hour having count() > 30 order by hour"""
-            % lim,
-            self.col.sched.day_cutoff - (rolloverHour * 3600),
-        )
+        return self._revlog(self._periodDays()).hour_retention()
 
     # Cards
     ######################################################################
@@ -1092,7 +1194,8 @@ $(function () {
             lim = " where " + lim
         t = 0
         if by == "review":
-            t = self.col.db.scalar("select id from revlog %s order by id limit 1" % lim)
+            # the first review is the same whatever the period
+            t = self._revlog(None).first_id()
         elif by == "add":
             if self.wholeCollection:
                 lim = ""
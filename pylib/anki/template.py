@@ -251,6 +251,21 @@ class TemplateRenderContext:
 
         return output
 
+    def question_av_tags_without_hooks(self) -> list[AVTag]:
+        """The AV tags on the question side, found without running custom
+        filters or the card_did_render hook. Much cheaper than render(), but
+        misses any tags that those would add."""
+        try:
+            partial = self._partially_render()
+        except TemplateError:
+            return []
+        text = "".join(
+            node if isinstance(node, str) else node.current_text
+            for node in partial.qnodes
+        )
+        out = self.col()._backend.extract_av_tags(text=text, question_side=True)
+        return av_tags_to_native(out.av_tags)
+
     def _partially_render(self) -> PartiallyRenderedCard:
         if self._template:
             # card layout screen
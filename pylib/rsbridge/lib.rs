@@ -62,6 +62,32 @@ impl Backend {
             .map_err(BackendError::new_err)
     }
 
+    /// Run several independent service methods with a single call, so the
+    /// cost of crossing the bridge and releasing the GIL is only paid once.
+    /// Returns a (success, bytes) tuple for each command, where bytes is
+    /// either the output or a serialized BackendError.
+    fn command_many(
+        &self,
+        py: Python,
+        commands: Vec<(u32, u32, Vec<u8>)>,
+    ) -> Vec<(bool, PyObject)> {
+        let results: Vec<_> = py.allow_threads(|| {
+            commands
+                .iter()
+                .map(|(service, method, input)| {
+                    self.backend.run_service_method(*service, *method, input)
+                })
+                .collect()
+        });
+        results
+            .into_iter()
+            .map(|result| match result {
+                Ok(out_bytes) => (true, PyBytes::new_bound(py, &out_bytes).into()),
+                Err(err_bytes) => (false, PyBytes::new_bound(py, &err_bytes).into()),
+            })
+            .collect()
+    }
+
     /// This takes and returns JSON, due to Python's slow protobuf
     /// encoding/decoding.
     fn db_command(&self, py: Python, input: &Bound<'_, PyBytes>) -> PyResult<PyObject> {
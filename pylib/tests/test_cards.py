@@ -3,7 +3,8 @@
 
 # coding: utf-8
 
-from tests.shared import getEmptyCol
+from anki.errors import NotFoundError
+from tests.shared import assertException, getEmptyCol
 
 
 def test_delete():
@@ -93,3 +94,56 @@ def test_gendeck():
     note["Text"] += "{{c4::four}}"
     note.flush()
     assert note.cards()[3].did == newId
+
+
+def test_get_cards_and_notes():
+    col = getEmptyCol()
+    nids = []
+    for i in range(3):
+        note = col.newNote()
+        note["Front"] = str(i)
+        col.addNote(note)
+        nids.append(note.id)
+    cids = [col.card_ids_of_note(nid)[0] for nid in reversed(nids)]
+
+    cards = col.get_cards(cids)
+    assert [c.id for c in cards] == cids
+    assert [c.nid for c in cards] == list(reversed(nids))
+    assert cards[0].due == col.get_card(cids[0]).due
+
+    notes = col.get_notes(nids)
+    assert [n["Front"] for n in notes] == ["0", "1", "2"]
+    # notes of the same notetype share their field lookups
+    assert notes[0]._fields is notes[1]._fields
+    assert notes[0].items() == [("Front", "0"), ("Back", "")]
+    # which are rebuilt when the notetype changes
+    notetype = col.models.get(notes[0].mid)
+    col.models.rename_field(notetype, notetype["flds"][1], "Back2")
+    col.models.update_dict(notetype)
+    assert col.get_note(nids[0]).keys() == ["Front", "Back2"]
+
+    assert col.get_cards([]) == []
+    assertException(NotFoundError, lambda: col.get_cards([cids[0], 1]))
+
+
+def test_card_batch():
+    col = getEmptyCol()
+    for i in range(3):
+        note = col.newNote()
+        note["Front"] = str(i)
+        col.addNote(note)
+    cids = list(col.find_cards(""))
+
+    batch = col.get_card_batch(cids)
+    assert len(batch) == 3
+    assert batch.ids() == cids
+    assert batch.dues() == [col.get_card(cid).due for cid in cids]
+    # cards are built once, and changes to them are visible in the columns
+    assert batch[0] is batch[0]
+    batch[0].due = 1000
+    assert batch.dues()[0] == 1000
+    col.update_cards(batch)
+    assert col.get_card(cids[0]).due == 1000
+    # extra attributes can still be set on cards
+    batch[1].extra = 1
+    assert batch[1].extra == 1
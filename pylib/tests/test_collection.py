@@ -5,6 +5,7 @@
 
 import os
 import tempfile
+import time
 from typing import Any
 
 from anki.collection import Collection as aopen
@@ -173,3 +174,88 @@ def test_db_named_args(capsys):
 
     # swallow the warning
     _ = capsys.readouterr()
+
+
+def test_backend_profiler(tmp_path):
+    from anki import _backend_profiler
+
+    col = getEmptyCol()
+    profiler = _backend_profiler.enable()
+    try:
+        profiler.clear()
+        col.decks.all_names_and_ids()
+        col.decks.all_names_and_ids()
+        stats = {s.name: s for s in profiler.summary()}
+        assert stats["get_deck_names"].calls == 2
+        assert stats["get_deck_names"].bytes_out > 0
+        assert stats["get_deck_names"].p50_secs <= stats["get_deck_names"].p99_secs
+
+        from anki import decks_pb2
+        from anki._backend import RustBackend
+
+        with col.batch() as batch:
+            batch.add(RustBackend.get_deck_raw, decks_pb2.DeckId(did=1), decks_pb2.Deck)
+        stats = {s.name: s for s in profiler.summary()}
+        assert stats["command_many"].calls == 1
+        assert stats["command_many"].bytes_out > 0
+
+        trace = tmp_path / "trace.json"
+        profiler.dump_chrome_trace(str(trace))
+        assert "get_deck_names" in trace.read_text(encoding="utf8")
+    finally:
+        _backend_profiler.disable()
+
+
+def test_hook_profiler():
+    from anki import _hook_profiler, hooks
+
+    def slow_hook() -> None:
+        time.sleep(0.01)
+
+    profiler = _hook_profiler.enable(budget_secs=0.005)
+    hooks.card_odue_was_invalid.append(slow_hook)
+    try:
+        profiler.clear()
+        hooks.card_odue_was_invalid()
+        (stats,) = profiler.summary()
+        assert stats.hook == "card_odue_was_invalid"
+        assert stats.callback.endswith("slow_hook")
+        assert stats.module == __name__
+        assert stats.calls == 1 and stats.over_budget == 1
+        assert profiler.slow_calls()[0].elapsed >= 0.01
+    finally:
+        hooks.card_odue_was_invalid.remove(slow_hook)
+        _hook_profiler.disable()
+
+
+def test_batch():
+    from anki import cards_pb2
+    from anki._backend import RustBackend
+    from anki.errors import NotFoundError
+
+    col = getEmptyCol()
+    note = col.newNote()
+    note["Front"] = "one"
+    col.addNote(note)
+    cid = note.cards()[0].id
+
+    with col.batch() as batch:
+        card = batch.add(
+            RustBackend.get_card_raw, cards_pb2.CardId(cid=cid), cards_pb2.Card
+        )
+        again = batch.add(
+            RustBackend.get_card_raw, cards_pb2.CardId(cid=cid), cards_pb2.Card
+        )
+    assert card.result().id == cid
+    assert again.result() == card.result()
+
+    # errors are raised once the batch has run
+    assertException(NotFoundError, lambda: _run_batch_with_missing_card(col))
+
+
+def _run_batch_with_missing_card(col):
+    from anki import cards_pb2
+    from anki._backend import RustBackend
+
+    with col.batch() as batch:
+        batch.add(RustBackend.get_card_raw, cards_pb2.CardId(cid=1), cards_pb2.Card)
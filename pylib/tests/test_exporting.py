@@ -159,5 +159,31 @@ def test_export_textnote():
         assert file.readline() == "foo\tbar\n"
 
 
+def test_export_text_in_chunks(monkeypatch):
+    import anki.exporting
+
+    monkeypatch.setattr(anki.exporting, "TEXT_EXPORT_CHUNK_SIZE", 1)
+    setup1()
+    progress = []
+    hooks.legacy_export_progress.append(progress.append)
+    try:
+        fd, path = tempfile.mkstemp(prefix="ankitest")
+        os.close(fd)
+        e = TextNoteExporter(col)
+        e.exportInto(path)
+        with open(path) as file:
+            assert file.read() == "foo\tbar<br>\ttag tag2\nbaz\tqux\t"
+        assert e.count == 2
+        e = TextCardExporter(col)
+        e.exportInto(path)
+        with open(path) as file:
+            lines = file.read().splitlines()
+        assert [line.split("\t")[1] for line in lines] == ["bar<br>", "qux"]
+        assert len(progress) == 4
+        os.unlink(path)
+    finally:
+        hooks.legacy_export_progress.remove(progress.append)
+
+
 def test_exporters():
     assert "*.apkg" in str(exporters(getEmptyCol()))
@@ -4,7 +4,9 @@
 import os
 import tempfile
 
+from anki._stats_cache import RevlogCache, cache_path
 from anki.collection import CardStats
+from anki.stats import RevlogSummary
 from tests.shared import getEmptyCol
 
 
@@ -37,3 +39,47 @@ def test_graphs():
     with open(os.path.join(dir, "test.html"), "w", encoding="UTF-8") as note:
         note.write(rep)
     return
+
+
+def test_revlog_summary():
+    col = getEmptyCol()
+    note = col.newNote()
+    note["Front"] = "foo"
+    col.addNote(note)
+    c = col.sched.getCard()
+    col.sched.answerCard(c, 1)
+    col.sched.answerCard(c, 3)
+    g = col.stats()
+    summary = g._revlog(g._periodDays())
+    cards, _, failed, lrn, *_ = summary.today()
+    assert (cards, failed, lrn) == (2, 1, 2)
+    assert summary.days_studied() == (1, 1)
+    assert summary.eases() == [(0, 1, 1), (0, 3, 1)]
+    # cached until the collection changes
+    assert g._revlog(g._periodDays()) is summary
+    assert g.report()
+
+
+def test_revlog_cache():
+    col = getEmptyCol()
+    note = col.newNote()
+    note["Front"] = "foo"
+    col.addNote(note)
+    c = col.sched.getCard()
+    col.sched.answerCard(c, 1)
+    cache = RevlogCache(cache_path(col))
+    for period in (None, 30):
+        expected = RevlogSummary.from_revlog(col, "", period)
+        cached = RevlogSummary.from_cache(col, cache, "", None, period)
+        assert sorted(cached.rows) == sorted(expected.rows)
+        assert cached.first_id() == expected.first_id()
+    # reviews added later are picked up incrementally
+    col.sched.answerCard(c, 3)
+    cached = RevlogSummary.from_cache(col, cache, "", None, None)
+    assert sorted(cached.rows) == sorted(RevlogSummary.from_revlog(col, "", None).rows)
+    # as are cards that change deck
+    did = col.decks.id("moved")
+    col.set_deck([c.id], did)
+    assert RevlogSummary.from_cache(col, cache, "", [1], None).rows == []
+    moved = RevlogSummary.from_cache(col, cache, "", [did], None)
+    assert sum(row[8] for row in moved.rows) == 2
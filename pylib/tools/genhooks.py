@@ -141,6 +141,7 @@ from collections.abc import Callable, Sequence
 from typing import Any
 
 import anki
+import anki._hook_profiler
 import anki.hooks
 from anki.cards import Card
 from anki.notes import Note
@@ -124,9 +124,14 @@ class {self.classname()}:
         args_including_self = ["self"] + (self.args or [])
         out = f"""\
     def __call__({", ".join(args_including_self)}) -> None:
+        profiler = anki._hook_profiler.active()
         for hook in self._hooks:
             try:
-                hook({", ".join(arg_names)})
+                if profiler:
+                    with profiler.timed("{self.name}", hook):
+                        hook({", ".join(arg_names)})
+                else:
+                    hook({", ".join(arg_names)})
             except Exception:
                 # if the hook fails, remove it
                 self._hooks.remove(hook)
@@ -160,9 +165,14 @@ class {self.classname()}:
         args_including_self = ["self"] + (self.args or [])
         out = f"""\
     def __call__({", ".join(args_including_self)}) -> {self.return_type}:
+        profiler = anki._hook_profiler.active()
         for filter in self._hooks:
             try:
-                {arg_names[0]} = filter({", ".join(arg_names)})
+                if profiler:
+                    with profiler.timed("{self.name}", filter):
+                        {arg_names[0]} = filter({", ".join(arg_names)})
+                else:
+                    {arg_names[0]} = filter({", ".join(arg_names)})
             except Exception:
                 # if the hook fails, remove it
                 self._hooks.remove(filter)
@@ -0,0 +1,218 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+"""
+An in-memory index of the add-ons folder, so the metadata, default config and
+config schema of each add-on don't need to be read from disk every time they
+are used.
+
+The list of add-ons comes from a single scan of the add-ons folder. An entry
+is only re-read when the modification time or size of one of its files has
+changed, and whether it contains an __init__.py is only checked again when the
+add-on's folder has changed. The index is saved to INDEX_FILENAME in the
+add-ons folder, so the files don't need to be read again on the next startup
+either.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+INDEX_FILENAME = "addon_index.json"
+VERSION = 1
+
+META_FILE = "meta.json"
+CONFIG_FILE = "config.json"
+SCHEMA_FILE = "config.schema.json"
+# (mtime_ns, size) of a file, or None if it doesn't exist
+Stamp = Optional[tuple[int, int]]
+
+
+@dataclass
+class _Entry:
+    dir_stamp: int = 0
+    has_init: bool = False
+    stamps: dict[str, Stamp] = field(default_factory=dict)
+    # parsed contents of the files above
+    meta: dict[str, Any] = field(default_factory=dict)
+    config: Any = None
+    schema: Any = True
+
+    def to_json(self) -> dict[str, Any]:
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_json(cls, obj: dict[str, Any]) -> _Entry:
+        entry = cls(**obj)
+        entry.stamps = {
+            name: tuple(stamp) if stamp else None
+            for name, stamp in entry.stamps.items()
+        }
+        return entry
+
+
+def _stamp(path: str) -> Stamp:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class AddonIndex:
+    def __init__(self, folder: str) -> None:
+        self.folder = folder
+        self._entries: dict[str, _Entry] | None = None
+        self._dirty = False
+
+    # Reading
+    ##########################################################################
+
+    def addon_dirs(self) -> list[str]:
+        "Names of the folders containing an add-on, unsorted."
+        entries = self._load()
+        seen: set[str] = set()
+        found: list[str] = []
+        with os.scandir(self.folder) as it:
+            for dirent in it:
+                if not dirent.is_dir():
+                    continue
+                seen.add(dirent.name)
+                dir_stamp = dirent.stat().st_mtime_ns
+                entry = entries.get(dirent.name)
+                if entry is None or entry.dir_stamp != dir_stamp:
+                    entry = self._validate(dirent.name)
+                    entry.dir_stamp = dir_stamp
+                    entry.has_init = os.path.exists(
+                        os.path.join(dirent.path, "__init__.py")
+                    )
+                    self._dirty = True
+                if entry.has_init:
+                    found.append(dirent.name)
+        for name in entries.keys() - seen:
+            del entries[name]
+            self._dirty = True
+        self.save()
+        return found
+
+    def meta(self, dir_name: str) -> dict[str, Any]:
+        "The contents of meta.json, or an empty dict if missing or invalid."
+        return copy.deepcopy(self._validate(dir_name).meta)
+
+    def config_defaults(self, dir_name: str) -> Any:
+        "The contents of config.json, or None if missing or invalid."
+        return copy.deepcopy(self._validate(dir_name).config)
+
+    def schema(self, dir_name: str) -> Any:
+        """The contents of config.schema.json, True if it doesn't exist, or
+        None if it is invalid."""
+        return copy.deepcopy(self._validate(dir_name).schema)
+
+    # Writing
+    ##########################################################################
+
+    def write_meta(self, dir_name: str, meta: dict[str, Any]) -> None:
+        path = os.path.join(self.folder, dir_name, META_FILE)
+        with open(path, "w", encoding="utf8") as f:
+            json.dump(meta, f)
+        entry = self._validate(dir_name)
+        entry.meta = copy.deepcopy(meta)
+        entry.stamps[META_FILE] = _stamp(path)
+        self._dirty = True
+
+    def invalidate(self, dir_name: str) -> None:
+        """Forget the add-on's entry, so its files are read again. Used when
+        its files are replaced, as their modification times and sizes may
+        not change."""
+        if self._load().pop(dir_name, None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty or self._entries is None:
+            return
+        data = {
+            "version": VERSION,
+            "addons": {name: entry.to_json() for name, entry in self._entries.items()},
+        }
+        path = os.path.join(self.folder, INDEX_FILENAME)
+        try:
+            with open(f"{path}.tmp", "w", encoding="utf8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            print(f"unable to save add-on index: {e}")
+            return
+        self._dirty = False
+
+    # Validation
+    ##########################################################################
+
+    def _load(self) -> dict[str, _Entry]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        try:
+            with open(os.path.join(self.folder, INDEX_FILENAME), encoding="utf8") as f:
+                data = json.load(f)
+            if data.get("version") == VERSION:
+                self._entries = {
+                    name: _Entry.from_json(obj) for name, obj in data["addons"].items()
+                }
+        except Exception:
+            # missing or corrupt index; it will be rebuilt
+            pass
+        return self._entries
+
+    def _validate(self, dir_name: str) -> _Entry:
+        "The entry for the add-on, with any files that have changed re-read."
+        entries = self._load()
+        entry = entries.setdefault(dir_name, _Entry())
+        base = os.path.join(self.folder, dir_name)
+        for name in (META_FILE, CONFIG_FILE, SCHEMA_FILE):
+            path = os.path.join(base, name)
+            stamp = _stamp(path)
+            if name in entry.stamps and entry.stamps[name] == stamp:
+                continue
+            entry.stamps[name] = stamp
+            self._dirty = True
+            if name == META_FILE:
+                entry.meta = self._read_meta(dir_name, path) if stamp else {}
+            elif name == CONFIG_FILE:
+                entry.config = self._read_json(path) if stamp else None
+            else:
+                # True is a schema accepting everything
+                entry.schema = self._read_schema(path) if stamp else True
+        return entry
+
+    def _read_json(self, path: str) -> Any:
+        try:
+            with open(path, encoding="utf8") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _read_meta(self, dir_name: str, path: str) -> dict[str, Any]:
+        try:
+            with open(path, encoding="utf8") as f:
+                return json.load(f)
+        except json.JSONDecodeError as e:
+            print(f"json error in add-on {dir_name}:\n{e}")
+            return dict()
+        except Exception:
+            # missing meta file, etc
+            return dict()
+
+    def _read_schema(self, path: str) -> Any:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except json.decoder.JSONDecodeError as e:
+            print("The schema is not valid:")
+            print(e)
+        except OSError:
+            pass
+        return None
@@ -10,12 +10,14 @@ import logging
 import os
 import re
 import sys
+import time
 import traceback
+import tracemalloc
 import zipfile
 from collections import defaultdict
 from collections.abc import Callable, Iterable, Sequence
 from concurrent.futures import Future
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import IO, Any, Union
@@ -32,11 +34,13 @@ import anki.utils
 import aqt
 import aqt.forms
 import aqt.main
+from anki import _hook_profiler
 from anki.collection import AddonInfo
 from anki.httpclient import HttpClient
 from anki.lang import without_unicode_isolation
 from anki.utils import int_version_to_str
 from aqt import gui_hooks
+from aqt.addon_index import AddonIndex
 from aqt.log import ADDON_LOGGER_PREFIX, find_addon_logger, get_addon_logs_folder
 from aqt.qt import *
 from aqt.utils import (
@@ -118,6 +122,10 @@ class AddonMeta:
     human_version: str | None
     update_enabled: bool
     homepage: str | None
+    # if either is set, the add-on is imported when one of these hooks first
+    # fires or menus is first opened, instead of at startup
+    lazy_hooks: list[str] = field(default_factory=list)
+    lazy_menus: list[str] = field(default_factory=list)
 
     def human_name(self) -> str:
         return self.provided_name or self.dir_name
@@ -160,9 +168,43 @@ class AddonMeta:
             human_version=json_meta.get("human_version"),
             update_enabled=json_meta.get("update_enabled", True),
             homepage=json_meta.get("homepage"),
+            lazy_hooks=_lazy_load_triggers(dir_name, json_meta, "hooks"),
+            lazy_menus=_lazy_load_triggers(dir_name, json_meta, "menus"),
         )
 
 
+def _lazy_load_triggers(
+    dir_name: str, json_meta: dict[str, Any], key: str
+) -> list[str]:
+    """The hooks or menus in the add-on's lazy_load setting. meta.json may have
+    been edited by hand, so anything malformed is ignored."""
+    lazy_load = json_meta.get("lazy_load")
+    if lazy_load is None:
+        return []
+    if not isinstance(lazy_load, dict):
+        print(f"add-on {dir_name}: ignoring lazy_load, as it is not an object")
+        return []
+    triggers = lazy_load.get(key, [])
+    if not isinstance(triggers, list) or not all(
+        isinstance(trigger, str) for trigger in triggers
+    ):
+        print(
+            f"add-on {dir_name}: ignoring lazy_load {key}, as it is not a list of strings"
+        )
+        return []
+    return triggers
+
+
+@dataclass
+class AddonLoadStats:
+    dir_name: str
+    import_secs: float
+    # memory allocated while importing, if ANKI_PROFILE_ADDONS was set
+    memory_bytes: int | None
+    # the hook or menu that caused a lazily loaded add-on to be imported
+    trigger: str | None
+
+
 def package_name_valid(name: str) -> bool:
     # embedded /?
     base = os.path.basename(name)
@@ -202,6 +244,16 @@ class AddonManager:
             "human_version": {"type": "string", "meta": True},
             # add-on page on AnkiWeb or some other webpage
             "homepage": {"type": "string", "meta": True},
+            # gui_hooks names and main window menus ("file", "edit", "view",
+            # "tools", "help"); if provided, the add-on is imported on first use
+            "lazy_load": {
+                "type": "object",
+                "properties": {
+                    "hooks": {"type": "array", "items": {"type": "string"}},
+                    "menus": {"type": "array", "items": {"type": "string"}},
+                },
+                "meta": True,
+            },
         },
         "required": ["package", "name"],
     }
@@ -209,18 +261,17 @@ class AddonManager:
     def __init__(self, mw: aqt.main.AnkiQt) -> None:
         self.mw = mw
         self.dirty = False
+        self._load_stats: dict[str, AddonLoadStats] = {}
+        # add-ons waiting to be lazily loaded -> function that loads them
+        self._lazy_loaders: dict[str, Callable[[str], None]] = {}
         f = self.mw.form
         qconnect(f.actionAdd_ons.triggered, self.onAddonsDialog)
         sys.path.insert(0, self.addonsFolder())
+        self._index = AddonIndex(self.addonsFolder())
 
     # in new code, you may want all_addon_meta() instead
     def allAddons(self) -> list[str]:
-        l = []
-        for d in os.listdir(self.addonsFolder()):
-            path = self.addonsFolder(d)
-            if not os.path.exists(os.path.join(path, "__init__.py")):
-                continue
-            l.append(d)
+        l = self._index.addon_dirs()
         l.sort()
         if os.getenv("ANKIREVADDONS", ""):
             l = list(reversed(l))
@@ -240,14 +291,19 @@ class AddonManager:
 
         broken: list[str] = []
         error_text = ""
+        trace_memory = bool(os.getenv("ANKI_PROFILE_ADDONS"))
+        if trace_memory:
+            tracemalloc.start()
         for addon in self.all_addon_meta():
             if not addon.enabled:
                 continue
             if not addon.compatible():
                 continue
             self.dirty = True
+            if (addon.lazy_hooks or addon.lazy_menus) and self._defer_import(addon):
+                continue
             try:
-                __import__(addon.dir_name)
+                self._import_addon(addon)
             except AbortAddonImport:
                 pass
             except Exception:
@@ -260,6 +316,8 @@ class AddonManager:
                 tb = traceback.format_exc()
                 print(tb)
                 error_text += f"When loading {name}:\n{tb}\n"
+        if trace_memory:
+            tracemalloc.stop()
 
         if broken:
             addons = "\n\n- " + "\n- ".join(broken)
@@ -305,6 +363,131 @@ class AddonManager:
     def onAddonsDialog(self) -> None:
         aqt.dialogs.open("AddonsDialog", self)
 
+    # Load timing & lazy loading
+    ######################################################################
+
+    def _import_addon(self, addon: AddonMeta, trigger: str | None = None) -> None:
+        "Import the add-on, recording how long it took."
+        tracing = tracemalloc.is_tracing()
+        memory_before = tracemalloc.get_traced_memory()[0] if tracing else 0
+        start = time.perf_counter()
+        try:
+            __import__(addon.dir_name)
+        finally:
+            self._load_stats[addon.dir_name] = AddonLoadStats(
+                dir_name=addon.dir_name,
+                import_secs=time.perf_counter() - start,
+                memory_bytes=(
+                    tracemalloc.get_traced_memory()[0] - memory_before
+                    if tracing
+                    else None
+                ),
+                trigger=trigger,
+            )
+
+    def _lazy_menu(self, name: str) -> QMenu | None:
+        form = self.mw.form
+        return {
+            "file": form.menuCol,
+            "edit": form.menuEdit,
+            "view": form.menuqt_accel_view,
+            "tools": form.menuTools,
+            "help": form.menuHelp,
+        }.get(name)
+
+    def _defer_import(self, addon: AddonMeta) -> bool:
+        """Arrange for the add-on to be imported when one of its trigger hooks
+        first fires, or one of its menus is first opened. Returns False if it
+        has no valid triggers, in which case it should be imported now."""
+        hooks = [
+            (name, hook)
+            for name in addon.lazy_hooks
+            if hasattr(hook := getattr(gui_hooks, name, None), "append")
+        ]
+        menus = [
+            (name, menu) for name in addon.lazy_menus if (menu := self._lazy_menu(name))
+        ]
+        if not (hooks or menus):
+            print(f"add-on {addon.dir_name} has no valid lazy_load triggers")
+            return False
+
+        hook_callbacks: list[tuple[Any, Callable]] = []
+        menu_callbacks: list[tuple[QMenu, Callable]] = []
+
+        def remove_triggers() -> None:
+            for hook, callback in hook_callbacks:
+                hook.remove(callback)
+            for menu, callback in menu_callbacks:
+                menu.aboutToShow.disconnect(callback)
+
+        def load(trigger: str) -> None:
+            if self._lazy_loaders.pop(addon.dir_name, None) is None:
+                return
+            try:
+                self._import_addon(addon, trigger)
+            except AbortAddonImport:
+                pass
+            except Exception:
+                print(traceback.format_exc())
+                showWarning(
+                    tr.addons_failed_to_load2(addons=f"\n\n- {addon.human_name()}")
+                )
+            # the hook that triggered the import may still be running, so the
+            # triggers are removed once it has finished
+            self.mw.taskman.run_on_main(remove_triggers)
+
+        for name, hook in hooks:
+            is_filter = type(hook).__name__.endswith("Filter")
+
+            def on_hook(
+                *args: Any, name: str = name, is_filter: bool = is_filter
+            ) -> Any:
+                # the add-on's own handlers for this hook are appended to the
+                # list being iterated, so they will also receive this call
+                load(name)
+                return args[0] if is_filter else None
+
+            hook.append(on_hook)
+            hook_callbacks.append((hook, on_hook))
+
+        for name, menu in menus:
+
+            def on_menu(name: str = name) -> None:
+                load(f"menu:{name}")
+
+            qconnect(menu.aboutToShow, on_menu)
+            menu_callbacks.append((menu, on_menu))
+
+        self._lazy_loaders[addon.dir_name] = load
+        return True
+
+    def ensure_loaded(self, dir_name: str) -> None:
+        "Import the add-on now if it is waiting to be lazily loaded."
+        if load := self._lazy_loaders.get(dir_name):
+            load("request")
+
+    def is_lazy_pending(self, dir_name: str) -> bool:
+        return dir_name in self._lazy_loaders
+
+    def load_stats(self) -> list[AddonLoadStats]:
+        "Import timings of the add-ons loaded so far, slowest first."
+        return sorted(
+            self._load_stats.values(), key=lambda s: s.import_secs, reverse=True
+        )
+
+    def load_summary(self, dir_name: str) -> str | None:
+        "A short description of how long the add-on took to load, for display."
+        if self.is_lazy_pending(dir_name):
+            return "Not loaded yet; loads on first use"
+        if not (stats := self._load_stats.get(dir_name)):
+            return None
+        text = f"Loaded in {stats.import_secs * 1000:.0f}ms"
+        if stats.memory_bytes is not None:
+            text += f", {stats.memory_bytes / 1024 / 1024:.1f}MB allocated"
+        if stats.trigger:
+            text += f", on first use ({stats.trigger})"
+        return text
+
     # Metadata
     ######################################################################
 
@@ -336,22 +519,11 @@ class AddonManager:
 
     # in new code, use self.addon_meta() instead
     def addonMeta(self, module: str) -> dict[str, Any]:
-        path = self._addonMetaPath(module)
-        try:
-            with open(path, encoding="utf8") as f:
-                return json.load(f)
-        except json.JSONDecodeError as e:
-            print(f"json error in add-on {module}:\n{e}")
-            return dict()
-        except Exception:
-            # missing meta file, etc
-            return dict()
+        return self._index.meta(module)
 
     # in new code, use write_addon_meta() instead
     def writeAddonMeta(self, module: str, meta: dict[str, Any]) -> None:
-        path = self._addonMetaPath(module)
-        with open(path, "w", encoding="utf8") as f:
-            json.dump(meta, f)
+        self._index.write_meta(module, meta)
 
     def toggleEnabled(self, module: str, enable: bool | None = None) -> None:
         addon = self.addon_meta(module)
@@ -515,9 +687,11 @@ class AddonManager:
             if os.path.exists(path) and n.startswith("user_files/"):
                 continue
             zfile.extract(n, base)
+        self._index.invalidate(module)
 
     def deleteAddon(self, module: str) -> None:
         send_to_trash(Path(self.addonsFolder(module)))
+        self._index.invalidate(module)
 
     # Processing local add-on files
     ######################################################################
@@ -644,12 +818,7 @@ class AddonManager:
     _config_help_actions: dict[str, Callable[[], str]] = {}
 
     def addonConfigDefaults(self, module: str) -> dict[str, Any] | None:
-        path = os.path.join(self.addonsFolder(module), "config.json")
-        try:
-            with open(path, encoding="utf8") as f:
-                return json.load(f)
-        except Exception:
-            return None
+        return self._index.config_defaults(module)
 
     def set_config_help_action(self, module: str, action: Callable[[], str]) -> None:
         "Set a callback used to produce config help."
@@ -676,6 +845,24 @@ class AddonManager:
     def addon_from_module(module: str) -> str:
         return module.split(".")[0]
 
+    def hook_timings_report(self, addon: str | None = None) -> str | None:
+        """Time spent in hook callbacks, by the add-on they belong to, or None
+        if hook profiling is disabled. If addon is provided, only its callbacks
+        are included."""
+        if not (profiler := _hook_profiler.active()):
+            return None
+        return profiler.report(owner=self.addon_from_module, only_owner=addon)
+
+    def addon_hooks_over_budget(self, addon: str) -> bool:
+        "True if any of the add-on's hook callbacks have been slow."
+        if not (profiler := _hook_profiler.active()):
+            return False
+        return any(
+            stats.over_budget
+            for stats in profiler.summary()
+            if self.addon_from_module(stats.module) == addon
+        )
+
     def configAction(self, module: str) -> Callable[[], bool | None]:
         return self._configButtonActions.get(module)
 
@@ -689,16 +876,7 @@ class AddonManager:
         return os.path.join(self.addonsFolder(module), "config.schema.json")
 
     def _addon_schema(self, module: str) -> Any:
-        path = self._addon_schema_path(module)
-        try:
-            if not os.path.exists(path):
-                # True is a schema accepting everything
-                return True
-            with open(path, encoding="utf-8") as f:
-                return json.load(f)
-        except json.decoder.JSONDecodeError as e:
-            print("The schema is not valid:")
-            print(e)
+        return self._index.schema(module)
 
     # Add-on Config API
     ######################################################################
@@ -897,6 +1075,13 @@ class AddonsDialog(QDialog):
             item = QListWidgetItem(name, addonList)
             if self.should_grey(addon):
                 item.setForeground(Qt.GlobalColor.gray)
+            elif mgr.addon_hooks_over_budget(addon.dir_name):
+                item.setForeground(Qt.GlobalColor.red)
+            tooltip = html.escape(mgr.load_summary(addon.dir_name) or "")
+            if timings := mgr.hook_timings_report(addon.dir_name):
+                tooltip += f"<pre>{html.escape(timings)}</pre>"
+            if tooltip:
+                item.setToolTip(tooltip)
             if addon.dir_name in selected:
                 item.setSelected(True)
 
@@ -1023,6 +1208,9 @@ class AddonsDialog(QDialog):
         if not addon:
             return
 
+        # a lazily loaded add-on may register its config action on import
+        self.mgr.ensure_loaded(addon)
+
         # does add-on manage its own config?
         act = self.mgr.configAction(addon)
         if act:
@@ -71,7 +71,7 @@ class FindDuplicatesDialog(QDialog):
                 parent=self.browser,
                 op=lambda col: col.find_dupes(field, search_text),
                 success=self.show_duplicates_report,
-            ).run_in_background()
+            ).read_only().run_in_background()
 
         search = form.buttonBox.addButton(
             tr.actions_search(), QDialogButtonBox.ButtonRole.ActionRole
@@ -45,6 +45,7 @@ from aqt.operations.tag import (
 )
 from aqt.qt import *
 from aqt.qt import sip
+from aqt.taskman import TaskPriority
 from aqt.theme import ColoredIcon, theme_manager
 from aqt.utils import (
     KeyboardModifiersPressed,
@@ -196,6 +197,8 @@ class SidebarTreeView(QTreeView):
 
         QueryOp(
             parent=self.browser, op=lambda _: self._root_tree(), success=on_done
+        ).read_only().with_priority(TaskPriority.BACKGROUND).coalesce(
+            "sidebar_refresh"
         ).run_in_background()
 
     def restore_current(self, current: SidebarItem) -> None:
@@ -1,10 +1,25 @@
 /* Copyright: Ankitects Pty Ltd and contributors
  * License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html */
 
+/* eslint
+@typescript-eslint/no-unused-vars: "off",
+*/
+
 $(init);
 
 function init() {
-    $("tr.deck").draggable({
+    // Setting up jQuery UI on every row is slow with thousands of decks, so rows
+    // are made draggable when first hovered, and drop targets are only created
+    // once a drag actually starts.
+    $(document).on("mouseenter", "tr.deck", setupDraggable);
+}
+
+function setupDraggable() {
+    const row = $(this);
+    if (row.hasClass("ui-draggable")) {
+        return;
+    }
+    row.draggable({
         scroll: false,
 
         // can't use "helper: 'clone'" because of a bug in jQuery 1.5
@@ -13,12 +28,12 @@ function init() {
         },
         delay: 200,
         opacity: 0.7,
+        start: setupDroppables,
     });
-    $("tr.deck").droppable({
-        drop: handleDropEvent,
-        hoverClass: "drag-hover",
-    });
-    $("tr.top-level-drag-row").droppable({
+}
+
+function setupDroppables() {
+    $("tr.deck, tr.top-level-drag-row").not(".ui-droppable").droppable({
         drop: handleDropEvent,
         hoverClass: "drag-hover",
     });
@@ -30,3 +45,36 @@ function handleDropEvent(event, ui) {
 
     pycmd("drag:" + draggedDeckId + "," + ontoDeckId);
 }
+
+interface DeckBrowserUpdate {
+    current: number;
+    studiedToday: string;
+    // new, learn and review counts of rows that changed
+    counts?: Record<string, [number, number, number]>;
+    // replacement rows, when the shape of the tree has changed
+    tree?: string;
+}
+
+const countClasses = ["new-count", "learn-count", "review-count"];
+
+/** Called from Python to refresh the page without reloading it. */
+function updateDeckBrowser(update: DeckBrowserUpdate): void {
+    if (update.tree !== undefined) {
+        document.getElementById("decktree").innerHTML = update.tree;
+    } else {
+        for (const [deckId, counts] of Object.entries(update.counts)) {
+            const spans = document.getElementById(deckId).querySelectorAll("td[align=end] > span");
+            counts.forEach((count, idx) => {
+                spans[idx].className = count ? countClasses[idx] : "zero-count";
+                spans[idx].textContent = String(count);
+            });
+        }
+    }
+
+    const currentId = String(update.current);
+    for (const row of document.querySelectorAll("tr.deck")) {
+        row.classList.toggle("current", row.id === currentId);
+    }
+    document.getElementById("studiedToday").outerHTML = update.studiedToday;
+    document.body.style.opacity = "";
+}
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import os
 import sys
+import time
 from collections.abc import Callable
 from dataclasses import dataclass
 from functools import partial
@@ -248,12 +249,11 @@ class DebugConsole(QDialog):
         print("\n")
         del note.fields
         del note._fmap
+        del note._fields
         pprint.pprint(note.__dict__)
 
         print("\nCard:")
-        c = copy.copy(card)
-        c._render_output = None
-        pprint.pprint(c.__dict__)
+        print(card.description())
 
     def _debugCard(self) -> anki.cards.Card | None:
         assert aqt.mw
@@ -266,6 +266,78 @@ class DebugConsole(QDialog):
         self._card_repr(card)
         return card
 
+    def _debugTasks(self) -> None:
+        "Print the collection task queue and per-lane statistics."
+        assert aqt.mw
+        taskman = aqt.mw.taskman
+        for lane in taskman.lane_stats():
+            print(
+                f"{lane.name}: {lane.pending} pending, {lane.running} running, "
+                f"{lane.submitted} submitted, {lane.coalesced} coalesced, "
+                f"wait avg {lane.avg_wait_secs * 1000:.0f}ms "
+                f"max {lane.max_wait_secs * 1000:.0f}ms"
+            )
+        pending = taskman.pending_tasks()
+        if not pending:
+            print("no pending tasks")
+        for task in pending:
+            key = f" key={task.key!r}" if task.key is not None else ""
+            print(
+                f"- [{task.lane}] {task.priority.name} {task.name}{key} "
+                f"waiting {task.waiting_secs * 1000:.0f}ms"
+            )
+
+    def _debugBackend(self) -> None:
+        "Print the backend calls that took the most time."
+        from anki import _backend_profiler
+
+        if profiler := _backend_profiler.active():
+            print(profiler.report())
+            for stall in profiler.stalls()[-5:]:
+                print(
+                    f"\nblocked main thread in {stall.name} for {stall.elapsed*1000:.0f}ms:"
+                )
+                print(stall.stack)
+        else:
+            print(
+                "Backend profiling is disabled. Set ANKI_PROFILE_BACKEND=1 to enable it."
+            )
+
+    def _debugGc(self) -> None:
+        "Print how long garbage collection has been pausing the app."
+        assert aqt.mw
+        collector = aqt.mw.garbage_collector
+        for stats in collector.stats():
+            print(
+                f"gen {stats.generation}: {stats.collections} collections, "
+                f"total {stats.total_secs * 1000:.0f}ms, "
+                f"avg {stats.avg_secs * 1000:.1f}ms max {stats.max_secs * 1000:.0f}ms, "
+                f"{stats.collected} objects freed"
+            )
+        if collector.full_collection_pending():
+            print("full collection waiting for an idle moment")
+        for pause in collector.pauses()[-10:]:
+            thread = "" if pause.main_thread else " (background thread)"
+            print(
+                f"- {time.strftime('%H:%M:%S', time.localtime(pause.start))} "
+                f"gen {pause.generation} {pause.elapsed * 1000:.1f}ms{thread}"
+            )
+
+    def _debugHooks(self) -> None:
+        "Print the hook callbacks that took the most time, by add-on."
+        from anki import _hook_profiler
+
+        assert aqt.mw
+        if profiler := _hook_profiler.active():
+            print(aqt.mw.addonManager.hook_timings_report())
+            for call in profiler.slow_calls()[-10:]:
+                print(
+                    f"- {time.strftime('%H:%M:%S', time.localtime(call.start))} "
+                    f"{call.hook}: {call.callback} took {call.elapsed * 1000:.0f}ms"
+                )
+        else:
+            print("Hook profiling is disabled. Set ANKI_PROFILE_HOOKS=1 to enable it.")
+
     def onDebugPrint(self) -> None:
         cursor = self._text.textCursor()
         position = cursor.position()
@@ -288,6 +360,10 @@ class DebugConsole(QDialog):
         vars = {
             "card": self._debugCard,
             "bcard": self._debugBrowserCard,
+            "tasks": self._debugTasks,
+            "backend": self._debugBackend,
+            "gcstats": self._debugGc,
+            "hookstats": self._debugHooks,
             "mw": aqt.mw,
             "pp": pprint.pprint,
         }
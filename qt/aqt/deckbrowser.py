@@ -4,9 +4,10 @@
 from __future__ import annotations
 
 import html
+import json
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, NamedTuple
 
 import aqt
 import aqt.operations
@@ -25,6 +26,7 @@ from aqt.operations.deck import (
 )
 from aqt.qt import *
 from aqt.sound import av_player
+from aqt.taskman import TaskPriority
 from aqt.toolbar import BottomBar
 from aqt.utils import getOnlyText, openLink, shortcut, showInfo, tr
 
@@ -63,6 +65,26 @@ class RenderDeckNodeContext:
     current_deck_id: DeckId
 
 
+class DeckRow(NamedTuple):
+    """A visible row of the deck tree, as last drawn on the page."""
+
+    deck_id: DeckId
+    level: int
+    name: str
+    filtered: bool
+    has_children: bool
+    collapsed: bool
+    new_count: int
+    learn_count: int
+    review_count: int
+
+    def layout(self) -> tuple[Any, ...]:
+        return self[:6]
+
+    def counts(self) -> tuple[int, int, int]:
+        return self.new_count, self.learn_count, self.review_count
+
+
 class DeckBrowser:
     _render_data: RenderData
 
@@ -72,9 +94,13 @@ class DeckBrowser:
         self.bottom = BottomBar(mw, mw.bottomWeb)
         self.scrollPos = QPoint(0, 0)
         self._refresh_needed = False
+        # rows currently on the page, if it can be updated in place
+        self._drawn_rows: list[DeckRow] | None = None
+        self._drawn_upgrade_required = False
 
     def show(self) -> None:
         av_player.stop_and_clear_queue()
+        self._drawn_rows = None
         self.web.set_bridge_command(self._linkHandler, self)
         # redraw top bar for theme change
         self.mw.toolbar.redraw()
@@ -146,7 +172,7 @@ class DeckBrowser:
 
     _body = """
 <center>
-<table cellspacing=0 cellpadding=3>
+<table id=decktree cellspacing=0 cellpadding=3>
 %(tree)s
 </table>
 
@@ -174,11 +200,84 @@ class DeckBrowser:
                 parent=self.mw,
                 op=get_data,
                 success=success,
+            ).read_only().with_priority(TaskPriority.BACKGROUND).coalesce(
+                "deck_browser_render"
             ).run_in_background()
+        elif self._can_update_in_place():
+            # the scroll position is untouched by in-place updates
+            self.__renderPage(None)
         else:
             self.web.evalWithCallback("window.pageYOffset", self.__renderPage)
 
     def __renderPage(self, offset: int | None) -> None:
+        data = self._render_data
+        rows = self._visible_rows(data.tree)
+        if self._can_update_in_place():
+            self._update_page_in_place(rows)
+        else:
+            self._render_full_page(offset)
+            if not gui_hooks.deck_browser_will_render_content.count():
+                self._drawn_upgrade_required = data.sched_upgrade_required
+                self._drawn_rows = rows
+        gui_hooks.deck_browser_did_render(self)
+
+    def _can_update_in_place(self) -> bool:
+        """True if the page is already loaded and its rows only need patching.
+
+        Add-ons that modify the content through deck_browser_will_render_content
+        expect to see the full HTML, so they force a full render."""
+        return (
+            self._drawn_rows is not None
+            and self._drawn_upgrade_required == self._render_data.sched_upgrade_required
+            and not gui_hooks.deck_browser_will_render_content.count()
+        )
+
+    def _update_page_in_place(self, rows: list[DeckRow]) -> None:
+        """Send deckbrowser.js only what changed since the last draw: the new
+        counts of rows whose layout is unchanged, or the table rows if decks
+        were added, removed, renamed, moved, collapsed or expanded."""
+        drawn_rows = self._drawn_rows or []
+        update: dict[str, Any] = {
+            "current": self._render_data.current_deck_id,
+            "studiedToday": self._renderStats(),
+        }
+        if [row.layout() for row in rows] == [row.layout() for row in drawn_rows]:
+            update["counts"] = {
+                row.deck_id: row.counts()
+                for row, drawn in zip(rows, drawn_rows)
+                if row.counts() != drawn.counts()
+            }
+        else:
+            update["tree"] = self._renderDeckTree(self._render_data.tree)
+        self.web.eval(f"updateDeckBrowser({json.dumps(update)});")
+        self._drawn_rows = rows
+
+    def _visible_rows(self, top: DeckTreeNode) -> list[DeckRow]:
+        rows: list[DeckRow] = []
+
+        def add(node: DeckTreeNode) -> None:
+            rows.append(
+                DeckRow(
+                    deck_id=DeckId(node.deck_id),
+                    level=node.level,
+                    name=node.name,
+                    filtered=node.filtered,
+                    has_children=bool(node.children),
+                    collapsed=node.collapsed,
+                    new_count=node.new_count,
+                    learn_count=node.learn_count,
+                    review_count=node.review_count,
+                )
+            )
+            if not node.collapsed:
+                for child in node.children:
+                    add(child)
+
+        for child in top.children:
+            add(child)
+        return rows
+
+    def _render_full_page(self, offset: int | None) -> None:
         data = self._render_data
         content = DeckBrowserContent(
             tree=self._renderDeckTree(data.tree),
@@ -199,7 +298,6 @@ class DeckBrowser:
         self._drawButtons()
         if offset is not None:
             self._scrollToOffset(offset)
-        gui_hooks.deck_browser_did_render(self)
 
     def _scrollToOffset(self, offset: int) -> None:
         self.web.eval("window.scrollTo(0, %d, 'instant');" % offset)
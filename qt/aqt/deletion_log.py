@@ -0,0 +1,220 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+"""
+A log of deleted notes, kept in the profile folder so their content can be
+recovered.
+
+Notes are read from the collection before they are deleted, and then written
+out on a background thread into gzip-compressed segments. A new segment is
+started once the current one reaches SEGMENT_MAX_BYTES, and the oldest
+segments are removed once there are more than MAX_SEGMENTS of them.
+
+The deleted.txt file written by older versions is still read, but no longer
+appended to.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import queue
+import threading
+import traceback
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+
+from anki.collection import AddNoteRequest, Collection, OpChanges
+from anki.decks import DeckId
+from anki.models import NotetypeId
+from anki.notes import NoteId
+from anki.utils import ids2str, int_time, split_fields
+
+LEGACY_FILENAME = "deleted.txt"
+SEGMENT_PREFIX = "deleted-"
+SEGMENT_SUFFIX = ".txt.gz"
+# compressed size at which a new segment is started
+SEGMENT_MAX_BYTES = 8 * 1024 * 1024
+MAX_SEGMENTS = 20
+# notes read from the collection per query
+CHUNK_SIZE = 1000
+
+_HEADER = "nid\tmid\tfields\n"
+_ESCAPES = {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"}
+_UNESCAPES = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r"}
+
+
+@dataclass
+class DeletedNote:
+    nid: NoteId
+    mid: NotetypeId
+    fields: list[str]
+
+
+class DeletionLog:
+    def __init__(self, folder: str) -> None:
+        self.folder = folder
+        self._queue: queue.Queue[list[tuple[int, int, str]]] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    # Writing
+    ##########################################################################
+
+    def log_notes(self, col: Collection, nids: Sequence[NoteId]) -> None:
+        """Read the given notes, which are about to be deleted, and queue them
+        to be written to the log."""
+        for i in range(0, len(nids), CHUNK_SIZE):
+            rows = col.db.all(
+                "select id, mid, flds from notes where id in "
+                + ids2str(nids[i : i + CHUNK_SIZE])
+            )
+            if rows:
+                self._queue.put(rows)
+                self._ensure_writer()
+
+    def flush(self) -> None:
+        "Block until all queued notes have been written."
+        self._queue.join()
+
+    def _ensure_writer(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="deletion-log", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            rows = self._queue.get()
+            try:
+                self._write(rows)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                self._queue.task_done()
+
+    def _write(self, rows: list[tuple[int, int, str]]) -> None:
+        segments = self._segments()
+        if segments and os.path.getsize(segments[-1]) < SEGMENT_MAX_BYTES:
+            path = segments[-1]
+            text = ""
+        else:
+            stamp = int_time(1000)
+            if segments:
+                # names must sort in creation order
+                last = os.path.basename(segments[-1])
+                stamp = max(
+                    stamp, int(last[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)]) + 1
+                )
+            path = os.path.join(self.folder, f"{SEGMENT_PREFIX}{stamp}{SEGMENT_SUFFIX}")
+            segments.append(path)
+            text = _HEADER
+        text += "".join(
+            "\t".join([str(nid), str(mid)] + [_escape(f) for f in split_fields(flds)])
+            + "\n"
+            for nid, mid, flds in rows
+        )
+        # appending creates a new gzip member, which readers handle transparently
+        with gzip.open(path, "ab") as file:
+            file.write(text.encode("utf8"))
+        for old in segments[:-MAX_SEGMENTS]:
+            os.remove(old)
+
+    # Reading
+    ##########################################################################
+
+    def files(self) -> list[str]:
+        "Paths of the log files, oldest first."
+        legacy = os.path.join(self.folder, LEGACY_FILENAME)
+        return ([legacy] if os.path.exists(legacy) else []) + self._segments()
+
+    def entries(self) -> Iterator[DeletedNote]:
+        "All logged notes, oldest first."
+        self.flush()
+        for path in self.files():
+            if path.endswith(SEGMENT_SUFFIX):
+                with gzip.open(path, "rt", encoding="utf8", newline="\n") as file:
+                    yield from _parse(file, escaped=True)
+            else:
+                with open(path, encoding="utf8", errors="replace") as file:
+                    yield from _parse(file, escaped=False)
+
+    def search(self, text: str) -> Iterator[DeletedNote]:
+        "Logged notes with a field containing `text`, ignoring case."
+        text = text.lower()
+        for entry in self.entries():
+            if any(text in field.lower() for field in entry.fields):
+                yield entry
+
+    def find(self, nid: NoteId) -> DeletedNote | None:
+        "The most recently logged copy of the note with the given id."
+        found = None
+        for entry in self.entries():
+            if entry.nid == nid:
+                found = entry
+        return found
+
+    def _segments(self) -> list[str]:
+        if not os.path.isdir(self.folder):
+            return []
+        return [
+            os.path.join(self.folder, name)
+            for name in sorted(os.listdir(self.folder))
+            if name.startswith(SEGMENT_PREFIX)
+            and name.endswith(SEGMENT_SUFFIX)
+            and name[len(SEGMENT_PREFIX) : -len(SEGMENT_SUFFIX)].isdigit()
+        ]
+
+
+def restore_notes(
+    col: Collection, entries: Iterable[DeletedNote], deck_id: DeckId
+) -> OpChanges:
+    """Add the logged notes back to the collection as new notes in `deck_id`.
+
+    Notes whose notetype no longer exists are skipped. If the notetype has
+    since gained or lost fields, the fields are padded or truncated."""
+    requests = []
+    for entry in entries:
+        if not (notetype := col.models.get(entry.mid)):
+            continue
+        note = col.new_note(notetype)
+        count = len(note.fields)
+        note.fields = (entry.fields + [""] * count)[:count]
+        requests.append(AddNoteRequest(note=note, deck_id=deck_id))
+    return col.add_notes(requests)
+
+
+def _escape(field: str) -> str:
+    for char, escaped in _ESCAPES.items():
+        field = field.replace(char, escaped)
+    return field
+
+
+def _unescape(field: str) -> str:
+    if "\\" not in field:
+        return field
+    out = []
+    chars = iter(field)
+    for char in chars:
+        if char == "\\":
+            nxt = next(chars, "")
+            out.append(_UNESCAPES.get(nxt, nxt))
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def _parse(lines: Iterable[str], escaped: bool) -> Iterator[DeletedNote]:
+    for line in lines:
+        nid, _, rest = line.rstrip("\n").partition("\t")
+        mid, _, fields = rest.partition("\t")
+        if not (nid.isdigit() and mid.isdigit()):
+            # header, or a line of a multi-line field in the legacy file
+            continue
+        yield DeletedNote(
+            nid=NoteId(int(nid)),
+            mid=NotetypeId(int(mid)),
+            fields=[_unescape(f) if escaped else f for f in fields.split("\t")],
+        )
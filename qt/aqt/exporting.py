@@ -167,19 +167,15 @@ class ExportDialog(QDialog):
 
             # progress handler: old apkg exporter
             def exported_media_count(cnt: int) -> None:
-                self.mw.taskman.run_on_main(
-                    lambda: self.mw.progress.update(
-                        label=tr.exporting_exported_media_file(count=cnt)
-                    )
+                self.mw.taskman.report_progress(
+                    label=tr.exporting_exported_media_file(count=cnt)
                 )
 
             # progress handler: adaptor for new colpkg importer into old exporting screen.
             # don't rename this; there's a hack in pylib/exporting.py that assumes this
             # name
             def exported_media(progress: str) -> None:
-                self.mw.taskman.run_on_main(
-                    lambda: self.mw.progress.update(label=progress)
-                )
+                self.mw.taskman.report_progress(label=progress)
 
             def do_export() -> None:
                 self.exporter.exportInto(file)
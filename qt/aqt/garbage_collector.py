@@ -0,0 +1,160 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+"""
+Runs Python's garbage collector on the main thread while the user is idle.
+
+The default Python garbage collection can trigger on any thread. This can
+cause crashes if Qt objects are garbage-collected, as Qt expects access
+only on the main thread. So Anki disables the default GC on startup, and
+this scheduler takes its place: the young generations are collected often,
+which is cheap, and full collections are deferred until the user is idle.
+"""
+
+from __future__ import annotations
+
+import gc
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+import aqt
+from aqt import gui_hooks
+from aqt.qt import *
+
+# collect generations 0 and 1 this often while idle
+YOUNG_INTERVAL_SECS = 10
+# a full collection becomes due this long after the previous one
+FULL_INTERVAL_SECS = 15 * 60
+# if the user is never idle, a due full collection runs anyway after this long
+FULL_MAX_DEFER_SECS = 15 * 60
+
+
+@dataclass
+class GcPause:
+    generation: int
+    start: float
+    elapsed: float
+    collected: int
+    uncollectable: int
+    main_thread: bool
+
+
+@dataclass
+class GcGenerationStats:
+    generation: int
+    collections: int
+    total_secs: float
+    max_secs: float
+    collected: int
+
+    @property
+    def avg_secs(self) -> float:
+        return self.total_secs / self.collections if self.collections else 0.0
+
+
+class GarbageCollector:
+    def __init__(self, mw: aqt.AnkiQt) -> None:
+        self.mw = mw
+        self._pauses: deque[GcPause] = deque(maxlen=500)
+        self._stats = [GcGenerationStats(gen, 0, 0.0, 0.0, 0) for gen in range(3)]
+        self._started_at: float | None = None
+        self._last_full = time.monotonic()
+        # time at which a full collection was requested, if one is pending
+        self._full_due: float | None = None
+
+    def disable_automatic_collection(self) -> None:
+        gc.collect()
+        gc.disable()
+        if self._on_gc_event not in gc.callbacks:
+            gc.callbacks.append(self._on_gc_event)
+
+    def start_timers(self) -> None:
+        self.mw.progress.timer(
+            YOUNG_INTERVAL_SECS * 1000, self._on_timer, True, False, parent=self.mw
+        )
+        gui_hooks.reviewer_did_show_question.append(self._on_question_shown)
+
+    # Scheduling
+    ##########################################################################
+
+    def collect_now(self) -> None:
+        "Run a full collection immediately."
+        gc.collect()
+        self._last_full = time.monotonic()
+        self._full_due = None
+
+    def collect_when_idle(self) -> None:
+        "Run a full collection the next time the user is idle."
+        if self._full_due is None:
+            self._full_due = time.monotonic()
+        self.mw.progress.single_shot(1000, self._on_timer, False)
+
+    def _on_timer(self) -> None:
+        # progress timers don't fire while an operation is running
+        now = time.monotonic()
+        if self._full_due is None and now - self._last_full > FULL_INTERVAL_SECS:
+            self._full_due = now
+        overdue = (
+            self._full_due is not None and now - self._full_due > FULL_MAX_DEFER_SECS
+        )
+        if not (overdue or self._is_idle()):
+            return
+        if self._full_due is not None:
+            self.collect_now()
+        else:
+            gc.collect(1)
+
+    def _on_question_shown(self, _card: Any) -> None:
+        # the user will be reading the question for a while, so this is a
+        # cheap moment to run a young collection
+        if self._is_idle():
+            self.mw.progress.single_shot(0, lambda: gc.collect(1), False)
+
+    def _is_idle(self) -> bool:
+        app = self.mw.app
+        return (
+            not self.mw.progress.busy()
+            and app.mouseButtons() == Qt.MouseButton.NoButton
+            and app.activePopupWidget() is None
+        )
+
+    # Pause statistics
+    ##########################################################################
+
+    def _on_gc_event(self, phase: str, info: dict[str, int]) -> None:
+        if phase == "start":
+            self._started_at = time.perf_counter()
+            return
+        if self._started_at is None:
+            return
+        elapsed = time.perf_counter() - self._started_at
+        self._started_at = None
+        generation = info["generation"]
+        pause = GcPause(
+            generation=generation,
+            start=time.time() - elapsed,
+            elapsed=elapsed,
+            collected=info["collected"],
+            uncollectable=info["uncollectable"],
+            main_thread=threading.current_thread() is threading.main_thread(),
+        )
+        self._pauses.append(pause)
+        stats = self._stats[generation]
+        stats.collections += 1
+        stats.total_secs += elapsed
+        stats.max_secs = max(stats.max_secs, elapsed)
+        stats.collected += pause.collected
+
+    def pauses(self) -> list[GcPause]:
+        "The most recent collections, oldest first."
+        return list(self._pauses)
+
+    def stats(self) -> list[GcGenerationStats]:
+        "Totals per generation since startup."
+        return [GcGenerationStats(**stats.__dict__) for stats in self._stats]
+
+    def full_collection_pending(self) -> bool:
+        return self._full_due is not None
@@ -96,15 +96,15 @@ class MnemosyneImporter(Importer):
 
     @staticmethod
     def do_import(mw: aqt.main.AnkiQt, path: str) -> None:
-        def on_success(json: str) -> None:
-            json_path = os.path.join(tmpdir(), os.path.basename(path))
-            with open(json_path, "wb") as file:
-                file.write(json.encode("utf8"))
+        def on_success(json_path: str) -> None:
             ImportDialog(mw, JsonFileArgs(path=json_path))
 
+        json_path = os.path.join(tmpdir(), os.path.basename(path))
         QueryOp(
             parent=mw,
-            op=lambda col: mnemosyne.serialize(path, col.decks.current()["id"]),
+            op=lambda col: mnemosyne.serialize_to_file(
+                path, col.decks.current()["id"], json_path
+            ),
             success=on_success,
         ).with_progress().run_in_background()
 
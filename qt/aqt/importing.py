@@ -201,6 +201,9 @@ class ImportDialog(QDialog):
         )
         self.mw.col.models.save(self.importer.model, updateReqs=False)
         self.mw.progress.start()
+        self.importer.progress = lambda label: self.mw.taskman.report_progress(
+            label=label
+        )
 
         def on_done(future: Future) -> None:
             self.mw.progress.finish()
@@ -385,6 +388,7 @@ def importFile(mw: AnkiQt, file: str) -> None:
 
         # importing non-colpkg files
         mw.progress.start(immediate=True)
+        importer.progress = lambda label: mw.taskman.report_progress(label=label)
 
         def on_done(future: Future) -> None:
             mw.progress.finish()
@@ -9,6 +9,7 @@ import os
 import re
 import signal
 import sys
+import threading
 import traceback
 import weakref
 from argparse import Namespace
@@ -37,22 +38,15 @@ from anki.decks import DeckDict, DeckId
 from anki.hooks import runHook
 from anki.notes import NoteId
 from anki.sound import AVTag, SoundOrVideoTag
-from anki.utils import (
-    dev_mode,
-    ids2str,
-    int_time,
-    int_version,
-    is_lin,
-    is_mac,
-    is_win,
-    split_fields,
-)
+from anki.utils import dev_mode, int_time, int_version, is_lin, is_mac, is_win
 from aqt import gui_hooks
 from aqt.addons import DownloadLogEntry, check_and_prompt_for_updates, show_log_to_user
 from aqt.dbcheck import check_db
 from aqt.debug_console import show_debug_console
+from aqt.deletion_log import DeletionLog
 from aqt.emptycards import show_empty_cards
 from aqt.flags import FlagManager
+from aqt.garbage_collector import GarbageCollector
 from aqt.import_export.exporting import ExportDialog
 from aqt.import_export.importing import (
     import_collection_package_op,
@@ -72,6 +66,7 @@ from aqt.sync import sync_collection, sync_login
 from aqt.taskman import TaskManager
 from aqt.theme import Theme, theme_manager
 from aqt.toolbar import BottomWebView, Toolbar, TopWebView
+from aqt.tts_cache import TTSCache
 from aqt.undo import UndoActionsInfo
 from aqt.utils import (
     HelpPage,
@@ -187,6 +182,9 @@ class AnkiQt(QMainWindow):
         self.opts = opts
         self.col: Collection | None = None
         self.taskman = TaskManager(self)
+        self._deletion_log: DeletionLog | None = None
+        self._tts_cache: TTSCache | None = None
+        self._tts_cache_lock = threading.Lock()
         self.media_syncer = MediaSyncer(self)
         aqt.mw = self
         self.app = app
@@ -572,6 +570,10 @@ class AnkiQt(QMainWindow):
         saveState(self, "mainWindow")
         self.pm.save()
         self.hide()
+        if self._deletion_log:
+            self._deletion_log.flush()
+        if self._tts_cache:
+            self._tts_cache.save()
 
         self.restoring_backup = False
 
@@ -620,6 +622,20 @@ class AnkiQt(QMainWindow):
     def cleanup_sound(self) -> None:
         aqt.sound.cleanup_audio()
 
+    def tts_cache(self) -> TTSCache:
+        """The cache of synthesized speech for the current profile.
+
+        Called from background threads, which must share a single instance:
+        a new one removes files it doesn't know about, such as those another
+        instance is still writing."""
+        folder = os.path.join(self.pm.profileFolder(), "tts_cache")
+        with self._tts_cache_lock:
+            if self._tts_cache is None or self._tts_cache.folder != folder:
+                if self._tts_cache:
+                    self._tts_cache.save()
+                self._tts_cache = TTSCache(folder)
+            return self._tts_cache
+
     def _add_play_buttons(self, text: str) -> str:
         "Return card text with play buttons added, or stripped."
         if self.col.get_config_bool(Config.Bool.HIDE_AUDIO_PLAY_BUTTONS):
@@ -1471,10 +1487,8 @@ title="{}" {}>{}</button>""".format(
         self.progress.timer(
             5 * 60 * 1000, self.on_periodic_sync_timer, True, parent=self
         )
-        # periodic garbage collection
-        self.progress.timer(
-            15 * 60 * 1000, self.garbage_collect_now, True, False, parent=self
-        )
+        # garbage collection while idle
+        self.garbage_collector.start_timers()
         # ensure Python interpreter runs at least once per second, so that
         # SIGINT/SIGTERM is processed without a long delay
         self.progress.timer(1000, lambda: None, True, False, parent=self)
@@ -1605,17 +1619,16 @@ title="{}" {}>{}</button>""".format(
     ##########################################################################
 
     def onRemNotes(self, col: Collection, nids: Sequence[NoteId]) -> None:
-        path = os.path.join(self.pm.profileFolder(), "deleted.txt")
-        existed = os.path.exists(path)
-        with open(path, "ab") as f:
-            if not existed:
-                f.write(b"nid\tmid\tfields\n")
-            for id, mid, flds in col.db.execute(
-                f"select id, mid, flds from notes where id in {ids2str(nids)}"
-            ):
-                fields = split_fields(flds)
-                f.write(("\t".join([str(id), str(mid)] + fields)).encode("utf8"))
-                f.write(b"\n")
+        self.deletion_log().log_notes(col, nids)
+
+    def deletion_log(self) -> DeletionLog:
+        "The log of deleted notes for the current profile."
+        folder = self.pm.profileFolder()
+        if self._deletion_log is None or self._deletion_log.folder != folder:
+            if self._deletion_log:
+                self._deletion_log.flush()
+            self._deletion_log = DeletionLog(folder)
+        return self._deletion_log
 
     # Schema modifications
     ##########################################################################
@@ -1778,10 +1791,8 @@ title="{}" {}>{}</button>""".format(
 
     # GC
     ##########################################################################
-    # The default Python garbage collection can trigger on any thread. This can
-    # cause crashes if Qt objects are garbage-collected, as Qt expects access
-    # only on the main thread. So Anki disables the default GC on startup, and
-    # instead runs it on a timer, and after dialog close.
+    # Anki disables the default GC on startup, and instead runs it when idle
+    # (see garbage_collector.py), and after dialog close.
     # The gc after dialog close is necessary to free up the memory and extra
     # processes that webviews spawn, as a lot of the GUI code creates ref cycles.
 
@@ -1792,17 +1803,17 @@ title="{}" {}>{}</button>""".format(
 
     def deferred_delete_and_garbage_collect(self, obj: QObject) -> None:
         obj.deleteLater()
-        self.progress.single_shot(1000, self.garbage_collect_now, False)
+        self.garbage_collector.collect_when_idle()
 
     def disable_automatic_garbage_collection(self) -> None:
-        gc.collect()
-        gc.disable()
+        self.garbage_collector = GarbageCollector(self)
+        self.garbage_collector.disable_automatic_collection()
 
     def garbage_collect_now(self) -> None:
         # gc.collect() has optional arguments that will cause problems if
         # it's passed directly to a QTimer, and pylint complains if we
         # wrap it in a lambda, so we use this trivial wrapper
-        gc.collect()
+        self.garbage_collector.collect_now()
 
     # legacy aliases
 
@@ -4,20 +4,20 @@
 from __future__ import annotations
 
 import itertools
-import time
 from collections.abc import Iterable, Sequence
 from concurrent.futures import Future
 from typing import TypeVar
 
 import aqt
 import aqt.progress
-from anki.collection import Collection, SearchNode
+from anki.collection import Collection, Progress, SearchNode
 from anki.errors import Interrupted
 from anki.media import CheckMediaResponse
 from anki.notes import NoteId
 from aqt import gui_hooks
 from aqt.operations import QueryOp
 from aqt.operations.tag import add_tags_to_notes
+from aqt.progress import ProgressUpdate
 from aqt.qt import *
 from aqt.utils import (
     askUser,
@@ -52,52 +52,24 @@ class MediaChecker:
 
     def __init__(self, mw: aqt.AnkiQt) -> None:
         self.mw = mw
-        self._progress_timer: QTimer | None = None
+        self.progress_dialog = None
 
     def check(self) -> None:
-        self.progress_dialog = self.mw.progress.start()
-        self._set_progress_enabled(True)
-        self.mw.taskman.run_in_background(self._check, self._on_finished)
-
-    def _set_progress_enabled(self, enabled: bool) -> None:
-        if self._progress_timer:
-            self._progress_timer.stop()
-            self._progress_timer.deleteLater()
-            self._progress_timer = None
-        if enabled:
-            self._progress_timer = timer = QTimer()
-            timer.setSingleShot(False)
-            timer.setInterval(100)
-            qconnect(timer.timeout, self._on_progress)
-            timer.start()
-
-    def _on_progress(self) -> None:
-        if not self.mw.col:
-            return
-        progress = self.mw.col.latest_progress()
-        if not progress.HasField("media_check"):
-            return
-        label = progress.media_check
+        self.mw.taskman.with_backend_progress(
+            self._check, self._on_progress, self._on_finished
+        )
 
-        try:
-            assert self.progress_dialog is not None
-            if self.progress_dialog.wantCancel:
-                self.mw.col.set_wants_abort()
-        except AttributeError:
-            # dialog may not be active
-            pass
-
-        self.mw.taskman.run_on_main(lambda: self.mw.progress.update(label=label))
+    def _on_progress(self, progress: Progress, update: ProgressUpdate) -> None:
+        if update.user_wants_abort:
+            update.abort = True
+        if progress.HasField("media_check"):
+            update.label = progress.media_check
 
     def _check(self) -> CheckMediaResponse:
         "Run the check on a background thread."
         return self.mw.col.media.check()
 
     def _on_finished(self, future: Future) -> None:
-        self._set_progress_enabled(False)
-        self.mw.progress.finish()
-        self.progress_dialog = None
-
         exc = future.exception()
         if isinstance(exc, Interrupted):
             return
@@ -197,21 +169,16 @@ class MediaChecker:
         total = len(fnames)
 
         def trash(col: Collection) -> None:
-            last_progress = 0.0
             remaining = total
 
             for chunk in chunked_list(fnames, 25):
                 col.media.trash_files(chunk)
                 remaining -= len(chunk)
-                if time.time() - last_progress >= 0.1:
-                    self.mw.taskman.run_on_main(
-                        lambda: self.mw.progress.update(
-                            label=tr.media_check_files_remaining(count=remaining),
-                            value=total - remaining,
-                            max=total,
-                        )
-                    )
-                    last_progress = time.time()
+                self.mw.taskman.report_progress(
+                    label=tr.media_check_files_remaining(count=remaining),
+                    value=total - remaining,
+                    max=total,
+                )
 
         QueryOp(
             parent=aqt.mw,
@@ -222,38 +189,28 @@ class MediaChecker:
         ).with_progress().run_in_background()
 
     def _on_empty_trash(self) -> None:
-        self.progress_dialog = self.mw.progress.start()
-        self._set_progress_enabled(True)
-
         def empty_trash() -> None:
             self.mw.col.media.empty_trash()
 
         def on_done(fut: Future) -> None:
-            self.mw.progress.finish()
-            self._set_progress_enabled(False)
             # check for errors
             fut.result()
 
             tooltip(tr.media_check_trash_emptied())
 
-        self.mw.taskman.run_in_background(empty_trash, on_done)
+        self.mw.taskman.with_backend_progress(empty_trash, self._on_progress, on_done)
 
     def _on_restore_trash(self) -> None:
-        self.progress_dialog = self.mw.progress.start()
-        self._set_progress_enabled(True)
-
         def restore_trash() -> None:
             self.mw.col.media.restore_trash()
 
         def on_done(fut: Future) -> None:
-            self.mw.progress.finish()
-            self._set_progress_enabled(False)
             # check for errors
             fut.result()
 
             tooltip(tr.media_check_trash_restored())
 
-        self.mw.taskman.run_in_background(restore_trash, on_done)
+        self.mw.taskman.with_backend_progress(restore_trash, self._on_progress, on_done)
 
     def _on_view_files(self) -> None:
         openFolder(self.mw.col.media.dir())
@@ -28,16 +28,17 @@
 from __future__ import annotations
 
 import inspect
+import itertools
 import json
 import os
-import select
+import selectors
 import socket
 import subprocess
 import sys
 import tempfile
 import threading
 import time
-from queue import Empty, Full, Queue
+from queue import Empty, Queue
 from shutil import which
 
 from anki.utils import is_win
@@ -110,9 +111,6 @@ class MPVBase:
         self._stop_process()
         self._stop_socket()
 
-    def _thread_id(self):
-        return threading.get_ident()
-
     #
     # Process
     #
@@ -205,10 +203,16 @@ class MPVBase:
 
     def _prepare_thread(self):
         """Set up the queues for the communication threads."""
-        self._request_queue = Queue(1)
-        self._response_queues = {}
+        # request id -> queue the response is delivered to
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._request_ids = itertools.count(1)
         self._event_queue = Queue()
         self._stop_event = threading.Event()
+        if not is_win:
+            # written to when stopping, so the reader wakes up immediately
+            self._wake_r, self._wake_w = os.pipe()
 
     def _start_thread(self):
         """Start up the communication threads."""
@@ -220,50 +224,82 @@ class MPVBase:
         """Stop the communication threads."""
         if hasattr(self, "_stop_event"):
             self._stop_event.set()
+        if hasattr(self, "_wake_w"):
+            try:
+                os.write(self._wake_w, b"x")
+            except OSError:
+                pass
         if hasattr(self, "_thread"):
             self._thread.join()
-
-    def _reader(self):
-        """Read the incoming json messages from the unix socket that is
-        connected to the mpv process. Pass them on to the message handler.
+        if hasattr(self, "_wake_w"):
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            del self._wake_r, self._wake_w
+
+    def _read_chunks(self):
+        """Yield data from the socket as it arrives, until the connection is
+        closed or the thread is asked to stop.
         """
-        buf = b""
-        while not self._stop_event.is_set():
-            if is_win:
+        if is_win:
+            # selectors can't wait on named pipes, so poll, backing off
+            # while there's nothing to read
+            delay = 0.001
+            while not self._stop_event.is_set():
                 try:
-                    (n, b) = win32file.ReadFile(self._sock, 4096)
-                    buf += b
+                    (n, b) = win32file.ReadFile(self._sock, 65536)
+                    delay = 0.001
+                    yield b
                 except pywintypes.error as err:
                     if err.args[0] == winerror.ERROR_NO_DATA:
-                        time.sleep(0.1)
+                        time.sleep(delay)
+                        delay = min(delay * 2, 0.1)
                         continue
                     elif err.args[0] == winerror.ERROR_BROKEN_PIPE:
                         return
                     else:
                         raise
-            else:
-                r, w, e = select.select([self._sock], [], [], 1)
-                if r:
-                    try:
-                        b = self._sock.recv(1024)
-                        if not b:
-                            break
-                        buf += b
-                    except ConnectionResetError:
-                        return
-
-            newline = buf.find(b"\n")
-            while newline >= 0:
-                data = buf[: newline + 1]
-                buf = buf[newline + 1 :]
-
-                if self.debug:
-                    sys.stdout.write(f"<<< {data.decode('utf8', 'replace')}")
+            return
 
-                message = self._parse_message(data)
-                self._handle_message(message)
+        chunk = memoryview(bytearray(65536))
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._sock, selectors.EVENT_READ)
+            selector.register(self._wake_r, selectors.EVENT_READ)
+            while not self._stop_event.is_set():
+                for key, _events in selector.select():
+                    if key.fileobj is not self._sock:
+                        return
+                try:
+                    n = self._sock.recv_into(chunk)
+                except ConnectionResetError:
+                    return
+                if not n:
+                    return
+                yield chunk[:n]
 
+    def _reader(self):
+        """Read the incoming json messages from the unix socket that is
+        connected to the mpv process. Pass them on to the message handler.
+        """
+        buf = bytearray()
+        try:
+            for data in self._read_chunks():
+                buf += data
+                start = 0
                 newline = buf.find(b"\n")
+                while newline >= 0:
+                    with memoryview(buf) as view:
+                        line = view[start:newline]
+                        if self.debug:
+                            sys.stdout.write(f"<<< {str(line, 'utf8', 'replace')}\n")
+                        message = self._parse_message(line)
+                        line.release()
+                    self._handle_message(message)
+                    start = newline + 1
+                    newline = buf.find(b"\n", start)
+                # drop the lines that were handled, keeping any partial line
+                del buf[:start]
+        finally:
+            self._fail_pending()
 
     #
     # Message handling
@@ -277,7 +313,7 @@ class MPVBase:
     def _parse_message(self, data):
         """Return a message dictionary from a json representation."""
         # XXX may be strict is too strict ;-)
-        data = data.decode("utf8", "strict")
+        data = str(data, "utf8", "strict")
         return json.loads(data)
 
     def _handle_message(self, message):
@@ -285,13 +321,21 @@ class MPVBase:
         commands or asynchronous events.
         """
         if "error" in message:
-            # This message is a reply to a request.
-            try:
-                thread_id = self._request_queue.get(timeout=1)
-            except Empty:
-                raise MPVCommunicationError("got a response without a pending request")
-
-            self._response_queues[thread_id].put(message)
+            # This message is a reply to a request. mpv versions before 0.26
+            # don't echo the request id, but do reply in order.
+            request_id = message.get("request_id")
+            with self._pending_lock:
+                if not request_id:
+                    request_id = next(
+                        (id for id, q in self._pending.items() if q.empty()), None
+                    )
+                queue = self._pending.get(request_id)
+            if queue is None:
+                # the request timed out
+                if self.debug:
+                    sys.stdout.write(f"late response to request {request_id}\n")
+                return
+            queue.put_nowait(message)
 
         elif "event" in message:
             # This message is an asynchronous event.
@@ -300,55 +344,61 @@ class MPVBase:
         else:
             raise MPVCommunicationError(f"invalid message {message!r}")
 
+    def _fail_pending(self):
+        """Wake up any threads waiting for a response, after the connection
+        has closed."""
+        with self._pending_lock:
+            for queue in self._pending.values():
+                if queue.empty():
+                    queue.put_nowait(None)
+
     def _send_message(self, message, timeout=None):
         """Send a message/command to the mpv process, message must be a
-        dictionary of the form {"command": ["arg1", "arg2", ...]}. Responses
-        from the mpv process must be collected using _get_response().
+        dictionary of the form {"command": ["arg1", "arg2", ...]}. Returns the
+        request id, which is used to collect the response with _get_response().
         """
-        data = self._compose_message(message)
+        # Each request carries an id that mpv includes in its response, so
+        # requests can be made from several threads at once (e.g. fetching
+        # properties from event callbacks) without their responses mixing up.
+        request_id = next(self._request_ids)
+        data = self._compose_message(dict(message, request_id=request_id))
 
         if self.debug:
             sys.stdout.write(f">>> {data.decode('utf8', 'replace')}")
 
-        # Request/response cycles are coordinated across different threads, so
-        # that they don't get mixed up. This makes it possible to use commands
-        # (e.g. fetch properties) from event callbacks that run in a different
-        # thread context.
-        thread_id = self._thread_id()
-        if thread_id not in self._response_queues:
-            # Prepare a response queue for the thread to wait on.
-            self._response_queues[thread_id] = Queue()
-
-        # Put the id of the current thread on the request queue. This id is
-        # later used to associate responses from the mpv process with this
-        # request.
-        try:
-            self._request_queue.put(thread_id, block=True, timeout=timeout)
-        except Full:
-            raise MPVTimeoutError("unable to put request")
+        with self._pending_lock:
+            self._pending[request_id] = Queue(1)
 
         # Write the message data to the socket.
-        if is_win:
-            win32file.WriteFile(self._sock, data)
-        else:
-            while data:
-                size = self._sock.send(data)
-                if size == 0:
-                    raise MPVCommunicationError("broken sender socket")
-                data = data[size:]
-
-    def _get_response(self, timeout=None):
+        try:
+            with self._send_lock:
+                if is_win:
+                    win32file.WriteFile(self._sock, data)
+                else:
+                    self._sock.sendall(data)
+        except Exception:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            raise
+        return request_id
+
+    def _get_response(self, request_id, timeout=None):
         """Collect the response message to a previous request. If there was an
         error a MPVCommandError exception is raised, otherwise the command
         specific data is returned.
         """
+        with self._pending_lock:
+            queue = self._pending[request_id]
         try:
-            message = self._response_queues[self._thread_id()].get(
-                block=True, timeout=timeout
-            )
+            message = queue.get(block=True, timeout=timeout)
         except Empty:
             raise MPVTimeoutError("unable to get response")
+        finally:
+            with self._pending_lock:
+                del self._pending[request_id]
 
+        if message is None:
+            raise MPVCommunicationError("connection closed")
         if message["error"] != "success":
             raise MPVCommandError(message["error"])
         else:
@@ -368,8 +418,8 @@ class MPVBase:
         """Send a command to the mpv process and collect the result."""
         self.ensure_running()
         try:
-            self._send_message(message, timeout)
-            return self._get_response(timeout)
+            request_id = self._send_message(message, timeout)
+            return self._get_response(request_id, timeout)
         except MPVCommandError as e:
             raise MPVCommandError(f"{message['command']!r}: {e}")
         except Exception as e:
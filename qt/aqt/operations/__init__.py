@@ -3,8 +3,9 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Hashable
 from concurrent.futures._base import Future
+from functools import wraps
 from typing import Any, Generic, Protocol, TypeVar, Union
 
 import aqt
@@ -23,6 +24,7 @@ from anki.collection import (
 from aqt.errors import show_exception
 from aqt.progress import ProgressUpdate
 from aqt.qt import QWidget
+from aqt.taskman import TaskPriority
 
 
 class HasChangesProperty(Protocol):
@@ -60,6 +62,7 @@ class CollectionOp(Generic[ResultWithChanges]):
     - Commits changes
     - Fires the `operation_(will|did)_reset` hooks
     - Fires the legacy `state_did_reset` hook
+    - Runs ahead of queued QueryOps that have a lower priority
 
     Be careful not to call any UI routines in `op`, as that may crash Qt.
     This includes things select .selectedCards() in the browse screen.
@@ -110,6 +113,8 @@ class CollectionOp(Generic[ResultWithChanges]):
         def wrapped_done(future: Future) -> None:
             assert mw
             mw._decrease_background_ops()
+            if future.cancelled():
+                return
             # did something go wrong?
             if exception := future.exception():
                 if isinstance(exception, Exception):
@@ -139,10 +144,16 @@ class CollectionOp(Generic[ResultWithChanges]):
     ) -> None:
         if self._progress_update:
             mw.taskman.with_backend_progress(
-                op, self._progress_update, on_done=on_done, parent=self._parent
+                op,
+                self._progress_update,
+                on_done=on_done,
+                parent=self._parent,
+                priority=TaskPriority.USER,
             )
         else:
-            mw.taskman.with_progress(op, on_done, parent=self._parent)
+            mw.taskman.with_progress(
+                op, on_done, parent=self._parent, priority=TaskPriority.USER
+            )
 
 
 def on_op_finished(
@@ -202,6 +213,9 @@ class QueryOp(Generic[T]):
         self._op = op
         self._success = success
         self._uses_collection = True
+        self._read_only = False
+        self._priority = TaskPriority.NORMAL
+        self._key: Hashable | None = None
 
     def failure(self, failure: Callable[[Exception], Any] | None) -> QueryOp[T]:
         self._failure = failure
@@ -217,6 +231,33 @@ class QueryOp(Generic[T]):
         self._uses_collection = False
         return self
 
+    def read_only(self) -> QueryOp[T]:
+        """Flag this QueryOp as only reading from the collection.
+
+        Read-only operations run on their own lane, so they don't have to wait
+        for queued writes like imports or Check Database to complete. Don't use
+        this for operations that modify the collection, as writes rely on being
+        serialized."""
+        self._read_only = True
+        return self
+
+    def with_priority(self, priority: TaskPriority) -> QueryOp[T]:
+        """Change when this op starts relative to other queued collection tasks.
+
+        Use TaskPriority.BACKGROUND for refreshes the user is not waiting on, so
+        that they don't delay things like answering a card."""
+        self._priority = priority
+        return self
+
+    def coalesce(self, key: Hashable) -> QueryOp[T]:
+        """Drop any op with the same key that is still waiting to run.
+
+        Useful for repeated refreshes of the same screen, where only the latest
+        result matters. The dropped op's success/failure handlers are not called.
+        Has no effect if a progress window is shown."""
+        self._key = key
+        return self
+
     def with_progress(
         self,
         label: str | None = None,
@@ -238,6 +279,7 @@ class QueryOp(Generic[T]):
 
         mw._increase_background_ops()
 
+        @wraps(self._op)
         def wrapped_op() -> T:
             assert mw
             return self._op(mw.col)
@@ -246,6 +288,9 @@ class QueryOp(Generic[T]):
             assert mw
 
             mw._decrease_background_ops()
+            if future.cancelled():
+                # superseded by a newer op with the same key
+                return
             # did something go wrong?
             if exception := future.exception():
                 if isinstance(exception, Exception):
@@ -276,10 +321,24 @@ class QueryOp(Generic[T]):
                 on_done=on_done,
                 start_label=label,
                 parent=self._parent,
+                read_only=self._read_only,
+                priority=self._priority,
             )
         elif self._progress:
-            mw.taskman.with_progress(op, on_done, label=label, parent=self._parent)
+            mw.taskman.with_progress(
+                op,
+                on_done,
+                label=label,
+                parent=self._parent,
+                read_only=self._read_only,
+                priority=self._priority,
+            )
         else:
             mw.taskman.run_in_background(
-                op, on_done, uses_collection=self._uses_collection
+                op,
+                on_done,
+                uses_collection=self._uses_collection,
+                read_only=self._read_only,
+                priority=self._priority,
+                key=self._key,
             )
@@ -20,6 +20,7 @@ from aqt.operations.scheduling import (
     unbury_deck,
 )
 from aqt.sound import av_player
+from aqt.taskman import TaskPriority
 from aqt.toolbar import BottomBar
 from aqt.utils import askUserDialog, openLink, shortcut, tooltip, tr
 
@@ -72,6 +73,8 @@ class Overview:
 
         QueryOp(
             parent=self.mw, op=lambda col: col.sched.counts(), success=success
+        ).read_only().with_priority(TaskPriority.BACKGROUND).coalesce(
+            "overview_refresh"
         ).run_in_background()
 
     def refresh_if_needed(self) -> None:
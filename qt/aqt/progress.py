@@ -17,6 +17,10 @@ from aqt.utils import disable_help_button, tr
 # Progress info
 ##########################################################################
 
+# bounds of the interval at which backend progress is polled
+BACKEND_POLL_MIN_MS = 100
+BACKEND_POLL_MAX_MS = 800
+
 
 class ProgressManager:
     def __init__(self, mw: aqt.AnkiQt) -> None:
@@ -180,17 +184,31 @@ class ProgressManager:
     ) -> None:
         self._backend_timer = QTimer()
         self._backend_timer.setSingleShot(False)
-        self._backend_timer.setInterval(100)
+        self._backend_timer.setInterval(BACKEND_POLL_MIN_MS)
 
         if not (dialog := self.start(immediate=True, label=start_label, parent=parent)):
             print("Progress dialog already running; aborting will not work")
 
+        last_progress: Progress | None = None
+
         def on_progress() -> None:
+            nonlocal last_progress
             assert self.mw
+            assert self._backend_timer
 
             user_wants_abort = dialog and dialog.wantCancel or False
-            update = ProgressUpdate(user_wants_abort=user_wants_abort)
             progress = self.mw.backend.latest_progress()
+            # The backend can't notify us of changes, so it has to be polled.
+            # While it reports the same thing, poll less and less often.
+            if progress == last_progress and not user_wants_abort:
+                self._backend_timer.setInterval(
+                    min(BACKEND_POLL_MAX_MS, self._backend_timer.interval() * 2)
+                )
+                return
+            last_progress = progress
+            self._backend_timer.setInterval(BACKEND_POLL_MIN_MS)
+
+            update = ProgressUpdate(user_wants_abort=user_wants_abort)
             progress_update(progress, update)
             if update.abort:
                 self.mw.backend.set_wants_abort()
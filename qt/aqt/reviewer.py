@@ -145,6 +145,9 @@ class QuestionAction(Enum):
 
 
 class Reviewer:
+    # while the answer is shown, read the next card's question sounds
+    preload_next_card_sounds = True
+
     def __init__(self, mw: AnkiQt) -> None:
         self.mw = mw
         self.web = mw.web
@@ -262,7 +265,10 @@ class Reviewer:
 
     def _get_next_v3_card(self) -> None:
         assert isinstance(self.mw.col.sched, V3Scheduler)
-        output = self.mw.col.sched.get_queued_cards()
+        # the second card is used to preload its sounds
+        output = self.mw.col.sched.get_queued_cards(
+            fetch_limit=2 if self.preload_next_card_sounds else 1
+        )
         if not output.cards:
             return
         self._v3 = V3CardInfo.from_queue(output)
@@ -304,6 +310,20 @@ class Reviewer:
             replay_audio(self.card, False)
         gui_hooks.audio_will_replay(self.web, self.card, self.state == "question")
 
+    def _preload_next_card_sounds(self) -> None:
+        if not (self.preload_next_card_sounds and self._v3):
+            return
+        queued = self._v3.queued_cards.cards
+        if len(queued) < 2:
+            return
+        card = Card(self.mw.col, backend_card=queued[1].card)
+        if not card.autoplay():
+            return
+        # a full render would run LaTeX and add-on filters on the main thread
+        tags = card.question_av_tags_without_hooks()
+        gui_hooks.reviewer_will_preload_next_card_sounds(card, tags)
+        av_player.preload_tags(tags)
+
     def _on_av_player_did_end_playing(self, *args) -> None:
         def task() -> None:
             if av_player.queue_is_empty():
@@ -482,6 +502,7 @@ class Reviewer:
         # user hook
         gui_hooks.reviewer_did_show_answer(c)
         self._auto_advance_to_question_if_enabled()
+        self._preload_next_card_sounds()
 
     def _auto_advance_to_question_if_enabled(self) -> None:
         self._clear_auto_advance_timers()
@@ -8,6 +8,7 @@ import platform
 import re
 import subprocess
 import sys
+import threading
 import time
 import traceback
 import wave
@@ -26,7 +27,7 @@ import aqt.qt
 from anki import hooks
 from anki.cards import Card
 from anki.sound import AV_REF_RE, AVTag, SoundOrVideoTag
-from anki.utils import is_lin, is_mac, is_win, namedtmp
+from anki.utils import is_lin, is_mac, is_win, namedtmp, tmpdir
 from aqt import gui_hooks
 from aqt._macos_helper import macos_helper
 from aqt.mpv import MPV, MPVBase, MPVCommandError
@@ -79,6 +80,15 @@ class Player(ABC):
     def toggle_pause(self) -> None:
         "Optional."
 
+    def prefetch(self, tags: list[AVTag]) -> None:
+        """Optional. Called while this player is playing, with the tags that
+        will be passed to play() next, in order, so they can be opened in
+        advance. Replaces any previously prefetched tags."""
+
+    def preload(self, tags: list[AVTag]) -> None:
+        """Optional. Called with tags that may be played a little later, such
+        as the next card's audio, so their files can be read into the cache."""
+
     def shutdown(self) -> None:
         "Do any cleanup required at program termination. Optional."
 
@@ -101,6 +111,29 @@ def is_audio_file(fname: str) -> bool:
     return ext in AUDIO_EXTENSIONS
 
 
+# files larger than this are not preloaded
+PRELOAD_MAX_BYTES = 16 * 1024 * 1024
+
+
+def preload_files(paths: list[str]) -> None:
+    """Read the files on a background thread, so the OS has them cached when
+    they are played."""
+
+    def read() -> None:
+        for path in paths:
+            try:
+                if os.path.getsize(path) > PRELOAD_MAX_BYTES:
+                    continue
+                with open(path, "rb") as file:
+                    while file.read(1024 * 1024):
+                        pass
+            except OSError:
+                pass
+
+    if paths:
+        threading.Thread(target=read, name="av-preload", daemon=True).start()
+
+
 class SoundOrVideoPlayer(Player):  # pylint: disable=abstract-method
     default_rank = 0
 
@@ -140,6 +173,8 @@ class AVPlayer:
     # when a new batch of audio is played, should the currently playing
     # audio be stopped?
     interrupt_current_audio = True
+    # how many queued tags the current player is told about in advance
+    prefetch_count = 2
 
     def __init__(self) -> None:
         self._enqueued: list[AVTag] = []
@@ -183,6 +218,16 @@ class AVPlayer:
         if self.current_player:
             self.current_player.seek_relative(secs)
 
+    def preload_tags(self, tags: list[AVTag]) -> None:
+        """Hint that the tags may be played soon, without queueing them, so
+        the players can prepare their files."""
+        by_player: dict[Player, list[AVTag]] = {}
+        for tag in tags:
+            if player := self._best_player_for_tag(tag):
+                by_player.setdefault(player, []).append(tag)
+        for player, player_tags in by_player.items():
+            player.preload(player_tags)
+
     def shutdown(self) -> None:
         self.stop_and_clear_queue()
         for player in self.players:
@@ -203,12 +248,22 @@ class AVPlayer:
         self._play_next_if_idle()
 
     def _play_next_if_idle(self) -> None:
-        if self.current_player:
+        if not self.current_player:
+            next = self._pop_next()
+            if next is not None:
+                self._play(next)
+        self._prefetch_upcoming()
+
+    def _prefetch_upcoming(self) -> None:
+        "Tell the current player which of the queued tags it will play next."
+        if not (player := self.current_player):
             return
-
-        next = self._pop_next()
-        if next is not None:
-            self._play(next)
+        upcoming = []
+        for tag in self._enqueued[: self.prefetch_count]:
+            if self._best_player_for_tag(tag) is not player:
+                break
+            upcoming.append(tag)
+        player.prefetch(upcoming)
 
     def _play(self, tag: AVTag) -> None:
         best_player = self._best_player_for_tag(tag)
@@ -290,6 +345,8 @@ class SimpleProcessPlayer(Player):  # pylint: disable=abstract-method
         self._taskman = taskman
         self._media_folder = media_folder
         self._terminate_flag = False
+        # set when the process exits or stop() is called
+        self._wake = threading.Event()
         self._process: subprocess.Popen | None = None
         self._warned_about_missing_player = False
 
@@ -303,6 +360,17 @@ class SimpleProcessPlayer(Player):  # pylint: disable=abstract-method
 
     def stop(self) -> None:
         self._terminate_flag = True
+        self._wake.set()
+
+    def preload(self, tags: list[AVTag]) -> None:
+        if self._media_folder:
+            preload_files(
+                [
+                    os.path.join(self._media_folder, tag.filename)
+                    for tag in tags
+                    if isinstance(tag, SoundOrVideoTag)
+                ]
+            )
 
     # note: mplayer implementation overrides this
     def _play(self, tag: AVTag) -> None:
@@ -320,8 +388,21 @@ class SimpleProcessPlayer(Player):  # pylint: disable=abstract-method
         self._taskman.run_on_main(
             lambda: gui_hooks.av_player_did_begin_playing(self, tag)
         )
+        self._wait_for_process()
+
+    def _wait_for_process(self) -> None:
+        "Wait until self._process exits, or terminate it if stop() is called."
+        # wake up when the process exits, instead of polling it
+        process = self._process
+        threading.Thread(
+            target=lambda: (process.wait(), self._wake.set()), daemon=True
+        ).start()
 
         while True:
+            self._wake.wait()
+            # may be left over from a previous process
+            self._wake.clear()
+
             # should we abort playing?
             if self._terminate_flag:
                 self._process.terminate()
@@ -334,9 +415,8 @@ class SimpleProcessPlayer(Player):  # pylint: disable=abstract-method
                 self._process = None
                 return
 
-            # wait for completion
-            try:
-                self._process.wait(0.1)
+            # completed?
+            if self._process.poll() is not None:
                 if self._process.returncode != 0:
                     print(f"player got return code: {self._process.returncode}")
                 try:
@@ -346,9 +426,6 @@ class SimpleProcessPlayer(Player):  # pylint: disable=abstract-method
                     print("unable to close stdin:", e)
                 self._process = None
                 return
-            except subprocess.TimeoutExpired:
-                # process still running, repeat loop
-                pass
 
     def _on_done(self, ret: Future, cb: OnDoneCallback) -> None:
         try:
@@ -406,10 +483,19 @@ class MpvManager(MPV, SoundOrVideoPlayer):
         mpvPath, self.popenEnv = _packagedCmd(["mpv"])
         self.executable = mpvPath[0]
         self._on_done: OnDoneCallback | None = None
+        # Files appended to mpv's playlist after the current one, which mpv
+        # opens in advance and moves on to without going idle. Only accessed
+        # on the main thread.
+        self._prefetched: list[str] = []
+        self._playlist_pos = 0
+        # true if mpv has moved on to _prefetched[0] by itself
+        self._advanced = False
         self.default_argv += [f"--config-dir={base_path}"]
         super().__init__(window_id=None, debug=False)
 
     def on_init(self) -> None:
+        self._prefetched = []
+        self._advanced = False
         # if mpv dies and is restarted, tell Anki the
         # current file is done
         if self._on_done:
@@ -424,16 +510,58 @@ class MpvManager(MPV, SoundOrVideoPlayer):
         except MPVCommandError:
             print("mpv too old for key rebinding")
 
-    def play(self, tag: AVTag, on_done: OnDoneCallback) -> None:
+        try:
+            # fill the demuxer cache of the next playlist entry while the
+            # current one plays
+            self.set_property("prefetch-playlist", "yes")
+        except MPVCommandError:
+            print("mpv too old for playlist prefetching")
+
+    def _path_for_tag(self, tag: AVTag) -> str:
         assert isinstance(tag, SoundOrVideoTag)
-        self._on_done = on_done
         filename = hooks.media_file_filter(tag.filename)
-        path = os.path.join(self.media_folder, filename)
+        return os.path.join(self.media_folder, filename)
+
+    def play(self, tag: AVTag, on_done: OnDoneCallback) -> None:
+        self._on_done = on_done
+        path = self._path_for_tag(tag)
 
-        self.command("loadfile", path, "replace")
+        if self._advanced and self._prefetched and self._prefetched[0] == path:
+            # already playing
+            self._prefetched.pop(0)
+        else:
+            self._prefetched = []
+            self.command("loadfile", path, "replace")
+            self._playlist_pos = 0
+        self._advanced = False
         gui_hooks.av_player_did_begin_playing(self, tag)
 
+    def prefetch(self, tags: list[AVTag]) -> None:
+        paths = [self._path_for_tag(tag) for tag in tags]
+        if self._advanced:
+            # the first prefetched file is playing, but play() hasn't been
+            # called for it yet; this is called again once it has
+            return
+        if paths == self._prefetched:
+            return
+        if paths[: len(self._prefetched)] == self._prefetched:
+            new = paths[len(self._prefetched) :]
+        else:
+            # removes everything but the current file
+            self.command("playlist-clear")
+            self._playlist_pos = 0
+            new = paths
+        for path in new:
+            self.command("loadfile", path, "append")
+        self._prefetched = paths
+
+    def preload(self, tags: list[AVTag]) -> None:
+        preload_files([self._path_for_tag(tag) for tag in tags])
+
     def stop(self) -> None:
+        # this also clears the playlist
+        self._prefetched = []
+        self._advanced = False
         self.command("stop")
 
     def toggle_pause(self) -> None:
@@ -448,6 +576,27 @@ class MpvManager(MPV, SoundOrVideoPlayer):
 
             mw.taskman.run_on_main(self._on_done)
 
+    def on_property_playlist_pos(self, value: int) -> None:
+        from aqt import mw
+
+        mw.taskman.run_on_main(lambda: self._on_playlist_pos(value))
+
+    def _on_playlist_pos(self, pos: int) -> None:
+        # mpv only moves forward by itself when a prefetched file is next
+        if not self._prefetched or self._advanced or pos != self._playlist_pos + 1:
+            return
+        try:
+            # the playlist may have been replaced since the event was sent
+            if self.get_property("playlist-pos") != pos:
+                return
+        except MPVCommandError:
+            return
+        self._playlist_pos = pos
+        self._advanced = True
+        # the previous file has finished
+        if self._on_done:
+            self._on_done()
+
     def shutdown(self) -> None:
         self.close()
 
@@ -469,16 +618,35 @@ class MpvManager(MPV, SoundOrVideoPlayer):
 
 
 class SimpleMplayerSlaveModePlayer(SimpleMplayerPlayer):
+    """Plays tags in a single long-running mplayer process, controlled over
+    its slave interface. Falls back to a process per tag if the mplayer
+    version in use doesn't report when a file has finished playing."""
+
+    # keep one mplayer process running between tags
+    persistent = True
+
     def __init__(self, taskman: TaskManager, media_folder: str) -> None:
         self.media_folder = media_folder
         super().__init__(taskman, media_folder)
         self.args.append("-slave")
+        self._worker: subprocess.Popen | None = None
+        # None until the first file played by the worker has finished
+        self._worker_reports_eof: bool | None = None
+        # the reader thread reports progress through these
+        self._worker_state = threading.Condition()
+        self._loads = 0
+        self._answers = 0
+        self._load_finished = False
 
     def _play(self, tag: AVTag) -> None:
         assert isinstance(tag, SoundOrVideoTag)
 
         filename = hooks.media_file_filter(tag.filename)
 
+        if self.persistent and self._ensure_worker():
+            self._play_in_worker(tag, filename)
+            return
+
         self._process = subprocess.Popen(
             self.args + ["--", filename],
             env=self.env,
@@ -505,6 +673,133 @@ class SimpleMplayerSlaveModePlayer(SimpleMplayerPlayer):
     def toggle_pause(self) -> None:
         self.command("pause")
 
+    def stop(self) -> None:
+        super().stop()
+        with self._worker_state:
+            if self._worker and self._process is self._worker:
+                self._worker_command("stop")
+
+    def shutdown(self) -> None:
+        if worker := self._worker:
+            self._worker = None
+            try:
+                worker.stdin.write(b"quit\n")
+                worker.stdin.close()
+                worker.wait(1)
+            except Exception:
+                worker.kill()
+
+    # Persistent worker
+    ######################################################################
+
+    def _ensure_worker(self) -> bool:
+        "Start the worker if necessary. False if it can't be used."
+        if self._worker and self._worker.poll() is None:
+            return True
+        if self._worker_reports_eof is False:
+            return False
+        self._worker = subprocess.Popen(
+            # end-of-file messages are only printed at verbose level
+            self.args + ["-idle", "-msglevel", "global=6"],
+            env=self.env,
+            cwd=self.media_folder,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            startupinfo=startup_info(),
+        )
+        with self._worker_state:
+            self._loads = self._answers = 0
+            self._load_finished = False
+        threading.Thread(
+            target=self._read_worker_output,
+            args=(self._worker,),
+            name="mplayer-worker",
+            daemon=True,
+        ).start()
+        if self._worker_reports_eof is None:
+            # make sure the end of a file can be detected, by playing
+            # a short silent one
+            path = os.path.join(tmpdir(), "silence.wav")
+            with wave.open(path, "wb") as file:
+                file.setnchannels(1)
+                file.setsampwidth(2)
+                file.setframerate(8000)
+                file.writeframes(b"\0\0" * 80)
+            with self._worker_state:
+                self._load(path)
+                self._worker_state.wait_for(lambda: self._load_finished, 5)
+                self._worker_reports_eof = self._load_finished
+            if not self._worker_reports_eof:
+                print("mplayer doesn't report end of file; using a process per file")
+                self.shutdown()
+                return False
+        return True
+
+    def _worker_command(self, command: str) -> None:
+        assert self._worker and self._worker.stdin
+        self._worker.stdin.write(command.encode("utf8") + b"\n")
+        self._worker.stdin.flush()
+
+    def _load(self, path: str) -> None:
+        "Start playing path in the worker. Caller must hold _worker_state."
+        quoted = path.replace("\\", "\\\\").replace('"', '\\"')
+        self._loads += 1
+        self._load_finished = False
+        self._worker_command(f'loadfile "{quoted}"')
+        # answered with an error if the file could not be opened, or has
+        # already finished
+        self._worker_command("get_property filename")
+
+    def _read_worker_output(self, worker: subprocess.Popen) -> None:
+        """Track the progress of the current file from the worker's output.
+
+        Each load is followed by a query, so the nth answer belongs to the nth
+        load. The current file has finished once its query was answered with
+        an error, or an end-of-file message arrives after its answer. Earlier
+        end-of-file messages belong to files that were stopped."""
+        assert worker.stdout
+        for line in worker.stdout:
+            with self._worker_state:
+                if worker is not self._worker:
+                    return
+                if line.startswith(b"ANS_"):
+                    self._answers += 1
+                    if self._answers == self._loads:
+                        self._load_finished = line.startswith(b"ANS_ERROR")
+                elif line.startswith(b"EOF code:"):
+                    if self._answers == self._loads:
+                        self._load_finished = True
+                else:
+                    continue
+                if self._load_finished:
+                    self._worker_state.notify_all()
+                    self._wake.set()
+        # the worker has exited
+        with self._worker_state:
+            if worker is not self._worker:
+                return
+            self._load_finished = True
+            self._worker_state.notify_all()
+        self._wake.set()
+
+    def _play_in_worker(self, tag: AVTag, filename: str) -> None:
+        with self._worker_state:
+            if self._terminate_flag:
+                return
+            self._load(filename)
+            self._process = self._worker
+        self._taskman.run_on_main(
+            lambda: gui_hooks.av_player_did_begin_playing(self, tag)
+        )
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            with self._worker_state:
+                if self._terminate_flag or self._load_finished:
+                    self._process = None
+                    return
+
 
 # MP3 transcoding
 ##########################################################################
@@ -9,11 +9,16 @@ See QueryOp() and CollectionOp() for higher-level routines.
 
 from __future__ import annotations
 
+import heapq
+import time
 import traceback
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Callable, Hashable
 from concurrent.futures import Future
 from concurrent.futures.thread import ThreadPoolExecutor
-from threading import Lock, current_thread, main_thread
+from dataclasses import dataclass, field
+from enum import IntEnum
+from threading import Condition, Lock, Thread, current_thread, main_thread
 from typing import Any
 
 import aqt
@@ -23,6 +28,184 @@ from aqt.qt import *
 
 Closure = Callable[[], None]
 
+# Progress reported with TaskManager.report_progress() is shown at most this
+# often, or less often if updating the progress window is slow.
+PROGRESS_MIN_INTERVAL_SECS = 0.05
+PROGRESS_MAX_INTERVAL_SECS = 0.5
+
+
+class TaskPriority(IntEnum):
+    """Order in which queued collection tasks are started.
+
+    USER and NORMAL tasks run in the order they were submitted, so existing
+    reads and writes are not reordered. BACKGROUND tasks only start when no
+    other task is waiting."""
+
+    USER = 0
+    "Operations the user explicitly asked for, like answering a card."
+    NORMAL = 1
+    BACKGROUND = 2
+    "Refreshes of screens the user may not be waiting on."
+
+
+@dataclass
+class LaneStats:
+    "A snapshot of the activity on one of the collection lanes."
+
+    name: str
+    pending: int
+    running: int
+    submitted: int
+    coalesced: int
+    max_pending: int
+    last_wait_secs: float
+    avg_wait_secs: float
+    max_wait_secs: float
+
+
+@dataclass
+class PendingTask:
+    "A task waiting on one of the collection lanes, for debugging."
+
+    lane: str
+    priority: TaskPriority
+    key: Hashable | None
+    name: str
+    waiting_secs: float
+
+
+@dataclass(order=True)
+class _QueuedTask:
+    # 0 for USER and NORMAL tasks, 1 for BACKGROUND ones
+    deferred: int
+    seq: int
+    priority: int = field(compare=False)
+    queued_at: float = field(compare=False)
+    key: Hashable | None = field(compare=False)
+    task: Callable = field(compare=False)
+    args: dict[str, Any] = field(compare=False)
+    future: Future = field(compare=False)
+
+
+class _Lane:
+    """A single worker thread that runs queued tasks in priority order.
+
+    Tasks submitted with a key replace any task with the same key that is
+    still waiting to run; the replaced task's future is cancelled. The lane
+    also keeps track of its queue depth and how long tasks waited before
+    they started."""
+
+    _RECENT_WAITS = 100
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._cond = Condition()
+        self._queue: list[_QueuedTask] = []
+        self._seq = 0
+        self._thread: Thread | None = None
+        self._running = 0
+        self._submitted = 0
+        self._coalesced = 0
+        self._max_pending = 0
+        self._waits: deque[float] = deque(maxlen=self._RECENT_WAITS)
+
+    def submit(
+        self,
+        task: Callable,
+        args: dict[str, Any],
+        priority: TaskPriority,
+        key: Hashable | None,
+    ) -> Future:
+        future: Future = Future()
+        with self._cond:
+            if key is not None:
+                self._drop_pending_with_key(key)
+            self._seq += 1
+            heapq.heappush(
+                self._queue,
+                _QueuedTask(
+                    deferred=int(priority >= TaskPriority.BACKGROUND),
+                    priority=priority,
+                    seq=self._seq,
+                    queued_at=time.monotonic(),
+                    key=key,
+                    task=task,
+                    args=args,
+                    future=future,
+                ),
+            )
+            self._submitted += 1
+            self._max_pending = max(self._max_pending, len(self._queue))
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def _drop_pending_with_key(self, key: Hashable) -> None:
+        "Caller must hold the lock."
+        superseded = [entry for entry in self._queue if entry.key == key]
+        if not superseded:
+            return
+        self._queue = [entry for entry in self._queue if entry.key != key]
+        heapq.heapify(self._queue)
+        for entry in superseded:
+            if entry.future.cancel():
+                self._coalesced += 1
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                entry = heapq.heappop(self._queue)
+                if not entry.future.set_running_or_notify_cancel():
+                    continue
+                self._running += 1
+                self._waits.append(time.monotonic() - entry.queued_at)
+            try:
+                result = entry.task(**entry.args)
+            except BaseException as exc:  # pylint: disable=broad-except
+                entry.future.set_exception(exc)
+            else:
+                entry.future.set_result(result)
+            finally:
+                with self._cond:
+                    self._running -= 1
+            # don't keep the last task and its result alive while idle
+            del entry
+
+    def pending(self) -> list[PendingTask]:
+        now = time.monotonic()
+        with self._cond:
+            entries = sorted(self._queue)
+        return [
+            PendingTask(
+                lane=self.name,
+                priority=TaskPriority(entry.priority),
+                key=entry.key,
+                name=getattr(entry.task, "__qualname__", repr(entry.task)),
+                waiting_secs=now - entry.queued_at,
+            )
+            for entry in entries
+            if not entry.future.cancelled()
+        ]
+
+    def stats(self) -> LaneStats:
+        with self._cond:
+            waits = list(self._waits)
+            return LaneStats(
+                name=self.name,
+                pending=sum(1 for entry in self._queue if not entry.future.cancelled()),
+                running=self._running,
+                submitted=self._submitted,
+                coalesced=self._coalesced,
+                max_pending=self._max_pending,
+                last_wait_secs=waits[-1] if waits else 0.0,
+                avg_wait_secs=sum(waits) / len(waits) if waits else 0.0,
+                max_wait_secs=max(waits, default=0.0),
+            )
+
 
 class TaskManager(QObject):
     _closures_pending = pyqtSignal()
@@ -31,9 +214,16 @@ class TaskManager(QObject):
         QObject.__init__(self)
         self.mw = mw.weakref()
         self._no_collection_executor = ThreadPoolExecutor()
-        self._collection_executor = ThreadPoolExecutor(max_workers=1)
+        self._collection_lane = _Lane("collection")
+        self._read_only_lane = _Lane("collection-read")
         self._closures: list[Closure] = []
         self._closures_lock = Lock()
+        # latest progress reported from a background task, not yet shown
+        self._progress: ProgressUpdate | None = None
+        self._progress_signalled = False
+        self._progress_shown_at = 0.0
+        self._progress_interval = PROGRESS_MIN_INTERVAL_SECS
+        self._progress_timer_active = False
         qconnect(self._closures_pending, self._on_closures_pending)
 
     def run_on_main(self, closure: Closure) -> None:
@@ -42,12 +232,34 @@ class TaskManager(QObject):
             self._closures.append(closure)
         self._closures_pending.emit()  # type: ignore
 
+    def report_progress(
+        self,
+        label: str | None = None,
+        value: int | None = None,
+        max: int | None = None,
+    ) -> None:
+        """Show progress of a long-running operation in the progress window.
+        Can be called from any thread.
+
+        Updates are pushed to the main thread rather than polled for. Only the
+        latest is kept, and they are shown no more often than the time it
+        takes to update the window allows, so this is cheap to call often."""
+        with self._closures_lock:
+            self._progress = ProgressUpdate(label=label, value=value, max=max)
+            if self._progress_signalled:
+                return
+            self._progress_signalled = True
+        self._closures_pending.emit()  # type: ignore
+
     def run_in_background(
         self,
         task: Callable,
         on_done: Callable[[Future], None] | None = None,
         args: dict[str, Any] | None = None,
         uses_collection=True,
+        read_only=False,
+        priority: TaskPriority = TaskPriority.NORMAL,
+        key: Hashable | None = None,
     ) -> Future:
         """Use QueryOp()/CollectionOp() in new code.
 
@@ -60,7 +272,16 @@ class TaskManager(QObject):
 
         Tasks that access the collection are serialized. If you're doing things that
         don't require the collection (e.g. network requests), you can pass uses_collection
-        =False to allow multiple tasks to run in parallel."""
+        =False to allow multiple tasks to run in parallel.
+
+        Tasks that only read from the collection can pass read_only=True, so that
+        they run on a separate lane and don't queue up behind long-running writes
+        such as imports. Writes remain serialized on the main collection lane.
+
+        Queued collection tasks with BACKGROUND priority start after any other
+        waiting tasks; others start in submission order. If key is provided, any
+        task with the same key that has not started yet is dropped, and its future
+        is cancelled; on_done will receive the cancelled future."""
         # Before we launch a background task, ensure any pending on_done closure are run on
         # main. Qt's signal/slot system will have posted a notification, but it may
         # not have been processed yet. The on_done() closures may make small queries
@@ -76,12 +297,12 @@ class TaskManager(QObject):
         if args is None:
             args = {}
 
-        executor = (
-            self._collection_executor
-            if uses_collection
-            else self._no_collection_executor
-        )
-        fut = executor.submit(task, **args)
+        if not uses_collection:
+            fut = self._no_collection_executor.submit(task, **args)
+        elif read_only:
+            fut = self._read_only_lane.submit(task, args, priority, key)
+        else:
+            fut = self._collection_lane.submit(task, args, priority, key)
 
         if on_done is not None:
             fut.add_done_callback(
@@ -90,6 +311,14 @@ class TaskManager(QObject):
 
         return fut
 
+    def lane_stats(self) -> list[LaneStats]:
+        "Queue depth and wait times of the collection lanes, for debugging."
+        return [self._collection_lane.stats(), self._read_only_lane.stats()]
+
+    def pending_tasks(self) -> list[PendingTask]:
+        "Collection tasks that are waiting to run, in the order they will start."
+        return self._collection_lane.pending() + self._read_only_lane.pending()
+
     def with_progress(
         self,
         task: Callable,
@@ -98,6 +327,8 @@ class TaskManager(QObject):
         label: str | None = None,
         immediate: bool = False,
         uses_collection=True,
+        read_only=False,
+        priority: TaskPriority = TaskPriority.NORMAL,
     ) -> None:
         "Use QueryOp()/CollectionOp() in new code."
         self.mw.progress.start(parent=parent, label=label, immediate=immediate)
@@ -107,7 +338,13 @@ class TaskManager(QObject):
             if on_done:
                 on_done(fut)
 
-        self.run_in_background(task, wrapped_done, uses_collection=uses_collection)
+        self.run_in_background(
+            task,
+            wrapped_done,
+            uses_collection=uses_collection,
+            read_only=read_only,
+            priority=priority,
+        )
 
     def with_backend_progress(
         self,
@@ -117,6 +354,8 @@ class TaskManager(QObject):
         parent: QWidget | None = None,
         start_label: str | None = None,
         uses_collection=True,
+        read_only=False,
+        priority: TaskPriority = TaskPriority.NORMAL,
     ) -> None:
         self.mw.progress.start_with_backend_updates(
             progress_update,
@@ -132,7 +371,13 @@ class TaskManager(QObject):
                     100, lambda: on_done(fut), requires_collection=False
                 )
 
-        self.run_in_background(task, wrapped_done, uses_collection=uses_collection)
+        self.run_in_background(
+            task,
+            wrapped_done,
+            uses_collection=uses_collection,
+            read_only=read_only,
+            priority=priority,
+        )
 
     def _on_closures_pending(self) -> None:
         """Run any pending closures. This runs in the main thread."""
@@ -142,3 +387,36 @@ class TaskManager(QObject):
 
         for closure in closures:
             closure()
+
+        self._show_progress()
+
+    def _show_progress(self) -> None:
+        if self._progress_timer_active:
+            return
+        wait = self._progress_shown_at + self._progress_interval - time.monotonic()
+        if wait > 0:
+            # shown recently; try again when the interval has passed
+            self._progress_timer_active = True
+
+            def on_timer() -> None:
+                self._progress_timer_active = False
+                self._show_progress()
+
+            QTimer.singleShot(int(wait * 1000) + 1, on_timer)
+            return
+
+        with self._closures_lock:
+            update = self._progress
+            self._progress = None
+            self._progress_signalled = False
+        if update is None or not self.mw.progress.busy():
+            return
+
+        start = time.monotonic()
+        self.mw.progress.update(label=update.label, value=update.value, max=update.max)
+        self._progress_shown_at = time.monotonic()
+        # keep the time spent redrawing the window to a small fraction
+        self._progress_interval = min(
+            PROGRESS_MAX_INTERVAL_SECS,
+            max(PROGRESS_MIN_INTERVAL_SECS, (self._progress_shown_at - start) * 10),
+        )
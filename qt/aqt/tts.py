@@ -31,6 +31,8 @@ from __future__ import annotations
 import os
 import re
 import subprocess
+from abc import abstractmethod
+from collections.abc import Callable
 from concurrent.futures import Future
 from dataclasses import dataclass
 from operator import attrgetter
@@ -45,6 +47,7 @@ from anki.sound import AVTag, TTSTag
 from anki.utils import checksum, is_win, tmpdir
 from aqt import gui_hooks
 from aqt.sound import OnDoneCallback, SimpleProcessPlayer
+from aqt.tts_cache import cache_key
 from aqt.utils import tooltip, tr
 
 
@@ -105,11 +108,30 @@ class TTSPlayer:
     def temp_file_for_tag_and_voice(self, tag: AVTag, voice: TTSVoice) -> str:
         """Return a hashed filename, to allow for caching generated files.
 
-        No file extension is included."""
+        No file extension is included. Files in the temp folder are removed
+        at exit; use cached_speech_file() to keep them between sessions."""
         assert isinstance(tag, TTSTag)
         buf = f"{voice.name}-{voice.lang}-{tag.field_text}"
         return os.path.join(tmpdir(), f"tts-{checksum(buf)}")
 
+    def cached_speech_file(
+        self, tag: TTSTag, voice: TTSVoice, ext: str, write: Callable[[str], None]
+    ) -> str:
+        """Return the path of a file with the speech for tag, calling
+        write(path) to generate it if it's not in the profile's TTS cache."""
+        assert aqt.mw
+        cache = aqt.mw.tts_cache()
+        key = cache_key(voice.name, voice.lang, tag.speed, tag.field_text)
+        if path := cache.lookup(key, ext):
+            return path
+        temp_path = cache.temp_path(key, ext)
+        try:
+            write(temp_path)
+            return cache.add(key, ext, temp_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
 
 class TTSProcessPlayer(SimpleProcessPlayer, TTSPlayer):
     # mypy gets confused if rank_for_tag is defined in TTSPlayer
@@ -124,6 +146,73 @@ class TTSProcessPlayer(SimpleProcessPlayer, TTSPlayer):
             return None
 
 
+class TTSFilePlayer(TTSProcessPlayer):
+    """Generates a file with the speech, which is then played using av_player.
+
+    Files are kept in the profile's TTS cache, and speech for upcoming cards
+    is generated in advance."""
+
+    # the extension of the generated files
+    file_ext = ".wav"
+    # generate speech for the next card while the answer is shown
+    presynthesize = True
+
+    @abstractmethod
+    def write_speech_file(
+        self, tag: TTSTag, voice: TTSVoice, path: str, playing: bool
+    ) -> None:
+        """Generate the speech for tag, saving it to path.
+
+        Playing is False when the speech is generated in advance. When True,
+        the speech is for the tag being played, and generating it should be
+        interrupted if stop() is called."""
+
+    def speech_file(self, tag: TTSTag, playing: bool = False) -> str:
+        match = self.voice_for_tag(tag)
+        assert match
+        return self.cached_speech_file(
+            tag,
+            match.voice,
+            self.file_ext,
+            lambda path: self.write_speech_file(tag, match.voice, path, playing),
+        )
+
+    def _play(self, tag: AVTag) -> None:
+        assert isinstance(tag, TTSTag)
+        self._taskman.run_on_main(
+            lambda: gui_hooks.av_player_did_begin_playing(self, tag)
+        )
+        self._speech_path = self.speech_file(tag, playing=True)
+
+    def preload(self, tags: list[AVTag]) -> None:
+        tts_tags = [tag for tag in tags if isinstance(tag, TTSTag)]
+        if not (self.presynthesize and tts_tags):
+            return
+
+        def on_done(fut: Future) -> None:
+            if exc := fut.exception():
+                print(f"unable to generate speech in advance: {exc}")
+
+        self._taskman.run_in_background(
+            lambda: [self.speech_file(tag) for tag in tts_tags],
+            on_done,
+            uses_collection=False,
+        )
+
+    def _on_done(self, ret: Future, cb: OnDoneCallback) -> None:
+        if self._terminate_flag:
+            # stopped while the speech was being generated
+            cb()
+            return
+        ret.result()
+
+        # inject file into the top of the audio queue
+        from aqt.sound import av_player
+
+        av_player.current_player = None
+        av_player.insert_file(self._speech_path)
+
+
 # tts-voices filter
 ##########################################################################
 
@@ -216,22 +305,22 @@ class MacTTSPlayer(TTSProcessPlayer):
         return MacVoice(name=tidy_name, original_name=original_name, lang=m.group(2))
 
 
-class MacTTSFilePlayer(MacTTSPlayer):
+class MacTTSFilePlayer(TTSFilePlayer, MacTTSPlayer):
     "Generates an .aiff file, which is played using av_player."
 
+    file_ext = ".aiff"
+    # kept for add-ons; speech is now written to the profile's TTS cache
     tmppath = os.path.join(tmpdir(), "tts.aiff")
 
-    def _play(self, tag: AVTag) -> None:
-        assert isinstance(tag, TTSTag)
-        match = self.voice_for_tag(tag)
-        assert match
-        voice = match.voice
+    def write_speech_file(
+        self, tag: TTSTag, voice: TTSVoice, path: str, playing: bool
+    ) -> None:
         assert isinstance(voice, MacVoice)
 
         default_wpm = 170
         words_per_min = str(int(default_wpm * tag.speed))
 
-        self._process = subprocess.Popen(
+        process = subprocess.Popen(
             [
                 "say",
                 "-v",
@@ -241,26 +330,25 @@ class MacTTSFilePlayer(MacTTSPlayer):
                 "-f",
                 "-",
                 "-o",
-                self.tmppath,
+                path,
             ],
             stdin=subprocess.PIPE,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         )
         # write the input text to stdin
-        assert self._process.stdin is not None
-        self._process.stdin.write(tag.field_text.encode("utf8"))
-        self._process.stdin.close()
-        self._wait_for_termination(tag)
-
-    def _on_done(self, ret: Future, cb: OnDoneCallback) -> None:
-        ret.result()
-
-        # inject file into the top of the audio queue
-        from aqt.sound import av_player
-
-        av_player.current_player = None
-        av_player.insert_file(self.tmppath)
+        assert process.stdin is not None
+        process.stdin.write(tag.field_text.encode("utf8"))
+        process.stdin.close()
+        if playing:
+            # let stop() interrupt it
+            self._process = process
+            self._wait_for_process()
+        else:
+            process.wait()
+        if process.returncode != 0:
+            # don't cache a partly written file
+            raise subprocess.CalledProcessError(process.returncode or -1, "say")
 
 
 # Windows support
@@ -568,7 +656,8 @@ if is_win:
                 available=voice.available,
             )
 
-    class WindowsRTTTSFilePlayer(TTSProcessPlayer):
+    class WindowsRTTTSFilePlayer(TTSFilePlayer):
+        # kept for add-ons; speech is now written to the profile's TTS cache
         tmppath = os.path.join(tmpdir(), "tts.wav")
 
         def validated_voices(self) -> list[TTSVoice]:
@@ -585,19 +674,13 @@ if is_win:
             voices = aqt.mw.backend.all_tts_voices(validate=validate)
             return list(map(WindowsRTVoice.from_backend_voice, voices))
 
-        def _play(self, tag: AVTag) -> None:
+        def write_speech_file(
+            self, tag: TTSTag, voice: TTSVoice, path: str, playing: bool
+        ) -> None:
             assert aqt.mw
-            assert isinstance(tag, TTSTag)
-            match = self.voice_for_tag(tag)
-            assert match
-            voice = cast(WindowsRTVoice, match.voice)
-
-            self._taskman.run_on_main(
-                lambda: gui_hooks.av_player_did_begin_playing(self, tag)
-            )
             aqt.mw.backend.write_tts_stream(
-                path=self.tmppath,
-                voice_id=voice.id,
+                path=path,
+                voice_id=cast(WindowsRTVoice, voice).id,
                 speed=tag.speed,
                 text=tag.field_text,
             )
@@ -609,8 +692,4 @@ if is_win:
                 cb()
                 return
 
-            # inject file into the top of the audio queue
-            from aqt.sound import av_player
-
-            av_player.current_player = None
-            av_player.insert_file(self.tmppath)
+            super()._on_done(ret, cb)
@@ -0,0 +1,158 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+"""
+A cache of synthesized speech, kept in the profile folder so it survives
+restarts.
+
+Files are keyed by a hash of the voice, language, speed and text. The cache
+is limited to MAX_BYTES; when it grows beyond that, the least recently used
+files are removed. Sizes and last use times are kept in an index file, which
+is written when files are added or removed, and when the cache is saved on
+profile close.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+
+from anki.utils import checksum
+
+INDEX_FILENAME = "index.json"
+VERSION = 1
+MAX_BYTES = 200 * 1024 * 1024
+
+
+def cache_key(voice: str, lang: str, speed: float, text: str) -> str:
+    return checksum(f"{voice}\n{lang}\n{speed}\n{text}")
+
+
+class TTSCache:
+    def __init__(self, folder: str, max_bytes: int = MAX_BYTES) -> None:
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # filename -> [size, last used]
+        self._entries: dict[str, list[int]] | None = None
+        self._dirty = False
+
+    def lookup(self, key: str, ext: str) -> str | None:
+        "The path of the cached file, or None if it is not cached."
+        filename = f"{key}{ext}"
+        path = os.path.join(self.folder, filename)
+        with self._lock:
+            entries = self._load()
+            if filename not in entries:
+                return None
+            if not os.path.exists(path):
+                del entries[filename]
+                self._dirty = True
+                return None
+            entries[filename][1] = int(time.time())
+            self._dirty = True
+            return path
+
+    def temp_path(self, key: str, ext: str) -> str:
+        """A path to write a new file to, before add() moves it into place.
+        Unique per thread, so the same speech can be generated concurrently."""
+        with self._lock:
+            # loading the index removes stray files, which must happen first
+            self._load()
+        os.makedirs(self.folder, exist_ok=True)
+        return os.path.join(self.folder, f"{key}.{threading.get_ident()}.part{ext}")
+
+    def add(self, key: str, ext: str, temp_path: str) -> str:
+        "Move a file written to temp_path into the cache, and return its path."
+        filename = f"{key}{ext}"
+        path = os.path.join(self.folder, filename)
+        os.replace(temp_path, path)
+        with self._lock:
+            entries = self._load()
+            entries[filename] = [os.path.getsize(path), int(time.time())]
+            self._dirty = True
+            self._evict(keep=filename)
+            self._save()
+        return path
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(size for size, _used in self._load().values())
+
+    def clear(self) -> None:
+        with self._lock:
+            for filename in self._load():
+                try:
+                    os.remove(os.path.join(self.folder, filename))
+                except OSError:
+                    pass
+            self._entries = {}
+            self._dirty = True
+            self._save()
+
+    def save(self) -> None:
+        "Write out last use times, if they have changed."
+        with self._lock:
+            self._save()
+
+    def _evict(self, keep: str) -> None:
+        entries = self._load()
+        total = sum(size for size, _used in entries.values())
+        for filename in sorted(entries, key=lambda name: entries[name][1]):
+            if total <= self.max_bytes:
+                break
+            if filename == keep:
+                continue
+            try:
+                os.remove(os.path.join(self.folder, filename))
+            except OSError:
+                pass
+            total -= entries.pop(filename)[0]
+
+    def _load(self) -> dict[str, list[int]]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        try:
+            with open(os.path.join(self.folder, INDEX_FILENAME), encoding="utf8") as f:
+                data = json.load(f)
+            if data.get("version") == VERSION:
+                self._entries = data["entries"]
+        except Exception:
+            # missing or corrupt index; it will be rebuilt
+            pass
+        # remove files the index doesn't know about, such as partly written
+        # ones, so they don't take up space forever
+        try:
+            filenames = os.listdir(self.folder)
+        except OSError:
+            filenames = []
+        for filename in filenames:
+            if filename not in self._entries and not filename.startswith(
+                INDEX_FILENAME
+            ):
+                try:
+                    os.remove(os.path.join(self.folder, filename))
+                except OSError:
+                    pass
+        return self._entries
+
+    def _save(self) -> None:
+        if not self._dirty or self._entries is None:
+            return
+        path = os.path.join(self.folder, INDEX_FILENAME)
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            with open(f"{path}.tmp", "w", encoding="utf8") as f:
+                json.dump(
+                    {"version": VERSION, "entries": self._entries},
+                    f,
+                    separators=(",", ":"),
+                )
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            print(f"unable to save tts cache index: {e}")
+            return
+        self._dirty = False
@@ -9,6 +9,7 @@ import os
 import re
 import sys
 from collections.abc import Callable, Sequence
+from concurrent.futures import Future
 from enum import Enum
 from typing import TYPE_CHECKING, Any, cast
 
@@ -44,15 +45,24 @@ class AnkiWebPage(QWebEnginePage):
 
     def _setupBridge(self) -> None:
         class Bridge(QObject):
-            def __init__(self, bridge_handler: Callable[[str], Any]) -> None:
+            def __init__(
+                self,
+                bridge_handler: Callable[[str], Any],
+                batch_handler: Callable[[str], str],
+            ) -> None:
                 super().__init__()
                 self.onCmd = bridge_handler
+                self.onCmds = batch_handler
 
             @pyqtSlot(str, result=str)  # type: ignore
             def cmd(self, str: str) -> Any:
                 return json.dumps(self.onCmd(str))
 
-        self._bridge = Bridge(self._onCmd)
+            @pyqtSlot(str, result=str)  # type: ignore
+            def cmds(self, batch: str) -> str:
+                return self.onCmds(batch)
+
+        self._bridge = Bridge(self._onCmd, self._onCmds)
 
         self._channel = QWebChannel(self)
         self._channel.registerObject("py", self._bridge)
@@ -69,18 +79,88 @@ class AnkiWebPage(QWebEnginePage):
         script.setSourceCode(
             jstext
             + """
-            var pycmd, bridgeCommand;
+            var pycmd, bridgeCommand, pycmdAsync, _pycmdSettle, _pycmdFlush;
             new QWebChannel(qt.webChannelTransport, function(channel) {
+                // commands are sent to Python in batches, at most once per frame
+                var queue = [];
+                var waiting = {};
+                var nextId = 1;
+                var scheduled = false;
+                // send at once, while a script run from Python is executing
+                var immediate = false;
+
+                var settle = function (id, ok, value) {
+                    var item = waiting[id];
+                    if (!item) {
+                        return;
+                    }
+                    delete waiting[id];
+                    if (ok) {
+                        item.resolve(value);
+                    } else {
+                        item.reject(new Error(value));
+                    }
+                };
+                // called by Python when a command running in the background is done
+                _pycmdSettle = settle;
+
+                var flush = function () {
+                    scheduled = false;
+                    if (!queue.length) {
+                        return;
+                    }
+                    var batch = queue;
+                    queue = [];
+                    channel.objects.py.cmds(JSON.stringify(batch), function (res) {
+                        JSON.parse(res).forEach(function (result, i) {
+                            // [0, value], [1] if still running, or [2, error]
+                            if (result[0] !== 1) {
+                                settle(batch[i][0], result[0] === 0, result[1]);
+                            }
+                        });
+                    });
+                };
+
+                var enqueue = function (arg, resolve, reject) {
+                    var id = nextId++;
+                    waiting[id] = {resolve: resolve, reject: reject};
+                    queue.push([id, arg]);
+                    if (immediate) {
+                        flush();
+                    } else if (!scheduled) {
+                        scheduled = true;
+                        // animation frames are paused while the page is hidden
+                        requestAnimationFrame(flush);
+                        setTimeout(flush, 16);
+                    }
+                };
+                window.addEventListener("pagehide", flush);
+                // called by Python around scripts it runs, so messages they send
+                // arrive before the script's result
+                _pycmdFlush = function (sendImmediately) {
+                    immediate = sendImmediately;
+                    flush();
+                };
+
                 bridgeCommand = pycmd = function (arg, cb) {
-                    var resultCB = function (res) {
-                        // pass result back to user-provided callback
-                        if (cb) {
-                            cb(JSON.parse(res));
+                    enqueue(
+                        arg,
+                        function (value) {
+                            // pass result back to user-provided callback
+                            if (cb) {
+                                cb(value);
+                            }
+                        },
+                        function (error) {
+                            console.error(error.message);
                         }
-                    }
-                
-                    channel.objects.py.cmd(arg, resultCB);
-                    return false;                   
+                    );
+                    return false;
+                }
+                pycmdAsync = function (arg) {
+                    return new Promise(function (resolve, reject) {
+                        enqueue(arg, resolve, reject);
+                    });
                 }
                 pycmd("domDone");
             });
@@ -166,7 +246,60 @@ class AnkiWebPage(QWebEnginePage):
         return False
 
     def _onCmd(self, str: str) -> Any:
-        return self._onBridgeCmd(str)
+        result = self._onBridgeCmd(str)
+        if isinstance(result, Future):
+            # unbatched callers have no way to receive it later
+            return None
+        return result
+
+    def _onCmds(self, batch: str) -> str:
+        """Handle commands queued by pycmd() since the last batch. Commands
+        whose handler returned a Future are settled when it completes."""
+        # each result is encoded separately, so one that can't be encoded
+        # doesn't lose the rest of the batch
+        results: list[str] = []
+        for request_id, cmd in json.loads(batch):
+            try:
+                result = self._onBridgeCmd(cmd)
+                if isinstance(result, Future):
+                    self._settle_when_done(request_id, result)
+                    results.append("[1]")
+                else:
+                    results.append(json.dumps([0, result]))
+            except Exception as exc:
+                sys.excepthook(type(exc), exc, exc.__traceback__)
+                results.append(json.dumps([2, str(exc)]))
+        return f"[{','.join(results)}]"
+
+    def _settle_when_done(self, request_id: int, fut: Future) -> None:
+        from aqt import mw
+
+        fut.add_done_callback(
+            lambda fut: mw.taskman.run_on_main(
+                lambda: self._settle_cmd(request_id, fut)
+            )
+        )
+
+    def _settle_cmd(self, request_id: int, fut: Future) -> None:
+        if sip.isdeleted(self):
+            return
+        if fut.cancelled():
+            ok, value = False, "cancelled"
+        elif exc := fut.exception():
+            sys.excepthook(type(exc), exc, exc.__traceback__)
+            ok, value = False, str(exc)
+        else:
+            ok, value = True, fut.result()
+        try:
+            encoded = json.dumps(value)
+        except Exception as exc:
+            sys.excepthook(type(exc), exc, exc.__traceback__)
+            ok, encoded = False, json.dumps(str(exc))
+        # the page may have changed while the command was running
+        self.runJavaScript(
+            f"if (window._pycmdSettle) {{ _pycmdSettle({request_id}, "
+            f"{json.dumps(ok)}, {encoded}); }}"
+        )
 
     def javaScriptAlert(self, frame: Any, text: str | None) -> None:
         if text is None:
@@ -655,6 +788,10 @@ html {{ {font} }}
     def _evalWithCallback(self, js: str, cb: Callable[[Any], Any] | None) -> None:
         page = self.page()
         assert page is not None
+        # pycmd() messages sent by the script, such as the editor's saveNow(),
+        # must not be held for the next batch, or they would arrive after cb
+        # runs. The prefix doesn't change the script's result.
+        js = f"if (window._pycmdFlush) {{ _pycmdFlush(true); }}\n{js}"
 
         if cb:
 
@@ -667,6 +804,7 @@ html {{ {font} }}
             page.runJavaScript(js, handler)
         else:
             page.runJavaScript(js)
+        page.runJavaScript("if (window._pycmdFlush) { _pycmdFlush(false); }")
 
     def _queueAction(self, name: str, *args: Any) -> None:
         self._pendingActions.append((name, args))
@@ -748,7 +886,13 @@ html {{ {font} }}
         """Set a handler for pycmd() messages received from Javascript.
 
         Context is the object calling this routine, eg an instance of
-        aqt.reviewer.Reviewer or aqt.deckbrowser.DeckBrowser."""
+        aqt.reviewer.Reviewer or aqt.deckbrowser.DeckBrowser.
+
+        Slow commands should not block the main thread. The handler can
+        instead return the Future of a background task, such as the one
+        returned by mw.taskman.run_in_background(). The result callback, or
+        the promise returned by pycmdAsync(), receives the result once the
+        task completes."""
         self.onBridgeCmd = func
         self._bridge_context = context
 
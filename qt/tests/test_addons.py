@@ -2,12 +2,14 @@
 # License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
 
 import os.path
+import sys
 from tempfile import TemporaryDirectory
 from zipfile import ZipFile
 
 from mock import MagicMock
 
-from aqt.addons import AddonManager, package_name_valid
+from aqt.addon_index import AddonIndex
+from aqt.addons import AddonManager, AddonMeta, package_name_valid
 
 
 def test_readMinimalManifest():
@@ -75,3 +77,98 @@ def test_package_name_validation():
     assert not package_name_valid("a/b")
     assert not package_name_valid("..")
     assert package_name_valid("ab")
+
+
+def test_lazy_load_malformed_meta():
+    def lazy(value):
+        meta = AddonMeta.from_json_meta("addon", {"lazy_load": value})
+        return meta.lazy_hooks, meta.lazy_menus
+
+    assert lazy({"hooks": ["a"], "menus": ["b"]}) == (["a"], ["b"])
+    assert lazy(True) == ([], [])
+    assert lazy(["a"]) == ([], [])
+    assert lazy({"hooks": "a", "menus": [1]}) == ([], [])
+
+
+def test_lazy_load(monkeypatch):
+    class Hook(list):
+        def __call__(self):
+            for hook in self:
+                hook()
+
+    with TemporaryDirectory() as td:
+        addon_dir = os.path.join(td, "lazy_addon_test")
+        os.mkdir(addon_dir)
+        with open(os.path.join(addon_dir, "__init__.py"), "w") as f:
+            f.write("from aqt import gui_hooks\n")
+            f.write("calls = []\n")
+            f.write("gui_hooks.test_hook.append(lambda: calls.append(1))\n")
+        with open(os.path.join(addon_dir, "meta.json"), "w") as f:
+            f.write('{"lazy_load": {"hooks": ["test_hook"]}}')
+
+        from aqt import addons
+
+        hook = Hook()
+        monkeypatch.setattr(addons.gui_hooks, "test_hook", hook, raising=False)
+        monkeypatch.syspath_prepend(td)
+        mw = MagicMock()
+        mw.pm.addonFolder.return_value = td
+        on_main = []
+        mw.taskman.run_on_main = on_main.append
+        monkeypatch.setattr("aqt.mw", mw, raising=False)
+        adm = AddonManager(mw)
+        adm.loadAddons()
+
+        assert adm.is_lazy_pending("lazy_addon_test")
+        assert "lazy_addon_test" not in sys.modules
+        hook()
+        for func in on_main:
+            func()
+        assert not adm.is_lazy_pending("lazy_addon_test")
+        # the add-on's own handler was called for the triggering event
+        assert sys.modules["lazy_addon_test"].calls == [1]
+        assert len(hook) == 1
+        assert adm.load_stats()[0].trigger == "test_hook"
+        del sys.modules["lazy_addon_test"]
+
+
+def test_addon_index(monkeypatch):
+    with TemporaryDirectory() as td:
+        os.mkdir(os.path.join(td, "addon"))
+        open(os.path.join(td, "addon", "__init__.py"), "w").close()
+        with open(os.path.join(td, "addon", "config.json"), "w") as f:
+            f.write('{"key": 1}')
+        os.mkdir(os.path.join(td, "not_an_addon"))
+
+        index = AddonIndex(td)
+        assert index.addon_dirs() == ["addon"]
+        assert index.meta("addon") == {}
+        assert index.schema("addon") is True
+        index.config_defaults("addon")["key"] = 2
+        assert index.config_defaults("addon") == {"key": 1}
+        index.write_meta("addon", {"name": "foo"})
+        index.save()
+
+        # a new index is loaded from the saved file, without reading add-ons
+        index = AddonIndex(td)
+        monkeypatch.setattr(index, "_read_json", None)
+        monkeypatch.setattr(index, "_read_meta", None)
+        assert index.addon_dirs() == ["addon"]
+        assert index.meta("addon") == {"name": "foo"}
+        assert index.config_defaults("addon") == {"key": 1}
+        monkeypatch.undo()
+
+        # changed files are read again
+        with open(os.path.join(td, "addon", "config.json"), "w") as f:
+            f.write('{"key": 3, "other": 4}')
+        assert index.config_defaults("addon") == {"key": 3, "other": 4}
+
+        # replaced files with the same size and time need an invalidation
+        path = os.path.join(td, "addon", "config.json")
+        stat = os.stat(path)
+        with open(path, "w") as f:
+            f.write('{"key": 5, "other": 6}')
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert index.config_defaults("addon") == {"key": 3, "other": 4}
+        index.invalidate("addon")
+        assert index.config_defaults("addon") == {"key": 5, "other": 6}
@@ -0,0 +1,48 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+import os
+from tempfile import TemporaryDirectory
+
+from mock import MagicMock
+
+from aqt import deletion_log
+from aqt.deletion_log import DeletionLog
+
+
+def test_round_trip():
+    with TemporaryDirectory() as folder:
+        with open(os.path.join(folder, "deleted.txt"), "w", encoding="utf8") as f:
+            f.write("nid\tmid\tfields\n1\t2\tlegacy\tnote\n")
+
+        col = MagicMock()
+        col.db.all.return_value = [
+            (10, 20, "tab\there\x1fnew\nline"),
+            (11, 20, "back\\slash\x1f"),
+        ]
+        log = DeletionLog(folder)
+        log.log_notes(col, [10, 11])
+
+        entries = list(log.entries())
+        assert [e.nid for e in entries] == [1, 10, 11]
+        assert entries[0].fields == ["legacy", "note"]
+        assert entries[1].fields == ["tab\there", "new\nline"]
+        assert entries[2].fields == ["back\\slash", ""]
+        assert [e.nid for e in log.search("NEW")] == [10]
+        assert log.find(11) == entries[2]
+        assert log.find(12) is None
+
+
+def test_rotation(monkeypatch):
+    monkeypatch.setattr(deletion_log, "SEGMENT_MAX_BYTES", 1)
+    monkeypatch.setattr(deletion_log, "MAX_SEGMENTS", 2)
+    with TemporaryDirectory() as folder:
+        col = MagicMock()
+        log = DeletionLog(folder)
+        for nid in range(3):
+            col.db.all.return_value = [(nid, 1, "field")]
+            log.log_notes(col, [nid])
+            log.flush()
+
+        assert len(log.files()) == 2
+        assert [e.nid for e in log.entries()] == [1, 2]
@@ -0,0 +1,54 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+import os
+from tempfile import TemporaryDirectory
+
+from aqt.tts_cache import TTSCache, cache_key
+
+
+def _add(cache: TTSCache, key: str, size: int) -> str:
+    temp_path = cache.temp_path(key, ".wav")
+    with open(temp_path, "wb") as f:
+        f.write(b"\0" * size)
+    return cache.add(key, ".wav", temp_path)
+
+
+def test_lookup_and_persistence():
+    with TemporaryDirectory() as folder:
+        key = cache_key("voice", "en_US", 1.0, "hello")
+        assert key != cache_key("voice", "en_US", 1.5, "hello")
+
+        cache = TTSCache(folder)
+        assert cache.lookup(key, ".wav") is None
+        path = _add(cache, key, 10)
+        assert cache.lookup(key, ".wav") == path
+        cache.save()
+
+        # a new instance reads the index, and removes unknown files
+        with open(os.path.join(folder, "stray.part.wav"), "wb") as f:
+            f.write(b"\0")
+        cache = TTSCache(folder)
+        assert cache.lookup(key, ".wav") == path
+        assert cache.total_bytes() == 10
+        assert not os.path.exists(os.path.join(folder, "stray.part.wav"))
+
+        # a file removed behind the cache's back is a miss
+        os.remove(path)
+        assert cache.lookup(key, ".wav") is None
+
+
+def test_eviction():
+    with TemporaryDirectory() as folder:
+        cache = TTSCache(folder, max_bytes=25)
+        paths = [_add(cache, f"key{i}", 10) for i in range(2)]
+        # make key0 the most recently used
+        cache._entries["key1.wav"][1] -= 10
+        _add(cache, "key2", 10)
+        assert os.path.exists(paths[0])
+        assert not os.path.exists(paths[1])
+        assert cache.total_bytes() == 20
+
+        cache.clear()
+        assert cache.total_bytes() == 0
+        assert os.listdir(folder) == ["index.json"]
@@ -23,6 +23,7 @@ from __future__ import annotations
 from typing import Any, Callable, Sequence, Literal, Type
 
 import anki
+import anki._hook_profiler
 import aqt
 from anki.cards import Card
 from anki.decks import DeckDict, DeckConfigDict
@@ -193,6 +194,19 @@ hooks = [
         option is unchecked; This is so as to allow playing custom
         sounds regardless of that option.""",
     ),
+    Hook(
+        name="reviewer_will_preload_next_card_sounds",
+        args=["card: Card", "tags: list[anki.sound.AVTag]"],
+        doc="""Called while the answer is shown, with the question sounds of
+        the card that is likely to be shown next, so their files can be read
+        in advance.
+
+        The card is not fully rendered, so `tags` doesn't include sounds added
+        by custom filters or card_did_render; add-ons can append them. `tags`
+        can be modified, or cleared to skip preloading. The next card may
+        turn out to be different, such as when a learning card becomes
+        due, in which case the preloaded sounds are not played.""",
+    ),
     Hook(
         name="reviewer_will_replay_recording",
         args=["path: str"],
@@ -675,6 +689,11 @@ hooks = [
         If you want to pass a value to pycmd's result callback, you can
         return it with (True, some_value).
 
+        To avoid blocking the UI while a slow message is handled, you can
+        return (True, future), where future is the Future of a background
+        task, such as the one returned by mw.taskman.run_in_background().
+        The result callback receives the task's result when it completes.
+
         Context is the instance that was passed to set_bridge_command().
         It can be inspected to check which screen this hook is firing
         in, and to get a reference to the screen. For example, if your
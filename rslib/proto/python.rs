@@ -29,6 +29,7 @@ pub(crate) fn write_python_interface(services: &[BackendService]) -> Result<()>
             render_method(service, method, &mut out);
         }
     }
+    write_method_names(services, &mut out);
     write_file_if_changed(output_path, out.into_inner())?;
 
     Ok(())
@@ -81,6 +82,35 @@ fn render_method(service: &BackendService, method: &Method, out: &mut impl Write
     .unwrap();
 }
 
+/// Generates a lookup table of method names, used when profiling:
+///
+/// BACKEND_METHOD_NAMES: dict[tuple[int, int], str] = {
+///     (7, 16): "get_field_names",
+/// }
+fn write_method_names(services: &[BackendService], out: &mut impl Write) {
+    writeln!(
+        out,
+        "\nBACKEND_METHOD_NAMES: dict[tuple[int, int], str] = {{"
+    )
+    .unwrap();
+    for service in services {
+        if service.name == "BackendAnkidroidService" {
+            continue;
+        }
+        for method in service.all_methods() {
+            writeln!(
+                out,
+                "    ({}, {}): \"{}\",",
+                service.index,
+                method.index,
+                method.name.to_snake_case()
+            )
+            .unwrap();
+        }
+    }
+    writeln!(out, "}}").unwrap();
+}
+
 fn format_comments(comments: &Option<String>) -> String {
     comments
         .as_ref()
@@ -0,0 +1,126 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+"""
+Compare add-on startup time when all add-ons are imported at startup with
+lazy loading, for a profile with many synthetic add-ons.
+
+Each add-on imports a few standard library modules and then does some busy
+work. In lazy mode, every add-on except the first --eager declares a
+lazy_load trigger, so is not imported until that hook fires. Each mode runs
+in a fresh interpreter, so modules imported by one run don't make the next
+one faster.
+
+Run from the repo root after building, e.g.:
+
+    out/pyenv/bin/python tools/bench/addon_startup.py --addons 40
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.extend(["pylib", "out/pylib", "qt", "out/qt"])
+
+ADDON_TEMPLATE = """
+import time
+import {module}
+
+from aqt import gui_hooks
+
+end = time.perf_counter() + {work_ms} / 1000
+data = []
+while time.perf_counter() < end:
+    data.append(list(range(100)))
+
+gui_hooks.profile_did_open.append(lambda: None)
+"""
+MODULES = ["csv", "decimal", "email.parser", "xml.dom.minidom", "sqlite3", "ssl"]
+
+
+def make_addons(folder: str, count: int, work_ms: float, lazy: bool, eager: int):
+    for i in range(count):
+        path = os.path.join(folder, f"bench_addon_{i:03}")
+        os.makedirs(path)
+        with open(os.path.join(path, "__init__.py"), "w", encoding="utf8") as file:
+            file.write(
+                ADDON_TEMPLATE.format(module=MODULES[i % len(MODULES)], work_ms=work_ms)
+            )
+        meta: dict = {"name": f"Bench add-on {i}"}
+        if lazy and i >= eager:
+            meta["lazy_load"] = {"hooks": ["profile_did_open"]}
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf8") as file:
+            json.dump(meta, file)
+
+
+def child(folder: str) -> None:
+    "Load the add-ons in `folder`, and print timings as JSON."
+    from mock import MagicMock
+
+    import aqt
+    from aqt.addons import AddonManager
+
+    mw = MagicMock()
+    mw.pm.addonFolder.return_value = folder
+    aqt.mw = mw
+    start = time.perf_counter()
+    manager = AddonManager(mw)
+    manager.loadAddons()
+    startup = time.perf_counter() - start
+    stats = manager.load_stats()
+    json.dump(
+        {
+            "startup": startup,
+            "imported": len(stats),
+            "slowest": [(s.dir_name, s.import_secs) for s in stats[:3]],
+        },
+        sys.stdout,
+    )
+
+
+def run(label: str, args: argparse.Namespace, lazy: bool) -> None:
+    with tempfile.TemporaryDirectory() as folder:
+        make_addons(folder, args.addons, args.work_ms, lazy, args.eager)
+        env = dict(os.environ)
+        if args.memory:
+            env["ANKI_PROFILE_ADDONS"] = "1"
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", folder],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    result = json.loads(output.splitlines()[-1])
+    print(
+        f"{label:<8} {result['startup']:8.2f}s  "
+        f"{result['imported']:>3} of {args.addons} add-ons imported"
+    )
+    for name, secs in result["slowest"]:
+        print(f"    {name:<24} {secs * 1000:8.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("addon_startup")
+    parser.add_argument("--addons", type=int, default=40)
+    parser.add_argument("--work-ms", type=float, default=50)
+    parser.add_argument("--eager", type=int, default=5)
+    parser.add_argument(
+        "--memory", action="store_true", help="also measure import memory"
+    )
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+    run("eager", args, lazy=False)
+    run("lazy", args, lazy=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+"""
+Compare loading cards and notes one at a time with the bulk loaders.
+
+Run from the repo root after building, e.g.:
+
+    out/pyenv/bin/python tools/bench/load_cards.py --cards 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.extend(["pylib", "out/pylib"])
+
+from anki.collection import AddNoteRequest, Collection
+
+
+def timed(label: str, func) -> None:
+    start = time.perf_counter()
+    func()
+    print(f"{label:<28} {time.perf_counter() - start:8.2f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("load_cards")
+    parser.add_argument("--cards", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        col = Collection(os.path.join(folder, "bench.anki2"))
+        notetype = col.models.by_name("Basic")
+        deck_id = col.decks.id("Default")
+        print(f"adding {args.cards} notes...")
+        requests = []
+        for i in range(args.cards):
+            note = col.new_note(notetype)
+            note["Front"] = f"front {i}"
+            note["Back"] = f"back {i}"
+            requests.append(AddNoteRequest(note=note, deck_id=deck_id))
+        col.add_notes(requests)
+
+        cids = col.find_cards("")
+        nids = col.find_notes("")
+        timed("get_card() per id", lambda: [col.get_card(cid) for cid in cids])
+        timed("get_cards()", lambda: col.get_cards(cids))
+        timed("get_note() per id", lambda: [col.get_note(nid) for nid in nids])
+        timed("get_notes()", lambda: col.get_notes(nids))
+        col.close()
+
+
+if __name__ == "__main__":
+    main()
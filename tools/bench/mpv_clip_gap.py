@@ -0,0 +1,120 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+"""
+Measure the gap between consecutive clips when AVPlayer plays a queue of
+sounds with mpv, with and without prefetching the next clips into mpv's
+playlist.
+
+The gap is the time from mpv reporting the end of one file to the first
+audio of the next. Requires mpv on the PATH. Run from the repo root after
+building, e.g.:
+
+    out/pyenv/bin/python tools/bench/mpv_clip_gap.py --clips 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import queue
+import statistics
+import struct
+import sys
+import tempfile
+import time
+import wave
+from typing import Any
+
+sys.path.extend(["pylib", "out/pylib", "qt", "out/qt"])
+
+from mock import MagicMock
+
+import aqt
+from anki.sound import SoundOrVideoTag
+from aqt.sound import AVPlayer, MpvManager
+
+
+def write_tone(path: str, freq: int, secs: float) -> None:
+    rate = 44100
+    with wave.open(path, "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(rate)
+        file.writeframes(
+            b"".join(
+                struct.pack("<h", int(8000 * math.sin(i * freq * 2 * math.pi / rate)))
+                for i in range(int(rate * secs))
+            )
+        )
+
+
+def measure(player: MpvManager, tags: list, prefetch_count: int) -> list[float]:
+    main_queue: queue.Queue = queue.Queue()
+    aqt.mw.taskman.run_on_main = main_queue.put
+    ended_at: list[float] = []
+    gaps: list[float] = []
+
+    def on_end_file(*_args: Any) -> None:
+        ended_at.append(time.perf_counter())
+
+    def on_audio_pts(value: float | None) -> None:
+        if value is not None and len(ended_at) > len(gaps):
+            gaps.append(time.perf_counter() - ended_at[-1])
+
+    player.register_callback("end-file", on_end_file)
+    player.register_property_callback("audio-pts", on_audio_pts)
+    try:
+        av_player = AVPlayer()
+        av_player.players = [player]
+        av_player.prefetch_count = prefetch_count
+        av_player.play_tags(tags)
+        # run the main loop until everything has played
+        deadline = time.monotonic() + len(tags) * 5
+        while av_player.current_player and time.monotonic() < deadline:
+            try:
+                main_queue.get(timeout=0.1)()
+            except queue.Empty:
+                pass
+    finally:
+        player.unregister_callback("end-file", on_end_file)
+        player.unregister_property_callback("audio-pts", on_audio_pts)
+    # the last end-file has no clip after it
+    return gaps[: len(tags) - 1]
+
+
+def report(label: str, gaps: list[float]) -> None:
+    if not gaps:
+        print(f"{label:<20} no clips played")
+        return
+    gaps = sorted(gaps)
+    print(
+        f"{label:<20} mean {statistics.mean(gaps) * 1000:7.1f}ms  "
+        f"p50 {gaps[len(gaps) // 2] * 1000:7.1f}ms  max {gaps[-1] * 1000:7.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("mpv_clip_gap")
+    parser.add_argument("--clips", type=int, default=20)
+    parser.add_argument("--secs", type=float, default=0.3)
+    args = parser.parse_args()
+
+    aqt.mw = MagicMock()
+    with tempfile.TemporaryDirectory() as folder:
+        tags = []
+        for i in range(args.clips):
+            filename = f"clip{i}.wav"
+            write_tone(os.path.join(folder, filename), 300 + i * 20, args.secs)
+            tags.append(SoundOrVideoTag(filename=filename))
+        player = MpvManager(folder, folder)
+        try:
+            report("without prefetch", measure(player, tags, prefetch_count=0))
+            report("with prefetch", measure(player, tags, prefetch_count=2))
+        finally:
+            player.shutdown()
+
+
+if __name__ == "__main__":
+    main()
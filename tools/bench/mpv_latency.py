@@ -0,0 +1,125 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+"""
+Measure the latency of mpv IPC round trips, and how long it takes for audio
+to start after MpvManager.play() is called.
+
+Requires mpv on the PATH. Run from the repo root after building, e.g.:
+
+    out/pyenv/bin/python tools/bench/mpv_latency.py --commands 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import statistics
+import struct
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+sys.path.extend(["pylib", "out/pylib", "qt", "out/qt"])
+
+from mock import MagicMock
+
+import aqt
+from anki.sound import SoundOrVideoTag
+from aqt.sound import MpvManager
+
+
+def percentiles(label: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+
+    def pct(p: int) -> float:
+        return samples[min(len(samples) - 1, len(samples) * p // 100)] * 1000
+
+    print(
+        f"{label:<24} mean {statistics.mean(samples) * 1000:7.2f}ms  "
+        f"p50 {pct(50):7.2f}ms  p95 {pct(95):7.2f}ms  max {samples[-1] * 1000:7.2f}ms"
+    )
+
+
+def write_tone(path: str, secs: float = 0.5) -> None:
+    rate = 44100
+    with wave.open(path, "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(rate)
+        file.writeframes(
+            b"".join(
+                struct.pack("<h", int(8000 * math.sin(i * 440 * 2 * math.pi / rate)))
+                for i in range(int(rate * secs))
+            )
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("mpv_latency")
+    parser.add_argument("--commands", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--plays", type=int, default=20)
+    args = parser.parse_args()
+
+    # the idle callback hands the done callback to the main window
+    aqt.mw = MagicMock()
+
+    with tempfile.TemporaryDirectory() as folder:
+        write_tone(os.path.join(folder, "tone.wav"))
+        player = MpvManager(folder, folder)
+        try:
+            samples: list[float] = []
+            for _ in range(args.commands):
+                start = time.perf_counter()
+                player.get_property("idle-active")
+                samples.append(time.perf_counter() - start)
+            percentiles("command() round trip", samples)
+
+            threaded: list[float] = []
+
+            def worker() -> None:
+                for _ in range(args.commands // args.threads):
+                    start = time.perf_counter()
+                    player.get_property("idle-active")
+                    threaded.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+            percentiles(f"... from {args.threads} threads", threaded)
+            print(f"{'':<24} {len(threaded) / elapsed:.0f} commands/sec")
+
+            started = threading.Event()
+
+            def on_audio_pts(value: float | None) -> None:
+                if value is not None:
+                    started.set()
+
+            player.register_property_callback("audio-pts", on_audio_pts)
+            first_audio: list[float] = []
+            for _ in range(args.plays):
+                started.clear()
+                start = time.perf_counter()
+                player.play(SoundOrVideoTag(filename="tone.wav"), lambda: None)
+                if started.wait(5):
+                    first_audio.append(time.perf_counter() - start)
+                player.stop()
+                time.sleep(0.1)
+            if first_audio:
+                percentiles("play() to first audio", first_audio)
+            else:
+                print("no audio was played")
+        finally:
+            player.shutdown()
+
+
+if __name__ == "__main__":
+    main()
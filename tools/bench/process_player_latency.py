@@ -0,0 +1,76 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+"""
+Measure the overhead of playing short clips with mplayer, starting a process
+for each clip compared with reusing one long-running process.
+
+The overhead is the time a clip takes to play, minus the clip's duration.
+Requires mplayer on the PATH. Run from the repo root after building, e.g.:
+
+    out/pyenv/bin/python tools/bench/process_player_latency.py --clips 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.extend(["pylib", "out/pylib", "qt", "out/qt"])
+
+from mock import MagicMock
+
+from anki.sound import SoundOrVideoTag
+from aqt.sound import SimpleMplayerSlaveModePlayer
+
+
+def measure(folder: str, filenames: list[str], secs: float, persistent: bool) -> None:
+    player = SimpleMplayerSlaveModePlayer(MagicMock(), folder)
+    player.persistent = persistent
+    try:
+        start = time.perf_counter()
+        # the first clip includes starting the worker
+        player._play(SoundOrVideoTag(filename=filenames[0]))
+        first = time.perf_counter() - start - secs
+        overheads = []
+        for filename in filenames[1:]:
+            start = time.perf_counter()
+            player._play(SoundOrVideoTag(filename=filename))
+            overheads.append(time.perf_counter() - start - secs)
+    finally:
+        player.shutdown()
+    label = "one process" if persistent else "process per clip"
+    print(
+        f"{label:<18} first {first * 1000:7.1f}ms  "
+        f"then mean {statistics.mean(overheads) * 1000:7.1f}ms  "
+        f"max {max(overheads) * 1000:7.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("process_player_latency")
+    parser.add_argument("--clips", type=int, default=20)
+    parser.add_argument("--secs", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        filenames = []
+        for i in range(args.clips):
+            filename = f"clip{i}.wav"
+            with wave.open(os.path.join(folder, filename), "wb") as file:
+                file.setnchannels(1)
+                file.setsampwidth(2)
+                file.setframerate(44100)
+                file.writeframes(b"\0\0" * int(44100 * args.secs))
+            filenames.append(filename)
+        measure(folder, filenames, args.secs, persistent=False)
+        measure(folder, filenames, args.secs, persistent=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# Copyright: Ankitects Pty Ltd and contributors
+# License: GNU AGPL, version 3 or later; http://www.gnu.org/licenses/agpl.html
+
+"""
+Measure a burst of pycmd() messages sent by a page, such as the key and
+blur messages the editor sends while typing, delivered one slot call per
+message compared with batched pycmd().
+
+Reports the time from the first message being sent to the last result
+arriving back in the page, and how many times the bridge slot ran on the
+main thread. Requires Qt WebEngine. Run from the repo root after building,
+e.g.:
+
+    out/pyenv/bin/python tools/bench/webview_bridge.py --messages 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+sys.path.extend(["pylib", "out/pylib", "qt", "out/qt"])
+
+from aqt.qt import QApplication, QEventLoop, QTimer
+from aqt.webview import AnkiWebPage
+
+SCRIPT = """
+(function () {
+    var count = %(count)d;
+    var send = %(send)s;
+    var start = performance.now();
+    var received = 0;
+    for (var i = 0; i < count; i++) {
+        send("key:" + i, function () {
+            if (++received === count) {
+                window.benchResult = performance.now() - start;
+            }
+        });
+    }
+})();
+"""
+
+UNBATCHED = """function (arg, cb) {
+    window.benchChannel.cmd(arg, function (res) { cb(JSON.parse(res)); });
+}"""
+
+
+def wait_for(page: AnkiWebPage, expr: str, timeout: float = 30) -> object:
+    "Run the event loop until expr evaluates to a non-null value in the page."
+    result: list[object] = []
+    deadline = time.monotonic() + timeout
+    loop = QEventLoop()
+    while not result and time.monotonic() < deadline:
+        page.runJavaScript(
+            expr, lambda value: value is not None and result.append(value)
+        )
+        QTimer.singleShot(10, loop.quit)
+        loop.exec()
+    return result[0] if result else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("webview_bridge")
+    parser.add_argument("--messages", type=int, default=1000)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    handled = 0
+
+    def on_bridge_cmd(cmd: str) -> int:
+        nonlocal handled
+        handled += 1
+        return len(cmd)
+
+    page = AnkiWebPage(on_bridge_cmd)
+    page.setHtml("<html><body></body></html>")
+    wait_for(page, "window.pycmd ? true : null")
+    page.runJavaScript(
+        "new QWebChannel(qt.webChannelTransport, function (channel) {"
+        " window.benchChannel = channel.objects.py; });"
+    )
+    wait_for(page, "window.benchChannel ? true : null")
+
+    # count the slot calls made by each kind of message
+    slot_calls = 0
+
+    def counted(handler: Callable[[str], Any]) -> Callable[[str], Any]:
+        def wrapper(arg: str) -> Any:
+            nonlocal slot_calls
+            slot_calls += 1
+            return handler(arg)
+
+        return wrapper
+
+    page._bridge.onCmd = counted(page._bridge.onCmd)
+    page._bridge.onCmds = counted(page._bridge.onCmds)
+
+    for label, send in (("one slot per message", UNBATCHED), ("batched", "pycmd")):
+        handled = slot_calls = 0
+        page.runJavaScript("window.benchResult = null;")
+        page.runJavaScript(SCRIPT % dict(count=args.messages, send=send))
+        elapsed = wait_for(page, "window.benchResult")
+        if elapsed is None:
+            print(f"{label:<22} timed out")
+            continue
+        print(
+            f"{label:<22} {elapsed:8.1f}ms  {handled} handled "
+            f"in {slot_calls} slot calls"
+        )
+
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ import { registerPackage } from "./runtime-require";
 declare global {
     interface Window {
         bridgeCommand<T>(command: string, callback?: (value: T) => void): void;
+        pycmdAsync<T>(command: string): Promise<T>;
     }
 }
 
@@ -22,6 +23,13 @@ export function bridgeCommand<T>(command: string, callback?: (value: T) => void)
     window.bridgeCommand<T>(command, callback);
 }
 
+/** Resolves with the command's result. Handlers that run in the background
+ * resolve it when they finish, without blocking the page. */
+export function bridgeCommandAsync<T>(command: string): Promise<T> {
+    return window.pycmdAsync<T>(command);
+}
+
 registerPackage("anki/bridgecommand", {
     bridgeCommand,
+    bridgeCommandAsync,
 });